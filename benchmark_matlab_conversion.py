@@ -0,0 +1,34 @@
+import sys
+import time
+
+import numpy as np
+
+from traces.fake_matlab_engine import FakeDouble
+from traces.matlab_workspace import matlab_to_numpy
+
+# Usage: python benchmark_matlab_conversion.py [rows ...]
+# Times np.asarray(matlab.double) as done by the old convert_to_numpy_array against
+# matlab_to_numpy, for each array API the MATLAB engine may expose (see FakeDouble).
+
+row_counts = [int(argument) for argument in sys.argv[1:]] or [10000, 100000, 1000000]
+repeats = 3
+
+
+def best_time(function, value):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+print(f"{'rows':>9} {'api':>11} {'np.asarray':>12} {'matlab_to_numpy':>16} {'speedup':>9}")
+for rows in row_counts:
+    values = np.random.default_rng(0).normal(size=(rows, 3))
+    for api in ['memoryview', 'legacy', 'sequence']:
+        double = FakeDouble(values, api)
+        assert np.array_equal(matlab_to_numpy(double), values)
+        baseline = best_time(np.asarray, double)
+        converted = best_time(matlab_to_numpy, double)
+        print(f"{rows:>9} {api:>11} {baseline:>11.4f}s {converted:>15.4f}s {baseline / converted:>8.1f}x")
@@ -0,0 +1,114 @@
+import numpy as np
+
+# Values of a contract's status array
+UNDECIDED = -1
+VIOLATED = 0
+SATISFIED = 1
+
+
+class BaseContract:
+    """
+    Common layout of the assume/guarantee contracts in contracts/.
+
+    Subclasses list their checks in CONTRACT_IDS (evaluation order) and, if they log
+    violations, the message of each check in MESSAGES. Results live in the int8 array
+    `status` (UNDECIDED / VIOLATED / SATISFIED, one slot per contract id) and violations in
+    `violation_log`; both are allocated once and reused, so one instance can be re-evaluated
+    every tick with update(**inputs) followed by run(). Subclasses implement run() (reset,
+    then every check in order); evaluate() keeps the return value of the original classes.
+    """
+    __slots__ = ('status', 'violation_log')
+
+    CONTRACT_IDS = ()
+    MESSAGES = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.INDEX = {contract_id: i for i, contract_id in enumerate(cls.CONTRACT_IDS)}
+        # One shared log entry per contract id, so logging a violation allocates nothing
+        cls.ENTRIES = {contract_id: {"contract_id": contract_id, "message": message}
+                       for contract_id, message in cls.MESSAGES.items()}
+
+    def __init__(self):
+        self.status = np.full(len(self.CONTRACT_IDS), UNDECIDED, dtype=np.int8)
+        self.violation_log = []
+
+    def update(self, **inputs):
+        """Replace some or all inputs in place; returns self so it chains with run()."""
+        for name, value in inputs.items():
+            setattr(self, name, value)
+        return self
+
+    def run(self):
+        """Evaluate every check in place and return the status array."""
+        raise NotImplementedError
+
+    def evaluate(self):
+        self.run()
+        return self.contract_status, self.violation_log
+
+    def reset(self):
+        self.status.fill(UNDECIDED)
+        self.violation_log.clear()
+
+    def set_status(self, contract_id, result):
+        """Record one check result (None means undecided) and log it if it does not hold."""
+        self.status[self.INDEX[contract_id]] = UNDECIDED if result is None else (SATISFIED if result else VIOLATED)
+        if not result and contract_id in self.ENTRIES:
+            self.violation_log.append(self.ENTRIES[contract_id])
+        return result
+
+    def value(self, contract_id):
+        """Status of one check as None / True / False."""
+        status = self.status[self.INDEX[contract_id]]
+        return None if status == UNDECIDED else bool(status)
+
+    def holds(self, *contract_ids):
+        return all(self.status[self.INDEX[contract_id]] == SATISFIED for contract_id in contract_ids)
+
+    @property
+    def contract_status(self):
+        """The statuses as the {contract_id: None / True / False} dict earlier versions returned."""
+        return {contract_id: self.value(contract_id) for contract_id in self.CONTRACT_IDS}
+
+
+class StatusHistory:
+    def __init__(self, contract_ids, length):
+        """
+        Per-tick statuses of several contracts, stored as one int8 matrix per contract
+        instead of a status dict per tick.
+
+        Parameters:
+        - contract_ids: {name: [contract_id, ...]}, e.g. the CONTRACT_IDS of the objects in
+          SubsystemContracts.contracts or the contract_ids of a CompiledSpec's contracts
+        - length: Number of ticks to reserve
+        """
+        self.contract_ids = contract_ids
+        self.matrices = {name: np.full((length, len(ids)), UNDECIDED, dtype=np.int8)
+                         for name, ids in contract_ids.items()}
+        self.recorded = np.zeros(length, dtype=bool)
+
+    def record(self, t, contracts):
+        """Copy the current status of every contract ({name: BaseContract}) into row t."""
+        for name, contract in contracts.items():
+            self.matrices[name][t] = contract.status
+        self.recorded[t] = True
+
+    def record_rows(self, first, status):
+        """
+        Store a bool status matrix (e.g. from OnlineMonitor) as rows first, first + 1, ...;
+        its columns are the contract ids of every contract, in order.
+        """
+        column = 0
+        for name, ids in self.contract_ids.items():
+            self.matrices[name][first:first + len(status)] = status[:, column:column + len(ids)]
+            column += len(ids)
+        self.recorded[first:first + len(status)] = True
+
+    def status(self, name, t):
+        """{contract_id: None / True / False} of contract name at tick t ({} if t was not recorded)."""
+        if not self.recorded[t]:
+            return {}
+        row = self.matrices[name][t]
+        return {contract_id: None if value == UNDECIDED else bool(value)
+                for contract_id, value in zip(self.contract_ids[name], row)}
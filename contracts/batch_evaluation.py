@@ -0,0 +1,194 @@
+import numpy as np
+
+from contracts.contract_spec import CONTRACT_SPEC, SYSTEM_SPEC
+from contracts.spec_compiler import CompiledSpec
+from contracts.subsystem_contracts import INPUT_SIGNALS, PHYSICAL_RANGES, contract_input_masks
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+
+# The v8 subsystem contracts compiled from contracts/contract_spec.py
+SPEC = CompiledSpec()
+
+# The full system-of-systems hierarchy: the v8 subsystem contracts followed by the
+# system-level contracts (MPCS, SITAW, DP_SYSTEM, TA, TD, SHIP_SYSTEM), one status matrix
+HIERARCHY = CompiledSpec(dict(CONTRACT_SPEC, **SYSTEM_SPEC))
+
+# Columns of the status matrix: every check in the order the per-tick path evaluates (and logs) them
+STATUS_COLUMNS = SPEC.columns
+
+# Violation messages, as logged by the contract classes
+CONTRACT_MESSAGES = SPEC.messages
+
+
+def spec_inputs(signals, inputs, spec=SPEC):
+    """{name: per-tick array} of every signal and mask the checks of spec read, 'time' included."""
+    values = {name: inputs[name] for name in spec.signals if name in inputs}
+    for name in spec.signals - set(values):
+        values[name] = signals.time if name == 'time' else signals[name]
+    return values
+
+
+def evaluate_batch(signals, inputs, thresholds, spec=SPEC):
+    """
+    Evaluate every contract of a compiled spec over a whole SignalBundle with array operations.
+
+    Parameters:
+    - signals: SignalBundle (see traces/signal_bundle.py)
+    - inputs: Availability masks from contract_input_masks
+    - thresholds: Same dict as evaluate_subsystem_contracts
+    - spec: CompiledSpec, the v8 subsystem contracts by default
+
+    Returns an (N, len(spec.columns)) bool matrix, True where the check holds; row t has
+    the statuses evaluate_subsystem_contracts gives for tick t.
+    """
+    return spec.status_matrix(spec_inputs(signals, inputs, spec), thresholds, len(signals))
+
+
+def evaluate_margins(signals, inputs, thresholds, spec=SPEC):
+    """
+    Robustness margins of every check over a whole SignalBundle, as an (N, len(spec.columns))
+    float matrix: how far each check is from flipping (threshold minus measured value for
+    "value < threshold", +-inf for checks on availability flags). evaluate_margins(...) > 0
+    equals evaluate_batch(...). To re-target the margins to other thresholds, evaluate
+    spec.comparison_margins once and pass it to spec.shift_margins.
+    """
+    return spec.margin_matrix(spec_inputs(signals, inputs, spec), thresholds, len(signals))
+
+
+def violation_records(status, time, spec=SPEC):
+    """
+    Violation log rows for a status matrix, identical to (and in the same order as) the
+    entries ViolationLogger collects from the per-tick path.
+    """
+    ticks, columns = np.nonzero(~status)
+    times = {tick: round(float(time[tick]), 2) for tick in np.unique(ticks).tolist()}
+    return [
+        {
+            "time": times[tick],
+            "subsystem": spec.columns[column][0],
+            "contract_id": spec.columns[column][1],
+            "message": spec.messages[spec.columns[column]],
+        }
+        for tick, column in zip(ticks.tolist(), columns.tolist())
+    ]
+
+
+def violation_counts(status, spec=SPEC):
+    """{subsystem: {contract_id: violations}} for a status matrix, like evaluate_windows' summary."""
+    counts = {system: {} for system in spec.contracts}
+    for (system, contract_id), count in zip(spec.columns, np.count_nonzero(~status, axis=0).tolist()):
+        if count:
+            counts[system][contract_id] = count
+    return counts
+
+
+def evaluate_windows_batch(windows, thresholds, violation_logger, spec=SPEC, margins=False, filters=None,
+                           limit=None, status_out=None):
+    """
+    Batch counterpart of evaluate_windows: same log file and summary, with each window
+    evaluated in one evaluate_batch call instead of tick by tick.
+
+    With margins=True the checks are evaluated as robustness margins (evaluate_margins) and
+    summary['worst_margins'] holds {(subsystem, contract_id): (margin, time)} of the tick
+    that came closest to (or went furthest into) violating each check.
+
+    If the spec has temporal checks (spec.horizon > 0), the last horizon seconds of each
+    window are held back and evaluated again with the next window, so every tick sees the
+    same samples as in a whole-trace evaluation.
+
+    With filters (a ViolationFilter, see contracts/violation_filters.py) the log gets one
+    episode row per filtered violation instead of one row per violated tick (use a
+    ViolationLogger with EPISODE_FIELDNAMES), and summary['episodes'] counts them like
+    summary['violations'] counts violated ticks.
+
+    With limit, only the first limit ticks are evaluated; the windows may run on past them
+    to provide the look-ahead of temporal checks. status_out, an (N, len(spec.columns))
+    bool array, receives the status matrix of the evaluated ticks.
+    """
+    summary = {'samples': 0, 'violations': {system: {} for system in spec.contracts}}
+    if margins:
+        summary['worst_margins'] = {}
+    if filters is not None:
+        summary['episodes'] = {system: {} for system in spec.contracts}
+    banded = filters is not None and filters.banded.any()
+    for bundle, ready in iter_ready_windows(windows, spec.horizon):
+        if limit is not None:
+            if summary['samples'] >= limit:
+                break
+            ready = min(ready, limit - summary['samples'])
+
+        inputs = contract_input_masks(bundle, validate_signals(bundle, PHYSICAL_RANGES))
+        time = bundle.time[:ready]
+        margin = None
+        if margins or banded:
+            margin = evaluate_margins(bundle, inputs, thresholds, spec)[:ready]
+            status = margin > 0
+        else:
+            status = evaluate_batch(bundle, inputs, thresholds, spec)[:ready]
+        if margins:
+            worst = np.argmin(margin, axis=0)
+            for index, (column, tick) in enumerate(zip(spec.columns, worst.tolist())):
+                value = float(margin[tick, index])
+                if column not in summary['worst_margins'] or value < summary['worst_margins'][column][0]:
+                    summary['worst_margins'][column] = (value, float(time[tick]))
+        if status_out is not None:
+            status_out[summary['samples']:summary['samples'] + ready] = status
+        if filters is None:
+            violation_logger.entries.extend(violation_records(status, time, spec))
+        else:
+            _log_episodes(filters.update(status, time, margin), violation_logger, summary)
+        violation_logger.flush()
+        for system, counts in violation_counts(status, spec).items():
+            totals = summary['violations'][system]
+            for contract_id, count in counts.items():
+                totals[contract_id] = totals.get(contract_id, 0) + count
+        summary['samples'] += ready
+    if filters is not None:
+        _log_episodes(filters.finish(), violation_logger, summary)
+        violation_logger.flush()
+    return summary
+
+
+def iter_ready_windows(windows, horizon):
+    """
+    (SignalBundle, ready) for the windows of a trace stream, where the first ready ticks of
+    the bundle are decided: the last horizon seconds of each window are held back and come
+    again at the start of the next bundle, so checks looking horizon seconds ahead see the
+    same samples as in a whole-trace evaluation. Windows with no decided tick are skipped.
+    """
+    pending = None
+    for bundle, final in _with_last(windows):
+        if pending is not None:
+            bundle = _concatenate(pending, bundle)
+        ready = len(bundle) if final or not horizon else int(
+            np.searchsorted(bundle.time, bundle.time[-1] - horizon, side='left'))
+        pending = _slice(bundle, ready, len(bundle)) if ready < len(bundle) else None
+        if ready:
+            yield bundle, ready
+
+
+def _log_episodes(episodes, violation_logger, summary):
+    violation_logger.entries.extend(episodes)
+    for episode in episodes:
+        counts = summary['episodes'][episode['subsystem']]
+        counts[episode['contract_id']] = counts.get(episode['contract_id'], 0) + 1
+
+
+def _with_last(windows):
+    # (SignalBundle, is_last_window) for every window of a trace stream
+    previous = None
+    for window in windows:
+        if previous is not None:
+            yield previous, False
+        previous = SignalBundle(window.time, {name: window.signals[name] for name in INPUT_SIGNALS})
+    if previous is not None:
+        yield previous, True
+
+
+def _slice(bundle, start, stop):
+    return SignalBundle(bundle.time[start:stop], {name: bundle[name][start:stop] for name in INPUT_SIGNALS})
+
+
+def _concatenate(first, second):
+    return SignalBundle(np.concatenate([first.time, second.time]),
+                        {name: np.concatenate([first[name], second[name]]) for name in INPUT_SIGNALS})
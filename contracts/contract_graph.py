@@ -0,0 +1,80 @@
+import copy
+
+import numpy as np
+
+from contracts.batch_evaluation import SPEC
+
+
+class ContractGraph:
+    def __init__(self, spec=SPEC):
+        """
+        Incremental evaluation of a CompiledSpec, whose cross references form a DAG (edges
+        from the subsystems a check refers to, e.g. OBSERVER -> SHIP; see spec.order and
+        spec.downstream): after a signal, threshold or contract definition changes, evaluate()
+        only recomputes the subsystems that read it and everything downstream of them, and
+        reuses the cached status columns of the rest.
+
+        Typical use:
+            graph = ContractGraph(HIERARCHY)
+            graph.set_signals(values, len(bundle))
+            graph.set_thresholds(DEFAULT_THRESHOLDS)
+            status = graph.status_matrix()
+            graph.set_thresholds(dict(DEFAULT_THRESHOLDS, wind_speed=25))
+            status = graph.status_matrix()  # recomputes SHIP and SHIP_SYSTEM only
+        """
+        # CompiledSpec.replace rebinds the compiled contracts, so set_contract leaves the caller's spec alone
+        self.spec = copy.copy(spec)
+        self.signals = {}
+        self.thresholds = {}
+        self.length = None
+        self.columns = {}
+        self.dirty = set(self.spec.contracts)
+        self.recomputed = []
+
+    def _mark(self, changed, reads):
+        for subsystem, contract in self.spec.contracts.items():
+            if changed & reads(contract):
+                self.dirty.add(subsystem)
+
+    def set_signals(self, signals, length):
+        """
+        Replace some or all signals (and masks) the checks read.
+
+        Parameters:
+        - signals: {name: (length,) or (length, k) array}; only the names given are replaced
+        - length: Number of ticks; changing it invalidates every cached column
+        """
+        if length != self.length:
+            self.length = length
+            self.dirty.update(self.spec.contracts)
+        self.signals.update(signals)
+        self._mark(set(signals), lambda contract: contract.signals)
+
+    def set_thresholds(self, thresholds):
+        """Replace some or all thresholds; only the ones whose value changes invalidate anything."""
+        changed = {name for name, value in thresholds.items()
+                   if name not in self.thresholds or not np.array_equal(self.thresholds[name], value)}
+        self.thresholds.update(thresholds)
+        self._mark(changed, lambda contract: contract.thresholds)
+
+    def set_contract(self, subsystem, checks):
+        """Replace (or add) the checks of one subsystem, in the CONTRACT_SPEC format."""
+        self.dirty.update(self.spec.replace(subsystem, checks))
+
+    def evaluate(self):
+        """
+        {subsystem: {contract_id: (length,) bool}} for the current signals and thresholds,
+        recomputing only what changed since the last call (listed in self.recomputed).
+        """
+        if self.length is None:
+            raise ValueError("set_signals() must be called before evaluate()")
+        self.recomputed = self.spec.downstream_of(self.dirty)
+        for subsystem in self.recomputed:
+            self.columns[subsystem] = self.spec.contracts[subsystem].evaluate(
+                self.signals, self.thresholds, self.columns, self.length)
+        self.dirty.clear()
+        return self.columns
+
+    def status_matrix(self):
+        """Status matrix in spec column order, as evaluate_batch returns it."""
+        return self.spec.stack(self.evaluate())
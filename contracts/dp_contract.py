@@ -1,4 +1,16 @@
-class DPContract:
+import numpy as np
+
+from contracts.base_contract import BaseContract
+
+
+class DPContract(BaseContract):
+    __slots__ = (
+        'received_setpoint', 'actual_vessel_state', 'setpoint_valid', 'thruster_feedback_status',
+        'position_threshold'
+    )
+
+    CONTRACT_IDS = ('A1', 'A2', 'G1')
+
     def __init__(self, received_setpoint, actual_vessel_state, setpoint_valid,
                  thruster_feedback_status, position_threshold):
         """
@@ -15,36 +27,31 @@ class DPContract:
         self.thruster_feedback_status = thruster_feedback_status
         self.position_threshold = position_threshold
 
-        self.contract_status = {
-            'A1': None,
-            'A2': None,
-            'G1': None
-        }
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_receives_valid_setpoint(self):
-        self.contract_status['A1'] = self.setpoint_valid and self.received_setpoint is not None
-        return self.contract_status['A1']
+        return self.set_status('A1', self.setpoint_valid and self.received_setpoint is not None)
 
     def check_A2_thrusters_functional(self):
-        self.contract_status['A2'] = self.thruster_feedback_status
-        return self.contract_status['A2']
+        return self.set_status('A2', self.thruster_feedback_status)
 
     # --- Guarantee ---
     def check_G1_follow_setpoint(self):
-        import numpy as np
-
-        if not all([self.contract_status['A1'], self.contract_status['A2']]):
-            self.contract_status['G1'] = None
-            return None
+        if not all([self.value('A1'), self.value('A2')]):
+            return self.set_status('G1', None)
 
         deviation = np.linalg.norm(self.actual_vessel_state - self.received_setpoint)
-        self.contract_status['G1'] = deviation <= self.position_threshold
-        return self.contract_status['G1']
+        return self.set_status('G1', deviation <= self.position_threshold)
 
     # --- Evaluate ---
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_receives_valid_setpoint()
         self.check_A2_thrusters_functional()
         self.check_G1_follow_setpoint()
+        return self.status
+
+    def evaluate(self):
+        self.run()
         return self.contract_status
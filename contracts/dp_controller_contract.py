@@ -1,5 +1,17 @@
+from contracts.base_contract import BaseContract
+
+
+class DPControllerContract(BaseContract):
+    __slots__ = ('eta_sp', 'nu_sp', 'eta_hat', 'nu_hat', 'tau', 'setpoints_smoothed', 'error_reduction_valid')
+
+    CONTRACT_IDS = ('A1', 'A2', 'A3', 'G1')
+    MESSAGES = {
+        'A1': "Reference setpoints are missing.",
+        'A2': "State estimates eta_hat or nu_hat are missing.",
+        'A3': "Setpoints are not smoothed.",
+        'G1': "Control action does not reduce error.",
+    }
 
-class DPControllerContract:
     def __init__(self, eta_sp, nu_sp, eta_hat, nu_hat, tau, setpoints_smoothed, error_reduction_valid):
         self.eta_sp = eta_sp
         self.nu_sp = nu_sp
@@ -8,49 +20,25 @@ class DPControllerContract:
         self.tau = tau
         self.setpoints_smoothed = setpoints_smoothed
         self.error_reduction_valid = error_reduction_valid
-
-        self.contract_status = {
-            'A1': None, 'A2': None, 'A3': None,
-            'G1': None
-        }
-
-        self.violation_log = []
-
-    def log_violation(self, contract_id, message):
-        self.violation_log.append({ "contract_id": contract_id, "message": message })
+        BaseContract.__init__(self)
 
     def check_A1_reference_input_available(self):
-        result = self.eta_sp is not None and self.nu_sp is not None
-        self.contract_status['A1'] = result
-        if not result:
-            self.log_violation("A1", "Reference setpoints are missing.")
-        return result
+        return self.set_status('A1', self.eta_sp is not None and self.nu_sp is not None)
 
     def check_A2_estimates_available(self):
-        result = self.eta_hat is not None and self.nu_hat is not None
-        self.contract_status['A2'] = result
-        if not result:
-            self.log_violation("A2", "State estimates eta_hat or nu_hat are missing.")
-        return result
+        return self.set_status('A2', self.eta_hat is not None and self.nu_hat is not None)
 
     def check_A3_setpoints_smoothed(self):
-        result = self.setpoints_smoothed
-        self.contract_status['A3'] = result
-        if not result:
-            self.log_violation("A3", "Setpoints are not smoothed.")
-        return result
+        return self.set_status('A3', self.setpoints_smoothed)
 
     def check_G1_error_reduction(self):
         # result = self.error_reduction_valid
-        result = self.tau is not None
-        self.contract_status['G1'] = result
-        if not result:
-            self.log_violation("G1", "Control action does not reduce error.")
-        return result
+        return self.set_status('G1', self.tau is not None)
 
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_reference_input_available()
         self.check_A2_estimates_available()
         self.check_A3_setpoints_smoothed()
         self.check_G1_error_reduction()
-        return self.contract_status, self.violation_log
+        return self.status
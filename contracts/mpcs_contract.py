@@ -1,4 +1,16 @@
-class MPCSContract:
+import numpy as np
+
+from contracts.base_contract import BaseContract
+
+
+class MPCSContract(BaseContract):
+    __slots__ = (
+        'reference_path', 'vessel_state', 'disturbance_data', 'setpoints', 'dp_feedback_status',
+        'sitaw_data_accuracy', 'position_threshold'
+    )
+
+    CONTRACT_IDS = ('A1', 'A2', 'A3', 'G1', 'G2')
+
     def __init__(self, reference_path, vessel_state, disturbance_data, setpoints,
                  dp_feedback_status, sitaw_data_accuracy, position_threshold):
         """
@@ -19,42 +31,29 @@ class MPCSContract:
         self.sitaw_data_accuracy = sitaw_data_accuracy
         self.position_threshold = position_threshold
 
-        self.contract_status = {
-            'A1': None, 'A2': None, 'A3': None,
-            'G1': None, 'G2': None
-        }
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_reference_configured(self):
-        self.contract_status['A1'] = self.reference_path is not None
-        return self.contract_status['A1']
+        return self.set_status('A1', self.reference_path is not None)
 
     def check_A2_data_accuracy_from_SITAW(self):
-        self.contract_status['A2'] = self.sitaw_data_accuracy
-        return self.contract_status['A2']
+        return self.set_status('A2', self.sitaw_data_accuracy)
 
     def check_A3_dp_executes_commands(self):
-        self.contract_status['A3'] = self.dp_feedback_status
-        return self.contract_status['A3']
+        return self.set_status('A3', self.dp_feedback_status)
 
     # --- Guarantees ---
     def check_G1_setpoints_follow_path(self):
-        import numpy as np
-
-        if not all([self.contract_status[a] for a in ['A1', 'A2', 'A3']]):
-            self.contract_status['G1'] = None
-            return None
+        if not all([self.value(a) for a in ['A1', 'A2', 'A3']]):
+            return self.set_status('G1', None)
 
         deviation = np.linalg.norm(self.setpoints - self.reference_path)
-        self.contract_status['G1'] = deviation <= self.position_threshold
-        return self.contract_status['G1']
+        return self.set_status('G1', deviation <= self.position_threshold)
 
     def check_G2_compensates_for_disturbance(self):
-        import numpy as np
-
-        if not self.contract_status['A2']:
-            self.contract_status['G2'] = None
-            return None
+        if not self.value('A2'):
+            return self.set_status('G2', None)
 
         disturbance_magnitude = np.linalg.norm([
             self.disturbance_data.get('wind', 0),
@@ -62,14 +61,18 @@ class MPCSContract:
             self.disturbance_data.get('current', 0)
         ])
 
-        self.contract_status['G2'] = disturbance_magnitude > 0 and self.setpoints is not None
-        return self.contract_status['G2']
+        return self.set_status('G2', disturbance_magnitude > 0 and self.setpoints is not None)
 
     # --- Evaluate ---
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_reference_configured()
         self.check_A2_data_accuracy_from_SITAW()
         self.check_A3_dp_executes_commands()
         self.check_G1_setpoints_follow_path()
         self.check_G2_compensates_for_disturbance()
+        return self.status
+
+    def evaluate(self):
+        self.run()
         return self.contract_status
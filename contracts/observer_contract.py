@@ -1,5 +1,20 @@
+from contracts.base_contract import BaseContract
+
+
+class ObserverContract(BaseContract):
+    __slots__ = (
+        'eta', 'sensors_available', 'tau_est', 'eta_hat', 'nu_hat', 'filter_quality', 'wma_position_valid'
+    )
+
+    CONTRACT_IDS = ('A1', 'A2', 'A3', 'G1', 'G2')
+    MESSAGES = {
+        'A1': "Position data (eta) is missing.",
+        'A2': "Position sensors or voting system unavailable.",
+        'A3': "Force estimate (tau_est) is missing.",
+        'G1': "WMA-based position estimate is invalid.",
+        'G2': "Velocity filtering is not within acceptable bounds.",
+    }
 
-class ObserverContract:
     def __init__(self, eta, sensors_available, tau_est, eta_hat, nu_hat, filter_quality, wma_position_valid):
         """
         Parameters:
@@ -18,63 +33,31 @@ class ObserverContract:
         self.nu_hat = nu_hat
         self.filter_quality = filter_quality
         self.wma_position_valid = wma_position_valid
-
-        self.contract_status = {
-            'A1': None, 'A2': None, 'A3': None,
-            'G1': None, 'G2': None
-        }
-
-        self.violation_log = []  # Placeholder for contract violation logs
-
-    def log_violation(self, contract_id, message):
-        log_entry = {
-            "contract_id": contract_id,
-            "message": message
-        }
-        self.violation_log.append(log_entry)
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_position_available(self):
-        result = self.eta is not None
-        self.contract_status['A1'] = result
-        if not result:
-            self.log_violation("A1", "Position data (eta) is missing.")
-        return result
+        return self.set_status('A1', self.eta is not None)
 
     def check_A2_sensors_operational(self):
-        result = self.sensors_available
-        self.contract_status['A2'] = result
-        if not result:
-            self.log_violation("A2", "Position sensors or voting system unavailable.")
-        return result
+        return self.set_status('A2', self.sensors_available)
 
     def check_A3_force_estimate_valid(self):
-        result = self.tau_est is not None
-        self.contract_status['A3'] = result
-        if not result:
-            self.log_violation("A3", "Force estimate (tau_est) is missing.")
-        return result
+        return self.set_status('A3', self.tau_est is not None)
 
     # --- Guarantees ---
     def check_G1_position_estimate_wma(self):
-        result = self.wma_position_valid
-        self.contract_status['G1'] = result
-        if not result:
-            self.log_violation("G1", "WMA-based position estimate is invalid.")
-        return result
+        return self.set_status('G1', self.wma_position_valid)
 
     def check_G2_velocity_filtered(self):
-        result = self.filter_quality
-        self.contract_status['G2'] = result
-        if not result:
-            self.log_violation("G2", "Velocity filtering is not within acceptable bounds.")
-        return result
+        return self.set_status('G2', self.filter_quality)
 
     # --- Evaluate ---
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_position_available()
         self.check_A2_sensors_operational()
         self.check_A3_force_estimate_valid()
         self.check_G1_position_estimate_wma()
         self.check_G2_velocity_filtered()
-        return self.contract_status, self.violation_log
+        return self.status
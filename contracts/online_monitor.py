@@ -0,0 +1,305 @@
+import ast
+import copy
+from collections import deque
+
+import numpy as np
+
+from contracts.batch_evaluation import SPEC
+from contracts.spec_compiler import compile_expressions
+from contracts.temporal_operators import TEMPORAL_OPERATORS
+
+# Streaming counterparts of contracts/temporal_operators.py. Samples arrive one (or a few)
+# at a time, so the verdict of a tick is only known once its window [t + a, t + b] is
+# over, or earlier when one sample already decides it (a violation for always, a hit for
+# eventually). Every monitor keeps the ticks still waiting for a verdict in a queue; a new
+# sample decides a prefix of that queue, so each tick is pushed and popped once (amortized
+# O(1) per sample) and the state never holds more than one window of ticks. Verdicts come
+# out in tick order and equal the whole-trace operators, including the end-of-trace
+# semantics once finish() is called.
+
+
+class Always:
+    def __init__(self, a, b):
+        """G[a,b] over a stream of boolean samples."""
+        if not 0 <= a <= b:
+            raise ValueError(f"Window [{a}, {b}] must satisfy 0 <= a <= b.")
+        self.a, self.b = a, b
+        self.pending = deque()
+
+    def push(self, values, times):
+        """Feed the next samples; returns the verdicts they decide, for the oldest pending ticks first."""
+        verdicts = []
+        pending = self.pending
+        for value, t in zip(values.tolist(), times.tolist()):
+            # Windows that ended before this sample never saw a violation
+            while pending and pending[0] + self.b < t:
+                pending.popleft()
+                verdicts.append(True)
+            pending.append(t)
+            if not value:
+                while pending and pending[0] + self.a <= t:
+                    pending.popleft()
+                    verdicts.append(False)
+        return verdicts
+
+    def finish(self):
+        """Verdicts of the ticks still pending at the end of the trace (windows cut off there)."""
+        verdicts = [True] * len(self.pending)
+        self.pending.clear()
+        return verdicts
+
+
+class Eventually(Always):
+    """F[a,b] over a stream of boolean samples."""
+
+    def push(self, values, times):
+        verdicts = []
+        pending = self.pending
+        for value, t in zip(values.tolist(), times.tolist()):
+            while pending and pending[0] + self.b < t:
+                pending.popleft()
+                verdicts.append(False)
+            pending.append(t)
+            if value:
+                while pending and pending[0] + self.a <= t:
+                    pending.popleft()
+                    verdicts.append(True)
+        return verdicts
+
+    def finish(self):
+        verdicts = [False] * len(self.pending)
+        self.pending.clear()
+        return verdicts
+
+
+class Until(Eventually):
+    """holding U[a,b] reached over streams of boolean samples."""
+
+    def push(self, holding, reached, times):
+        verdicts = []
+        pending = self.pending
+        for holds, hit, t in zip(holding.tolist(), reached.tolist(), times.tolist()):
+            while pending and pending[0] + self.b < t:
+                pending.popleft()
+                verdicts.append(False)
+            pending.append(t)
+            if hit:
+                while pending and pending[0] + self.a <= t:
+                    pending.popleft()
+                    verdicts.append(True)
+            if not holds:
+                # Every tick still pending needed holding to last past this sample
+                verdicts.extend([False] * len(pending))
+                pending.clear()
+        return verdicts
+
+
+def _window_monitor(operator, bounds):
+    if operator == 'recovers':
+        return Eventually(0, bounds[0])
+    return {'always': Always, 'eventually': Eventually, 'until': Until}[operator](*bounds)
+
+
+class _Buffer:
+    """Append-only per-tick array that forgets the ticks before trim(); amortized O(1) per tick."""
+
+    def __init__(self, dtype=None):
+        self.dtype = dtype  # of the first values appended if None
+        self.data = None
+        self.offset = 0  # position of tick self.first in data
+        self.first = 0
+        self.end = 0
+
+    def append(self, values, count):
+        """Append count ticks; values is (count, ...) or one value for all of them."""
+        if not count:
+            return
+        values = np.asarray(values)
+        live = self.end - self.first
+        if self.data is None or self.offset + live + count > len(self.data):
+            data = np.empty((max(64, 2 * (live + count)),) + values.shape[1:], dtype=self.dtype or values.dtype)
+            if self.data is not None:
+                data[:live] = self.data[self.offset:self.offset + live]
+            self.data, self.offset = data, 0
+        self.data[self.offset + live:self.offset + live + count] = values
+        self.end += count
+
+    def get(self, start, stop):
+        if self.data is None:
+            return np.empty(0, dtype=self.dtype)
+        return self.data[self.offset + start - self.first:self.offset + stop - self.first]
+
+    def trim(self, tick):
+        tick = min(max(tick, self.first), self.end)
+        self.offset += tick - self.first
+        self.first = tick
+
+
+class _Node:
+    def __init__(self, inputs, outputs, kernel=None, signals=(), monitor=None):
+        self.inputs = inputs  # stream names read
+        self.outputs = outputs  # stream names written
+        self.kernel = kernel
+        self.signals = signals
+        self.monitor = monitor
+        self.done = 0  # ticks consumed so far
+
+
+class OnlineMonitor:
+    def __init__(self, thresholds, spec=SPEC):
+        """
+        Evaluate a compiled contract spec sample by sample, e.g. inside the v8 tick loop.
+
+        Parameters:
+        - thresholds: Same dict as evaluate_batch; fixed for the whole stream
+        - spec: CompiledSpec, the v8 subsystem contracts by default
+
+        Every check is split at its temporal operators: the pointwise parts run through
+        kernels generated like the batch ones (on however many new ticks are ready) and each
+        always / eventually / until / recovers becomes a streaming window monitor. Rows of
+        the status matrix are returned once every check of the tick is decided: right away
+        for a spec of pointwise checks, otherwise at most spec.horizon seconds later.
+        """
+        self.spec = spec
+        self.thresholds = dict(thresholds)
+        self.nodes = []
+        self.windows = {}
+        self.named = 0
+        # Subsystems share one kernel up to the next one with temporal checks, whose operand
+        # monitors may read the checks gathered so far
+        group = {}
+        for subsystem in spec.order:
+            contract = spec.contracts[subsystem]
+            if any(_temporal(tree) for tree in contract.trees.values()):
+                self._pointwise(group)
+                group = {}
+            group.update({f'c_{subsystem}_{contract_id}': self._split(tree)
+                          for contract_id, tree in contract.trees.items()})
+        self._pointwise(group)
+        self.checks = [f'c_{subsystem}_{contract_id}' for subsystem, contract_id in spec.columns]
+        self.signals = sorted({'time'}.union(*(node.signals for node in self.nodes)))
+        self.samples = {name: _Buffer() for name in self.signals}
+        self.streams = {name: _Buffer(bool) for node in self.nodes for name in node.outputs}
+        # (buffer, nodes reading it, whether the report reads it): ticks every reader is past are dropped
+        self.readers = [(buffer, [node for node in self.nodes if name in node.signals], name == 'time')
+                        for name, buffer in self.samples.items()]
+        self.readers += [(buffer, [node for node in self.nodes if name in node.inputs], name in self.checks)
+                         for name, buffer in self.streams.items()]
+        self.received = 0
+        self.reported = 0
+
+    def _pointwise(self, expressions):
+        # Checks referring to earlier checks of the same kernel get their expression inlined,
+        # which compile_expressions then computes once
+        if not expressions:
+            return
+        inlined = {}
+        for key, tree in expressions.items():
+            inlined[key] = _Inline(inlined).visit(tree)
+        expressions = inlined
+        kernel, _ = compile_expressions(expressions, 'online_kernel')
+        names = {node.id for tree in expressions.values() for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        self.nodes.append(_Node(inputs=sorted(name for name in names if name.startswith(('c_', 'w_'))),
+                                outputs=list(expressions), kernel=kernel,
+                                signals={name[2:] for name in names if name.startswith('s_')}))
+
+    def _split(self, tree):
+        """Copy of a compiled check with every temporal call replaced by the stream of its monitor."""
+        return _Split(self).visit(copy.deepcopy(tree))
+
+    def _stream(self):
+        self.named += 1
+        return f'w_{self.named}'
+
+    def _window(self, node):
+        key = ast.dump(node)
+        if key not in self.windows:
+            split = next(i for i, arg in enumerate(node.args) if isinstance(arg, ast.Name) and arg.id == 's_time')
+            operands = []
+            for check in node.args[:split]:
+                operands.append(self._stream())
+                self._pointwise({operands[-1]: self._split(check)})
+            self.windows[key] = self._stream()
+            monitor = _window_monitor(node.func.id, [bound.value for bound in node.args[split + 1:]])
+            self.nodes.append(_Node(inputs=operands, outputs=[self.windows[key]], monitor=monitor))
+        return ast.Name(id=self.windows[key], ctx=ast.Load())
+
+    def update(self, signals):
+        """
+        Feed the next ticks.
+
+        Parameters:
+        - signals: {name: per-tick array} for the new ticks, holding every name in
+          self.signals ('time' included), e.g. slices of batch_evaluation.spec_inputs
+
+        Returns (first, time, status): the rows of the status matrix (spec column order,
+        True where the check holds) decided by these samples, for ticks first, first + 1, ...
+        """
+        count = len(signals['time'])
+        for name, buffer in self.samples.items():
+            buffer.append(signals[name], count)
+        self.received += count
+        self._run(final=False)
+        return self._report()
+
+    def finish(self):
+        """Rows of the ticks still undecided at the end of the stream; nothing may be fed after."""
+        self._run(final=True)
+        return self._report()
+
+    def _run(self, final):
+        streams = self.streams
+        # Nodes were created inner expressions first, so one pass sees every new value
+        for node in self.nodes:
+            start = node.done
+            if node.monitor is None:
+                stop = min([self.received] + [streams[name].end for name in node.inputs])
+                if stop > start:
+                    results = node.kernel({name: self.samples[name].get(start, stop) for name in node.signals},
+                                          self.thresholds,
+                                          {name: streams[name].get(start, stop) for name in node.inputs})
+                    for name, value in results.items():
+                        streams[name].append(value, stop - start)
+            else:
+                stop = min(streams[name].end for name in node.inputs)
+                verdicts = []
+                if stop > start:
+                    verdicts = node.monitor.push(*[streams[name].get(start, stop) for name in node.inputs],
+                                                 self.samples['time'].get(start, stop))
+                if final:
+                    verdicts += node.monitor.finish()
+                streams[node.outputs[0]].append(verdicts, len(verdicts))
+            node.done = stop
+
+    def _report(self):
+        start = self.reported
+        stop = min(self.streams[name].end for name in self.checks)
+        status = np.column_stack([self.streams[name].get(start, stop) for name in self.checks]) \
+            if stop > start else np.empty((0, len(self.checks)), dtype=bool)
+        time = self.samples['time'].get(start, stop).copy()
+        self.reported = stop
+        for buffer, nodes, reported in self.readers:
+            buffer.trim(min([node.done for node in nodes] + ([stop] if reported else [])))
+        return start, time, status
+
+
+class _Split(ast.NodeTransformer):
+    def __init__(self, monitor):
+        self.monitor = monitor
+
+    def visit_Call(self, node):
+        if node.func.id in TEMPORAL_OPERATORS:
+            return self.monitor._window(node)
+        return self.generic_visit(node)
+
+
+class _Inline(ast.NodeTransformer):
+    def __init__(self, expressions):
+        self.expressions = expressions
+
+    def visit_Name(self, node):
+        return self.expressions.get(node.id, node)
+
+
+def _temporal(tree):
+    return any(isinstance(node, ast.Call) and node.func.id in TEMPORAL_OPERATORS for node in ast.walk(tree))
@@ -0,0 +1,104 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from contracts.batch_evaluation import SPEC, evaluate_windows_batch, violation_records
+from contracts.spec_compiler import CompiledSpec
+from contracts.subsystem_contracts import INPUT_SIGNALS
+from logs.violation_logger import NullLogger
+from traces.signal_registry import archive_registry, store_registry
+from traces.trace_stream import iter_trace_windows
+
+# Offline evaluation of a recorded run on every core: the master clock is cut into one
+# time shard per worker process, and each worker memory-maps the archive / trace store
+# itself and reads only its own shard, plus a halo of spec.horizon seconds after it so
+# that temporal checks near the shard end see the same samples as a sequential run.
+# Status rows go straight into one shared-memory matrix, from which the log entries of
+# every shard are built in shard (time) order, so the log equals evaluate_windows_batch's.
+
+# CompiledSpec per worker process, keyed by the spec it was compiled from
+_COMPILED = {}
+
+
+def open_registry(source):
+    """SignalRegistry of a trace store directory or a (memory-mapped) .npz archive."""
+    if os.path.isdir(source):
+        return store_registry(source)
+    return archive_registry(source)
+
+
+def _evaluate_shard(source, start, stop, thresholds, spec, definitions, window_samples, status_name, shape):
+    key = repr((spec, definitions))
+    if key not in _COMPILED:
+        _COMPILED[key] = CompiledSpec(spec, definitions)
+    compiled = _COMPILED[key]
+
+    registry = open_registry(source)
+    master_time = np.asarray(registry['eta'].time).reshape(-1)
+    halo_stop = int(np.searchsorted(master_time, master_time[stop - 1] + compiled.horizon, side='right'))
+    status_memory = shared_memory.SharedMemory(name=status_name)
+    status_out = np.ndarray(shape, dtype=bool, buffer=status_memory.buf)[start:stop]
+    windows = iter_trace_windows(registry, window_samples, names=INPUT_SIGNALS, start=start, stop=halo_stop)
+    # Workers only fill the status matrix; the parent builds the log entries from it
+    summary = evaluate_windows_batch(windows, thresholds, NullLogger(), compiled, limit=stop - start,
+                                     status_out=status_out)
+    del status_out
+    status_memory.close()
+    return summary
+
+
+def shard_bounds(length, shards):
+    """Start / stop ticks of shards evenly splitting length ticks (empty shards dropped)."""
+    bounds = np.unique(np.linspace(0, length, shards + 1).astype(int))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def evaluate_sharded(source, thresholds, violation_logger, spec=SPEC, workers=None, shards=None,
+                     window_samples=100000, status=False):
+    """
+    evaluate_windows_batch over a recorded run, split into time shards evaluated in a
+    ProcessPoolExecutor. Same log file and summary as the sequential evaluation.
+
+    Parameters:
+    - source: Trace store directory or .npz archive, opened (memory-mapped) by every worker
+    - thresholds: Same dict as evaluate_batch
+    - violation_logger: ViolationLogger receiving the entries in time order
+    - spec: CompiledSpec; workers recompile it from spec.spec and spec.definitions
+    - workers: Processes (os.cpu_count() by default)
+    - shards: Time shards (one per worker by default)
+    - window_samples: Window length within each shard
+    - status: Also return the (N, len(spec.columns)) status matrix as summary['status']
+    """
+    master_time = np.asarray(open_registry(source)['eta'].time).reshape(-1)
+    workers = workers or os.cpu_count()
+    bounds = shard_bounds(len(master_time), shards or workers)
+    shape = (len(master_time), len(spec.columns))
+    status_memory = shared_memory.SharedMemory(create=True, size=max(shape[0] * shape[1], 1))
+    status_matrix = np.ndarray(shape, dtype=bool, buffer=status_memory.buf)
+
+    summary = {'samples': 0, 'violations': {system: {} for system in spec.contracts}}
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_evaluate_shard, source, start, stop, thresholds, spec.spec, spec.definitions,
+                                   window_samples, status_memory.name, shape)
+                       for start, stop in bounds]
+            # Shards are logged in time order, whichever finishes first
+            for (start, stop), future in zip(bounds, futures):
+                shard = future.result()
+                violation_logger.entries.extend(violation_records(status_matrix[start:stop],
+                                                                  master_time[start:stop], spec))
+                violation_logger.flush()
+                summary['samples'] += shard['samples']
+                for system, counts in shard['violations'].items():
+                    totals = summary['violations'][system]
+                    for contract_id, count in counts.items():
+                        totals[contract_id] = totals.get(contract_id, 0) + count
+        if status:
+            summary['status'] = status_matrix.copy()
+    finally:
+        del status_matrix
+        status_memory.close()
+        status_memory.unlink()
+    return summary
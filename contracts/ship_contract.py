@@ -1,4 +1,16 @@
-class ShipContract:
+import numpy as np
+
+from contracts.base_contract import BaseContract
+
+
+class ShipContract(BaseContract):
+    __slots__ = (
+        'reference_trajectory', 'vessel_trajectory', 'observer_trajectory', 'reference_velocity',
+        'observer_velocity', 'environment_conditions', 'mpcs_status', 'dp_status', 'sitaw_status',
+        'position_threshold', 'velocity_threshold'
+    )
+
+    CONTRACT_IDS = ('A1', 'A2', 'A3', 'A4', 'G1', 'G2')
 
     def __init__(self, reference_trajectory, vessel_trajectory, observer_trajectory, reference_velocity, observer_velocity, environment_conditions,
                  mpcs_status, dp_status, sitaw_status, position_threshold, velocity_threshold):
@@ -23,15 +35,11 @@ class ShipContract:
         self.sitaw_status = sitaw_status
         self.position_threshold = position_threshold
         self.velocity_threshold = velocity_threshold
-        self.contract_status = {
-            'A1': None, 'A2': None, 'A3': None, 'A4': None,
-            'G1': None, 'G2': None
-        }
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_reference_available(self):
-        self.contract_status['A1'] = self.reference_trajectory is not None
-        return self.contract_status['A1']
+        return self.set_status('A1', self.reference_trajectory is not None)
 
     def check_A2_environment_within_limits(self):
         # Placeholder thresholds (can be replaced with actual values)
@@ -42,30 +50,25 @@ class ShipContract:
         wind_ok = self.environment_conditions['wind'] <= wind_limit
         wave_ok = self.environment_conditions['wave'] <= wave_limit
         current_ok = self.environment_conditions['current'] <= current_limit
-        self.contract_status['A2'] = wind_ok and wave_ok and current_ok
-        return self.contract_status['A2']
+        return self.set_status('A2', wind_ok and wave_ok and current_ok)
 
     def check_A3_subsystems_operational(self):
-        self.contract_status['A3'] = self.mpcs_status and self.dp_status
-        return self.contract_status['A3']
+        return self.set_status('A3', self.mpcs_status and self.dp_status)
 
     def check_A4_state_estimation_valid(self):
-        import numpy as np
-        self.contract_status['A4'] = self.sitaw_status
+        self.set_status('A4', self.sitaw_status)
 
         deviation = np.linalg.norm(
             self.vessel_trajectory - self.observer_trajectory
         )
-        self.contract_status['A4'] = deviation <= self.position_threshold
-    
-        return self.contract_status['A4']
+        return self.set_status('A4', deviation <= self.position_threshold)
 
     # --- Guarantee ---
     # def check_G1_track_trajectory(self):
     #     import numpy as np
 
-    #     if not all([self.contract_status[a] for a in ['A1', 'A2', 'A3', 'A4']]):
-    #         self.contract_status['G1'] = False  # Cannot guarantee if assumptions not met
+    #     if not all([self.value(a) for a in ['A1', 'A2', 'A3', 'A4']]):
+    #         self.set_status('G1', False)  # Cannot guarantee if assumptions not met
     #         return None
         
 
@@ -73,12 +76,10 @@ class ShipContract:
     #     deviation = np.linalg.norm(
     #         self.vessel_trajectory - self.reference_trajectory
     #     )
-    #     self.contract_status['G1'] = deviation <= self.position_threshold
-    #     return self.contract_status['G1']
+    #     return self.set_status('G1', deviation <= self.position_threshold)
 
 
     def check_G1_track_trajectory(self):
-        import numpy as np
         # Compute deviation (you can use more accurate method based on trajectory format)
         deviation = np.linalg.norm(
             self.vessel_trajectory - self.reference_trajectory
@@ -87,35 +88,36 @@ class ShipContract:
             self.observer_velocity - self.reference_velocity
         )
         # print(deviation, velocity_deviation)
-        self.contract_status['G1'] = deviation <= self.position_threshold and velocity_deviation <= self.velocity_threshold
-        # self.contract_status['G1'] = velocity_deviation <= self.velocity_threshold
-        return self.contract_status['G1']
+        return self.set_status('G1', deviation <= self.position_threshold and velocity_deviation <= self.velocity_threshold)
+        # return self.set_status('G1', velocity_deviation <= self.velocity_threshold)
     
 
     def check_G2_track_trajectory(self):
-        self.contract_status['G2'] = all([self.contract_status[a] for a in ['A1', 'A2', 'A3', 'A4']])
-        
-        return self.contract_status['G2']
+        return self.set_status('G2', all([self.value(a) for a in ['A1', 'A2', 'A3', 'A4']]))
 
 
     #     # # Compute deviation (you can use more accurate method based on trajectory format)
     #     # deviation = np.linalg.norm(
     #     #     self.vessel_trajectory - self.reference_trajectory
     #     # )
-    #     # self.contract_status['G1'] = deviation <= self.position_threshold
-    #     # return self.contract_status['G1']
+    #     # return self.set_status('G1', deviation <= self.position_threshold)
     
 
 
 
 
     # --- Evaluate All ---
-    def evaluate(self):
+    def run(self):
         """Evaluate all assumptions and guarantees."""
+        self.reset()
         self.check_A1_reference_available()
         self.check_A2_environment_within_limits()
         self.check_A3_subsystems_operational()
         self.check_A4_state_estimation_valid()
         self.check_G1_track_trajectory()
         self.check_G2_track_trajectory()
+        return self.status
+
+    def evaluate(self):
+        self.run()
         return self.contract_status
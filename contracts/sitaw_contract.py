@@ -1,4 +1,16 @@
-class SITAWContract:
+import numpy as np
+
+from contracts.base_contract import BaseContract
+
+
+class SITAWContract(BaseContract):
+    __slots__ = (
+        'vessel_state_estimate', 'disturbance_estimate', 'true_vessel_state', 'true_disturbances',
+        'accuracy_thresholds'
+    )
+
+    CONTRACT_IDS = ('A1', 'G1', 'G2')
+
     def __init__(self, vessel_state_estimate, disturbance_estimate, true_vessel_state,
                  true_disturbances, accuracy_thresholds):
         """
@@ -15,42 +27,36 @@ class SITAWContract:
         self.true_disturbances = true_disturbances
         self.accuracy_thresholds = accuracy_thresholds
 
-        self.contract_status = {
-            'A1': None,
-            'G1': None,
-            'G2': None
-        }
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_observable_conditions(self):
         # In simulation we assume visibility/observability holds if true values are known
-        self.contract_status['A1'] = self.true_vessel_state is not None and self.true_disturbances is not None
-        return self.contract_status['A1']
+        return self.set_status('A1', self.true_vessel_state is not None and self.true_disturbances is not None)
 
     # --- Guarantees ---
     def check_G1_disturbance_estimation_accuracy(self):
-        import numpy as np
-        if not self.contract_status['A1']:
-            self.contract_status['G1'] = None
-            return None
+        if not self.value('A1'):
+            return self.set_status('G1', None)
 
         error = np.linalg.norm(self.disturbance_estimate - self.true_disturbances)
-        self.contract_status['G1'] = error <= self.accuracy_thresholds['disturbance']
-        return self.contract_status['G1']
+        return self.set_status('G1', error <= self.accuracy_thresholds['disturbance'])
 
     def check_G2_vessel_state_estimation_accuracy(self):
-        import numpy as np
-        if not self.contract_status['A1']:
-            self.contract_status['G2'] = None
-            return None
+        if not self.value('A1'):
+            return self.set_status('G2', None)
 
         error = np.linalg.norm(self.vessel_state_estimate - self.true_vessel_state)
-        self.contract_status['G2'] = error <= self.accuracy_thresholds['state']
-        return self.contract_status['G2']
+        return self.set_status('G2', error <= self.accuracy_thresholds['state'])
 
     # --- Evaluate ---
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_observable_conditions()
         self.check_G1_disturbance_estimation_accuracy()
         self.check_G2_vessel_state_estimation_accuracy()
+        return self.status
+
+    def evaluate(self):
+        self.run()
         return self.contract_status
@@ -1,5 +1,21 @@
 
-class ShipContract:
+from contracts.base_contract import BaseContract
+
+
+class ShipContract(BaseContract):
+    __slots__ = ('disturbance_data', 'disturbance_limit_data', 'subsystem_outputs_valid', 'estimation_accuracy',
+                 'system_health_ok', 'position_error_valid', 'velocity_error_valid')
+
+    CONTRACT_IDS = ('A1', 'A2', 'A3', 'A4', 'G1', 'G2')  # 'A5' (system health) is disabled
+    MESSAGES = {
+        'A1': "Disturbance data is missing or incomplete.",
+        'A2': "Disturbance exceeds operational limits.",
+        'A3': "Subsystem outputs are abnormal.",
+        'A4': "State estimation is inaccurate.",
+        'G1': "Vessel deviates from trajectory.",
+        'G2': "One or more ship assumptions are invalid.",
+    }
+
     def __init__(self, disturbance_data, disturbance_limit_data, subsystem_outputs_valid, estimation_accuracy, system_health_ok, position_error_valid, velocity_error_valid):
         """
         Parameters:
@@ -16,24 +32,12 @@ class ShipContract:
         self.system_health_ok = system_health_ok
         self.position_error_valid = position_error_valid
         self.velocity_error_valid = velocity_error_valid
-
-        self.contract_status = {
-            'A1': None, 'A2': None, 'A3': None, 'A4': None, #'A5': None,
-            'G1': None, 'G2': None
-        }
-
-        self.violation_log = []
-
-    def log_violation(self, contract_id, message):
-        self.violation_log.append({ "contract_id": contract_id, "message": message })
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_disturbance_data_available(self):
         result = self.disturbance_data is not None and all(k in self.disturbance_data for k in ['wind', 'wave', 'current'])
-        self.contract_status['A1'] = result
-        if not result:
-            self.log_violation("A1", "Disturbance data is missing or incomplete.")
-        return result
+        return self.set_status('A1', result)
 
     def check_A2_disturbances_within_limits(self):
         # result = all(abs(self.disturbance_data[k]) < 100 for k in ['wind', 'wave', 'current'])  # Placeholder threshold
@@ -46,56 +50,26 @@ class ShipContract:
         wind_ok = self.disturbance_data['wind'] <= wind_limit
         wave_ok = self.disturbance_data['wave'] <= wave_limit
         current_ok = self.disturbance_data['current'] <= current_limit
-        result = wind_ok and wave_ok and current_ok
-
-        self.contract_status['A2'] = result
-        if not result:
-            self.log_violation("A2", "Disturbance exceeds operational limits.")
-        return result
+        return self.set_status('A2', wind_ok and wave_ok and current_ok)
 
     def check_A3_subsystem_performance_ok(self):
-        result = self.subsystem_outputs_valid
-        self.contract_status['A3'] = result
-        if not result:
-            self.log_violation("A3", "Subsystem outputs are abnormal.")
-        return result
+        return self.set_status('A3', self.subsystem_outputs_valid)
 
     def check_A4_estimation_accuracy(self):
-        result = self.estimation_accuracy
-        self.contract_status['A4'] = result
-        if not result:
-            self.log_violation("A4", "State estimation is inaccurate.")
-        return result
+        return self.set_status('A4', self.estimation_accuracy)
 
-    # def check_A5_health_ok(self):
-    #     result = self.system_health_ok
-    #     self.contract_status['A5'] = result
-    #     if not result:
-    #         self.log_violation("A5", "System health check failed.")
-    #     return result
+    # def check_A5_health_ok(self):  # needs 'A5' in CONTRACT_IDS and MESSAGES
+    #     return self.set_status('A5', self.system_health_ok)
 
     # --- Guarantees ---
     def check_G1_trajectory_within_error(self):
-        result = self.position_error_valid and self.velocity_error_valid
-        self.contract_status['G1'] = result
-        if not result:
-            self.log_violation("G1", "Vessel deviates from trajectory.")
-        return result
+        return self.set_status('G1', self.position_error_valid and self.velocity_error_valid)
 
     def check_G2_ship_assumptions_hold(self):
-        result = all([
-            self.contract_status['A1'],
-            self.contract_status['A2'],
-            self.contract_status['A3'],
-            self.contract_status['A4'],
-            # self.contract_status['A5']
-        ])
-        self.contract_status['G2'] = result
-        if not result:
-            self.log_violation("G2", "One or more ship assumptions are invalid.")
-        return result
+        return self.set_status('G2', self.holds('A1', 'A2', 'A3', 'A4'))  # + 'A5' once re-enabled
 
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_disturbance_data_available()
         self.check_A2_disturbances_within_limits()
         self.check_A3_subsystem_performance_ok()
@@ -103,4 +77,4 @@ class ShipContract:
         # self.check_A5_health_ok()
         self.check_G1_trajectory_within_error()
         self.check_G2_ship_assumptions_hold()
-        return self.contract_status, self.violation_log
+        return self.status
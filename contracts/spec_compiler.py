@@ -0,0 +1,634 @@
+import ast
+import copy
+
+import numpy as np
+
+from contracts.contract_spec import CONTRACT_SPEC, DEFINITIONS
+from contracts.temporal_operators import TEMPORAL_OPERATORS
+
+
+# === SPEC FUNCTIONS ===
+# Per-tick arrays are (N,) or (N, k); the *_dof functions reduce over the k columns of a row
+
+def _all_dof(values):
+    return values if values.ndim == 1 else np.all(values, axis=1)
+
+
+def _any_dof(values):
+    return values if values.ndim == 1 else np.any(values, axis=1)
+
+
+def _norm_dof(values):
+    return np.abs(values) if values.ndim == 1 else np.linalg.norm(values, axis=1)
+
+
+def _gradient_dof(values):
+    return np.gradient(values, axis=1)
+
+
+def _present(values):
+    # Logged signals are arrays, never None, so presence always holds
+    return np.ones(len(values), dtype=bool)
+
+
+def _difference(high, low):
+    # NaN on either side never satisfies a comparison, so it is the worst possible margin
+    margin = np.subtract(high, low, dtype=np.float64)
+    return np.where(np.isnan(margin), -np.inf, margin)
+
+
+# A check holds where its margin is > 0, so "low <= high" is nudged off zero when equal
+_TIE = np.nextafter(0, 1)
+
+
+def _inclusive(margins):
+    return np.where(margins == 0, _TIE, margins)
+
+
+def _negate(margins):
+    # Margin of "not check": a margin of exactly 0 fails the check, so its negation holds there
+    return np.where(margins == 0, _TIE, -margins)
+
+
+def _bool_margin(values):
+    return np.where(values, np.inf, -np.inf)
+
+
+def _min_dof(values):
+    return values if values.ndim == 1 else np.min(values, axis=1)
+
+
+def _max_dof(values):
+    return values if values.ndim == 1 else np.max(values, axis=1)
+
+
+FUNCTIONS = {
+    'abs': np.abs,
+    'all_dof': _all_dof,
+    'any_dof': _any_dof,
+    'norm_dof': _norm_dof,
+    'gradient_dof': _gradient_dof,
+    'present': _present,
+    'minimum': np.minimum,
+    'maximum': np.maximum,
+}
+
+# Used by the generated margin kernels only
+MARGIN_FUNCTIONS = {
+    'difference': _difference,
+    'inclusive': _inclusive,
+    'negate': _negate,
+    'bool_margin': _bool_margin,
+    'min_dof': _min_dof,
+    'max_dof': _max_dof,
+}
+
+# Names the generated kernels are executed with
+NAMESPACE = dict(FUNCTIONS, bool_=np.bool_, **MARGIN_FUNCTIONS, **TEMPORAL_OPERATORS)
+
+# Nodes worth a temporary of their own; names and constants are used directly
+_COMPUTED = (ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call)
+
+
+class _Expression(ast.NodeTransformer):
+    """Rewrites one spec expression into NumPy form and records what it reads."""
+
+    def __init__(self, compiler, subsystem):
+        self.compiler = compiler
+        self.subsystem = subsystem
+        self.expanding = []
+
+    def visit_BoolOp(self, node):
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        values = [self.visit(value) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        op = ast.Invert() if isinstance(node.op, ast.Not) else node.op
+        return ast.UnaryOp(op=op, operand=operand)
+
+    def visit_Compare(self, node):
+        operands = [self.visit(node.left)] + [self.visit(comparator) for comparator in node.comparators]
+        result = None
+        for left, op, right in zip(operands, node.ops, operands[1:]):
+            compare = ast.Compare(left=left, ops=[op], comparators=[right])
+            result = compare if result is None else ast.BinOp(left=result, op=ast.BitAnd(), right=compare)
+        return result
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool):
+            # np.bool_ so that "not True" stays a boolean under ~
+            return ast.Call(func=ast.Name(id='bool_', ctx=ast.Load()), args=[node], keywords=[])
+        return node
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in TEMPORAL_OPERATORS:
+            return self.temporal(node)
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ValueError(f"Unknown function in {self.subsystem} spec: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise ValueError(f"Keyword arguments are not supported in {self.subsystem} spec: {ast.unparse(node)}")
+        return ast.Call(func=ast.Name(id=node.func.id, ctx=ast.Load()),
+                        args=[self.visit(arg) for arg in node.args], keywords=[])
+
+    def temporal(self, node):
+        """always(check, a, b), eventually(check, a, b), until(holding, reached, a, b), recovers(check, T)"""
+        checks = 2 if node.func.id == 'until' else 1
+        window = node.args[checks:]
+        if (node.keywords or len(window) != (1 if node.func.id == 'recovers' else 2)
+                or not all(isinstance(bound, ast.Constant) and isinstance(bound.value, (int, float))
+                           for bound in window)):
+            raise ValueError(f"Temporal operator needs the check(s) and constant window bounds in seconds "
+                             f"in {self.subsystem} spec: {ast.unparse(node)}")
+        self.compiler.signals.add('time')
+        args = [self.visit(arg) for arg in node.args[:checks]] + [ast.Name(id='s_time', ctx=ast.Load())]
+        return ast.Call(func=ast.Name(id=node.func.id, ctx=ast.Load()), args=args + list(window), keywords=[])
+
+    def visit_Attribute(self, node):
+        if not isinstance(node.value, ast.Name):
+            raise ValueError(f"Unsupported reference in {self.subsystem} spec: {ast.unparse(node)}")
+        owner, name = node.value.id, node.attr
+        if owner == 'threshold':
+            self.compiler.thresholds.add(name)
+            return ast.Name(id=f't_{name}', ctx=ast.Load())
+        if owner == self.subsystem:
+            if name not in self.compiler.checks:
+                raise ValueError(f"{owner}.{name} is used before it is defined")
+            return self.compiler.checks[name]
+        if owner in self.compiler.spec:
+            if name not in self.compiler.spec[owner]:
+                raise KeyError(f"Unknown contract {owner}.{name} in {self.subsystem} spec")
+            self.compiler.depends.add((owner, name))
+            return ast.Name(id=f'c_{owner}_{name}', ctx=ast.Load())
+        raise ValueError(f"Unknown reference in {self.subsystem} spec: {ast.unparse(node)}")
+
+    def visit_Name(self, node):
+        name = node.id
+        if name in self.compiler.definitions:
+            if name in self.expanding:
+                raise ValueError(f"Definition {name} refers to itself")
+            self.expanding.append(name)
+            expanded = self.visit(ast.parse(self.compiler.definitions[name], mode='eval').body)
+            self.expanding.pop()
+            return expanded
+        self.compiler.signals.add(name)
+        return ast.Name(id=f's_{name}', ctx=ast.Load())
+
+    def generic_visit(self, node):
+        if isinstance(node, (ast.BinOp, ast.expr_context, ast.operator, ast.cmpop, ast.unaryop, ast.boolop)):
+            return super().generic_visit(node)
+        raise ValueError(f"Unsupported syntax in {self.subsystem} spec: {ast.unparse(node)}")
+
+
+def _call(function, *args):
+    return ast.Call(func=ast.Name(id=function, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+def _ordering(node):
+    """(low, high, inclusive) of a compiled "low < high" (or <=, >, >=) comparison, else None."""
+    if not isinstance(node, ast.Compare) or not isinstance(node.ops[0], (ast.Lt, ast.LtE, ast.Gt, ast.GtE)):
+        return None
+    op, low, high = node.ops[0], node.left, node.comparators[0]
+    if isinstance(op, (ast.Gt, ast.GtE)):
+        low, high = high, low
+    return low, high, isinstance(op, (ast.LtE, ast.GtE))
+
+
+def upper_bounds(node, threshold):
+    """
+    Comparisons of a compiled check that bound a measured value by a threshold from above
+    ("value < threshold.<threshold>", or <=), as [(value, inclusive)]. A comparison that is
+    the operand of all_dof / any_dof bounds the max / min of its columns. Comparisons under
+    not, inside temporal operators or elsewhere inside all_dof / any_dof are not included.
+    """
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+        return upper_bounds(node.left, threshold) + upper_bounds(node.right, threshold)
+    reduce = None
+    if isinstance(node, ast.Call) and node.func.id in ('all_dof', 'any_dof'):
+        reduce = 'max_dof' if node.func.id == 'all_dof' else 'min_dof'
+        node = node.args[0]
+    if not _ordering(node):
+        return []
+    low, high, inclusive = _ordering(node)
+    if not (isinstance(high, ast.Name) and high.id == f't_{threshold}') or _reads_threshold(low):
+        return []
+    return [(_call(reduce, low) if reduce else low, inclusive)]
+
+
+def _reads_threshold(node):
+    return any(isinstance(name, ast.Name) and name.id.startswith('t_') for name in ast.walk(node))
+
+
+class _Compiler:
+    def __init__(self, spec, definitions):
+        self.spec = spec
+        self.definitions = definitions
+        self.signals = set()
+        self.thresholds = set()
+        self.depends = set()
+        self.checks = {}
+        self.body = []
+        self.temporaries = {}
+
+    def common(self, node):
+        """Hoist every computed subexpression into a temporary, reusing identical ones."""
+        node = copy.copy(node)
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, ast.expr):
+                setattr(node, field, self.common(value))
+            elif isinstance(value, list):
+                setattr(node, field, [self.common(item) if isinstance(item, ast.expr) else item
+                                      for item in value])
+        if not isinstance(node, _COMPUTED) or (isinstance(node, ast.Call) and node.func.id == 'bool_'):
+            return node
+        key = ast.dump(node)
+        if key not in self.temporaries:
+            self.temporaries[key] = f'_{len(self.temporaries)}'
+            self.body.append(f'    {self.temporaries[key]} = {ast.unparse(node)}')
+        return ast.Name(id=self.temporaries[key], ctx=ast.Load())
+
+    def comparison(self, node, shift):
+        """Name of the comparison margin (or other per-tick input of the margin kernel) node."""
+        key = ast.dump(node)
+        if key not in self.comparison_index:
+            self.comparison_index[key] = len(self.comparisons)
+            self.comparisons.append(node)
+            self.shifts.append(shift)
+        return ast.Name(id=f'l_{self.comparison_index[key]}', ctx=ast.Load())
+
+    def split(self, node):
+        # Parts of a boolean expression that do not refer to other checks are computed with
+        # the comparisons; references use the sign of the other check's margin
+        if not any(isinstance(name, ast.Name) and name.id.startswith('c_') for name in ast.walk(node)):
+            return self.comparison(node, False if _reads_threshold(node) else None)
+        if isinstance(node, ast.Name):
+            return ast.Compare(left=ast.Name(id='m_' + node.id[2:], ctx=ast.Load()), ops=[ast.Gt()],
+                               comparators=[ast.Constant(value=0)])
+        node = copy.copy(node)
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, ast.expr):
+                setattr(node, field, self.split(value))
+            elif isinstance(value, list):
+                setattr(node, field, [self.split(item) if isinstance(item, ast.expr) else item for item in value])
+        return node
+
+    def margin(self, node):
+        """
+        Quantitative form of a compiled check, over the comparisons registered with
+        comparison(). The margin is > 0 exactly where the check holds and measures the room
+        to spare (threshold minus measured value for "value < threshold"); and/or become
+        min/max, all_dof/any_dof a min/max over the columns and NaN comparisons -inf.
+        Boolean inputs without a measured value map to +-inf.
+
+        The shift of a comparison is (threshold, sign) if changing that threshold by d moves
+        its margin by sign * d, None if no threshold moves it, else False.
+        """
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+            function = 'minimum' if isinstance(node.op, ast.BitAnd) else 'maximum'
+            return _call(function, self.margin(node.left), self.margin(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Invert):
+            return _call('negate', self.margin(node.operand))
+        if _ordering(node):
+            low, high, inclusive = _ordering(node)
+            if isinstance(high, ast.Name) and high.id.startswith('t_') and not _reads_threshold(low):
+                shift = (high.id[2:], 1)
+            elif isinstance(low, ast.Name) and low.id.startswith('t_') and not _reads_threshold(high):
+                shift = (low.id[2:], -1)
+            else:
+                shift = False if _reads_threshold(node) else None
+            margin = self.comparison(_call('difference', high, low), shift)
+            return _call('inclusive', margin) if inclusive else margin
+        if isinstance(node, ast.Call) and node.func.id in TEMPORAL_OPERATORS:
+            # Sliding min / max of the operand margins over the clock
+            checks = 2 if node.func.id == 'until' else 1
+            args = [self.margin(arg) for arg in node.args[:checks]] + [self.comparison(node.args[checks], None)]
+            return ast.Call(func=node.func, args=args + node.args[checks + 1:], keywords=[])
+        if isinstance(node, ast.Call) and node.func.id in ('all_dof', 'any_dof'):
+            return _call('min_dof' if node.func.id == 'all_dof' else 'max_dof', self.margin(node.args[0]))
+        if isinstance(node, ast.Name) and node.id.startswith('c_'):
+            # Margin of another subsystem's check
+            return ast.Name(id='m_' + node.id[2:], ctx=ast.Load())
+        return _call('bool_margin', self.split(node))
+
+    def _preamble(self, columns, prefix):
+        preamble = [f'    s_{name} = signals[{name!r}]' for name in sorted(self.signals)]
+        preamble += [f'    t_{name} = thresholds[{name!r}]' for name in sorted(self.thresholds)]
+        if columns:
+            preamble += [f'    {prefix}_{owner}_{name} = {columns}[{owner!r}][{name!r}]'
+                         for owner, name in sorted(self.depends)]
+        return preamble
+
+    def compile(self, subsystem):
+        results = []
+        for contract_id, check in self.spec[subsystem].items():
+            tree = _Expression(self, subsystem).visit(ast.parse(check['expr'], mode='eval').body)
+            self.checks[contract_id] = tree
+            results.append(f'{contract_id!r}: {ast.unparse(self.common(tree))}')
+        return '\n'.join(['def kernel(signals, thresholds, columns):'] + self._preamble('columns', 'c') + self.body
+                         + ['    return {' + ', '.join(results) + '}'])
+
+    def compile_margins(self):
+        """
+        Margin kernels of the checks compiled by compile(): comparison_kernel(signals,
+        thresholds) computes the list self.comparisons, margin_kernel(comparisons, margins)
+        combines them (and the margins of other subsystems' checks) into the check margins.
+        Returns (comparison source, margin source, reads) where reads[contract_id] lists the
+        thresholds and other subsystems' checks the check uses.
+        """
+        self.comparison_index = {}
+        self.comparisons = []
+        self.shifts = []
+        margins = {contract_id: self.margin(tree) for contract_id, tree in self.checks.items()}
+        reads = {}
+        for contract_id, tree in self.checks.items():
+            names = {name.id for name in ast.walk(tree) if isinstance(name, ast.Name)}
+            reads[contract_id] = ({name[2:] for name in names if name.startswith('t_')},
+                                  {(owner, check) for owner, check in self.depends if f'c_{owner}_{check}' in names})
+
+        self.body = []
+        self.temporaries = {}
+        results = [ast.unparse(self.common(comparison)) for comparison in self.comparisons]
+        comparison_source = '\n'.join(['def comparison_kernel(signals, thresholds):'] + self._preamble(None, None)
+                                      + self.body + ['    return [' + ', '.join(results) + ']'])
+
+        self.body = []
+        self.temporaries = {}
+        results = [f'{contract_id!r}: {ast.unparse(self.common(margin))}' for contract_id, margin in margins.items()]
+        preamble = [f'    l_{index} = comparisons[{index}]' for index in range(len(self.comparisons))]
+        preamble += [f'    m_{owner}_{name} = margins[{owner!r}][{name!r}]' for owner, name in sorted(self.depends)]
+        margin_source = '\n'.join(['def margin_kernel(comparisons, margins):'] + preamble + self.body
+                                  + ['    return {' + ', '.join(results) + '}'])
+        return comparison_source, margin_source, reads
+
+
+class CompiledContract:
+    def __init__(self, subsystem, spec, definitions):
+        """
+        One subsystem of a contract spec compiled into a single NumPy function.
+
+        Parameters:
+        - subsystem: Name of the subsystem in spec
+        - spec: {subsystem: {contract_id: {'expr': ..., 'message': ...}}}
+        - definitions: {name: expression} substituted into the checks
+
+        Identical subexpressions (within and across the checks of the subsystem) are
+        computed once; see `source` for the generated code. Each check is also compiled to
+        a robustness margin, which is > 0 exactly where the check holds: the margins of its
+        comparisons (`comparison_source`) combined by min/max (`margin_source`).
+        """
+        compiler = _Compiler(spec, definitions)
+        self.subsystem = subsystem
+        self.contract_ids = list(spec[subsystem])
+        self.messages = {contract_id: check['message'] for contract_id, check in spec[subsystem].items()}
+        self.source = compiler.compile(subsystem)
+        self.signals = compiler.signals
+        self.thresholds = compiler.thresholds
+        self.depends = compiler.depends
+        self.upstream = {owner for owner, _ in self.depends}
+        self.comparison_source, self.margin_source, self.reads = compiler.compile_margins()
+        self.comparisons = compiler.comparisons
+        self.shifts = compiler.shifts
+        self.trees = compiler.checks
+        namespace = dict(NAMESPACE)
+        exec(compile(self.source, f'<contract {subsystem}>', 'exec'), namespace)
+        exec(compile(self.comparison_source, f'<contract {subsystem} comparisons>', 'exec'), namespace)
+        exec(compile(self.margin_source, f'<contract {subsystem} margins>', 'exec'), namespace)
+        self.kernel = namespace['kernel']
+        self.comparison_kernel = namespace['comparison_kernel']
+        self.margin_kernel = namespace['margin_kernel']
+
+    def evaluate(self, signals, thresholds, columns, length):
+        """
+        {contract_id: (length,) bool} for every check of the subsystem.
+
+        - signals: Mapping with every name in self.signals
+        - thresholds: Dict with every name in self.thresholds
+        - columns: {subsystem: {contract_id: (length,) bool}} holding self.depends
+        """
+        results = self.kernel(signals, thresholds, columns)
+        return {contract_id: np.broadcast_to(np.asarray(value, dtype=bool), (length,))
+                for contract_id, value in results.items()}
+
+    def margins(self, signals, thresholds, margins, length):
+        """{contract_id: (length,) float} robustness margins; margins holds those of self.depends."""
+        return self.combine(self.comparison_kernel(signals, thresholds), margins, length)
+
+    def combine(self, comparisons, margins, length):
+        """margins() from the comparison margins, as comparison_kernel(signals, thresholds) returns them."""
+        results = self.margin_kernel(comparisons, margins)
+        return {contract_id: np.broadcast_to(np.asarray(value, dtype=np.float64), (length,))
+                for contract_id, value in results.items()}
+
+
+def compile_expressions(expressions, name='kernel'):
+    """
+    Compile {key: compiled check AST} (as in CompiledContract.trees) into one function
+    name(signals, thresholds, streams) returning {key: value}, computing identical
+    subexpressions once. s_<name> and t_<name> are read from signals and thresholds, any
+    other free name (c_<SUBSYSTEM>_<id>, ...) from streams[name]. Returns (function, source).
+    """
+    compiler = _Compiler({}, {})
+    results = [f'{key!r}: {ast.unparse(compiler.common(tree))}' for key, tree in expressions.items()]
+    names = sorted({node.id for tree in expressions.values() for node in ast.walk(tree)
+                    if isinstance(node, ast.Name) and node.id not in NAMESPACE})
+    preamble = []
+    for free in names:
+        table = {'s_': 'signals', 't_': 'thresholds'}.get(free[:2])
+        preamble.append(f'    {free} = {table}[{free[2:]!r}]' if table else f'    {free} = streams[{free!r}]')
+    source = '\n'.join([f'def {name}(signals, thresholds, streams):'] + preamble + compiler.body
+                       + ['    return {' + ', '.join(results) + '}'])
+    namespace = dict(NAMESPACE)
+    exec(compile(source, f'<{name}>', 'exec'), namespace)
+    return namespace[name], source
+
+
+def check_horizon(node, references):
+    """
+    How far ahead (seconds) a compiled check looks: the sum of the nested temporal window
+    ends. references maps the c_<SUBSYSTEM>_<id> names it uses to their own horizon.
+    """
+    if isinstance(node, ast.Name):
+        return references.get(node.id, 0)
+    ahead = max((check_horizon(child, references) for child in ast.iter_child_nodes(node)
+                 if isinstance(child, ast.expr)), default=0)
+    if isinstance(node, ast.Call) and node.func.id in TEMPORAL_OPERATORS:
+        ahead += node.args[-1].value
+    return ahead
+
+
+def topological_order(contracts):
+    """
+    Subsystem names ordered so every subsystem comes after the ones its checks refer to;
+    independent subsystems keep their spec order. Raises ValueError on a cycle.
+    """
+    order = []
+    remaining = list(contracts)
+    while remaining:
+        for subsystem in remaining:
+            if contracts[subsystem].upstream <= set(order):
+                order.append(subsystem)
+                remaining.remove(subsystem)
+                break
+        else:
+            raise ValueError(f"Contracts refer to each other in a cycle: {', '.join(remaining)}")
+    return order
+
+
+class CompiledSpec:
+    def __init__(self, spec=CONTRACT_SPEC, definitions=DEFINITIONS):
+        """
+        Every subsystem of a contract spec compiled with CompiledContract. Subsystems are
+        evaluated in topological order of their cross references (see topological_order);
+        status columns and violation logs keep the spec order.
+        """
+        self.spec = dict(spec)
+        self.definitions = definitions
+        self.contracts = {subsystem: CompiledContract(subsystem, self.spec, definitions) for subsystem in spec}
+        self._index()
+
+    def _index(self):
+        self.order = topological_order(self.contracts)
+        self.columns = [(subsystem, contract_id) for subsystem, contract in self.contracts.items()
+                        for contract_id in contract.contract_ids]
+        self.messages = {(subsystem, contract_id): message for subsystem, contract in self.contracts.items()
+                         for contract_id, message in contract.messages.items()}
+        self.signals = set().union(*(contract.signals for contract in self.contracts.values()))
+        self.downstream = {subsystem: set() for subsystem in self.contracts}
+        for subsystem, contract in self.contracts.items():
+            for owner in contract.upstream:
+                self.downstream[owner].add(subsystem)
+
+    def replace(self, subsystem, checks):
+        """
+        Recompile after changing (or adding) the checks of one subsystem. Subsystems that
+        refer to it are recompiled too, so references to removed checks raise KeyError.
+        Returns the names of the recompiled subsystems.
+        """
+        spec = dict(self.spec, **{subsystem: checks})
+        recompiled = {subsystem} | {name for name, contract in self.contracts.items() if subsystem in contract.upstream}
+        contracts = dict(self.contracts)
+        for name in spec:
+            if name in recompiled:
+                contracts[name] = CompiledContract(name, spec, self.definitions)
+        topological_order(contracts)
+        # Only commit once everything compiled and the graph has no cycle
+        self.spec, self.contracts = spec, contracts
+        self._index()
+        return recompiled
+
+    def downstream_of(self, subsystems):
+        """The given subsystems and every subsystem referring to them (directly or not), in evaluation order."""
+        pending = list(subsystems)
+        affected = set()
+        while pending:
+            subsystem = pending.pop()
+            if subsystem not in affected:
+                affected.add(subsystem)
+                pending.extend(self.downstream[subsystem])
+        return [subsystem for subsystem in self.order if subsystem in affected]
+
+    def upper_bounds(self, threshold):
+        """
+        {(value, inclusive): [(subsystem, contract_id), ...]} of the comparisons that bound a
+        value from above by threshold (see upper_bounds), in spec order; value is the
+        compiled expression as source (for compile_expressions), the checks are the ones
+        making that comparison.
+        """
+        bounds = {}
+        for subsystem, contract_id in self.columns:
+            for value, inclusive in upper_bounds(self.contracts[subsystem].trees[contract_id], threshold):
+                bounds.setdefault((ast.unparse(value), inclusive), []).append((subsystem, contract_id))
+        return bounds
+
+    def evaluate(self, signals, thresholds, length):
+        """{subsystem: {contract_id: (length,) bool}}, True where the check holds."""
+        columns = {}
+        for subsystem in self.order:
+            columns[subsystem] = self.contracts[subsystem].evaluate(signals, thresholds, columns, length)
+        return columns
+
+    def status_matrix(self, signals, thresholds, length):
+        """(length, len(self.columns)) bool matrix, one column per check in spec order."""
+        return self.stack(self.evaluate(signals, thresholds, length))
+
+    def stack(self, columns):
+        """Status matrix of {subsystem: {contract_id: column}} in spec column order."""
+        return np.column_stack([columns[subsystem][contract_id] for subsystem, contract_id in self.columns])
+
+    def margins(self, signals, thresholds, length):
+        """{subsystem: {contract_id: (length,) float}} robustness margins, > 0 where the check holds."""
+        margins = {}
+        for subsystem in self.order:
+            margins[subsystem] = self.contracts[subsystem].margins(signals, thresholds, margins, length)
+        return margins
+
+    def margin_matrix(self, signals, thresholds, length):
+        """(length, len(self.columns)) float matrix of margins; margin_matrix(...) > 0 is status_matrix(...)."""
+        return self.stack(self.margins(signals, thresholds, length))
+
+    def reads_thresholds(self, subsystem, contract_id):
+        """Thresholds read by one check, directly or through the checks it refers to."""
+        thresholds, checks = self.contracts[subsystem].reads[contract_id]
+        names = set(thresholds)
+        for owner, name in checks:
+            names |= self.reads_thresholds(owner, name)
+        return names
+
+    def check_horizon(self, subsystem, contract_id):
+        """Look-ahead (seconds) of one check, including the checks it refers to."""
+        references = {f'c_{owner}_{name}': self.check_horizon(owner, name)
+                      for owner, name in self.contracts[subsystem].reads[contract_id][1]}
+        return check_horizon(self.contracts[subsystem].trees[contract_id], references)
+
+    @property
+    def horizon(self):
+        """
+        Look-ahead (seconds) of the whole spec: the status of tick t depends on the samples
+        in [t, t + horizon], 0 for a spec of pointwise checks.
+        """
+        return max((self.check_horizon(subsystem, contract_id) for subsystem, contract_id in self.columns),
+                   default=0)
+
+    def comparison_margins(self, signals, thresholds):
+        """
+        {subsystem: [margin of every comparison]} (see CompiledContract.comparisons), from
+        which combine_margins builds the margin matrix and shift_margins re-targets it.
+        """
+        return {subsystem: contract.comparison_kernel(signals, thresholds)
+                for subsystem, contract in self.contracts.items()}
+
+    def combine_margins(self, comparisons, length):
+        """Margin matrix from comparison_margins(...); equals margin_matrix(...) for the same inputs."""
+        margins = {}
+        for subsystem in self.order:
+            margins[subsystem] = self.contracts[subsystem].combine(comparisons[subsystem], margins, length)
+        return self.stack(margins)
+
+    def shift_margins(self, comparisons, thresholds, changes, length):
+        """
+        Margin matrix for the thresholds updated with changes, from the comparison margins
+        for thresholds (comparison_margins) without re-evaluating any comparison (exact up to
+        rounding): each comparison moves with the threshold it is compared against, and the
+        min/max of the checks is rebuilt. Raises ValueError if a changed threshold enters a
+        comparison other than as one side of it; re-evaluate with margin_matrix then.
+        """
+        changed = {name for name, value in changes.items() if value != thresholds[name]}
+        shifted = {}
+        stale = []
+        for subsystem, contract in self.contracts.items():
+            shifted[subsystem] = list(comparisons[subsystem])
+            for index, (comparison, shift) in enumerate(zip(contract.comparisons, contract.shifts)):
+                if shift is False:
+                    if any(isinstance(name, ast.Name) and name.id[2:] in changed and name.id.startswith('t_')
+                           for name in ast.walk(comparison)):
+                        stale.append(f"{subsystem}: {ast.unparse(comparison)}")
+                elif shift is not None and shift[0] in changed:
+                    name, sign = shift
+                    shifted[subsystem][index] = comparisons[subsystem][index] + sign * (changes[name] - thresholds[name])
+        if stale:
+            raise ValueError(f"Margins of {'; '.join(stale)} cannot be shifted to the new thresholds")
+        return self.combine_margins(shifted, length)
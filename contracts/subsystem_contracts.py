@@ -0,0 +1,236 @@
+import numpy as np
+
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.observer_contract import ObserverContract
+from contracts.reference_model_contract import ReferenceModelContract
+from contracts.dp_controller_contract import DPControllerContract
+from contracts.thrust_model_contract import ThrustModelContract
+from contracts.disturbance_contract import DisturbanceContract
+from contracts.sov_contract import ShipContract
+
+# Evaluation (and violation logging) order used by pygame_simulation_v8.py
+SUBSYSTEMS = ['OBSERVER', 'REFERENCE', 'DP', 'THRUST', 'DISTURBANCE', 'SHIP']
+
+# Max limits [kN] as per your image
+MAX_THRUSTS = [125000, 150000, 125000, 300000, 300000]
+
+# A thruster whose force magnitude is below this is taken as not working
+THRUSTER_IDLE_FORCE = 1e-3
+
+# Signals read by sample_at
+INPUT_SIGNALS = [
+    'eta', 'eta_sp', 'eta_obs', 'nu', 'nu_sp', 'nu_obs', 'controller_force',
+    'thruster_force', 'thrust_dynamic_force', 'wind_speed', 'current', 'wave_height',
+]
+
+# Trace signal each derived SignalBundle signal and contract input mask is computed from;
+# any other spec signal is read from the trace under its own name
+SOURCE_SIGNALS = {
+    'current_xy': 'current',
+    'wind_available': 'wind_speed',
+    'wave_available': 'wave_height',
+    'current_available': 'current',
+    'thruster_working': 'thruster_force',
+    'thruster_force_valid': 'thruster_force',
+    'thrust_limits': 'thruster_force',
+    'thrust_output_valid': 'thrust_dynamic_force',
+}
+
+# Physically plausible values per signal, checked once for the whole trace by validate_signals
+PHYSICAL_RANGES = {
+    'thruster_force': ([-limit for limit in MAX_THRUSTS], MAX_THRUSTS),
+    'wind_speed': (0, 100),
+    'wave_height': (0, 30),
+    'current_xy': (-5, 5),
+}
+
+
+def contract_input_masks(signals, masks):
+    """
+    Turn the SignalMasks of a SignalBundle into the per-tick availability inputs of the
+    Disturbance and Thrust Model contracts, as (N,) bool arrays, plus the (N, 5) force limit
+    of every thruster (thrust_limits) the Thrust Model contract compares thruster_force with.
+    """
+    thruster_force = signals['thruster_force']
+    return {
+        'wind_available': ~masks.nan['wind_speed'],
+        'wave_available': ~masks.nan['wave_height'],
+        'current_available': ~masks.nan['current_xy'],
+        'thruster_working': ~masks.nan['thruster_force'] & np.all(np.abs(thruster_force) >= THRUSTER_IDLE_FORCE, axis=1),
+        'thruster_force_valid': masks.in_range['thruster_force'],
+        'thrust_limits': np.broadcast_to(np.asarray(MAX_THRUSTS, dtype=np.float64), thruster_force.shape),
+        'thrust_output_valid': ~masks.nan['thrust_dynamic_force'],
+    }
+
+
+def source_signals(names):
+    """
+    Trace signals to load for the given spec signals (e.g. CompiledSpec.signals), with derived
+    signals and contract input masks mapped back through SOURCE_SIGNALS and the clock dropped.
+    Returned in INPUT_SIGNALS order, followed by any other signal in sorted order.
+    """
+    sources = {SOURCE_SIGNALS.get(name, name) for name in names if name != 'time'}
+    return [name for name in INPUT_SIGNALS if name in sources] + sorted(sources.difference(INPUT_SIGNALS))
+
+
+def sample_at(signals, t, inputs):
+    """
+    Pick the per-tick contract inputs for tick t out of a SignalBundle
+    (see traces/signal_bundle.py), whose shapes are already fixed, and the
+    availability masks from contract_input_masks.
+    """
+    return {
+        'eta': signals['eta'][t],
+        'eta_sp': signals['eta_sp'][t],
+        'eta_obs': signals['eta_obs'][t],
+        'nu': signals['nu'][t],
+        'nu_sp': signals['nu_sp'][t],
+        'nu_obs': signals['nu_obs'][t],
+        'tau': signals['controller_force'][t],
+        'wind_speed': signals['wind_speed'][t],
+        'current': signals['current_xy'][t],
+        'wave_height': signals['wave_height'][t],
+        'wind_available': inputs['wind_available'][t],
+        'wave_available': inputs['wave_available'][t],
+        'current_available': inputs['current_available'][t],
+        'thruster_working': inputs['thruster_working'][t],
+        'thruster_force_valid': inputs['thruster_force_valid'][t],
+        'thrust_output_valid': inputs['thrust_output_valid'][t],
+    }
+
+
+class SubsystemContracts:
+    """
+    The six v8 subsystem contracts, created once and re-evaluated in place every tick.
+    After update(), each contract's status array and violation_log hold the results for
+    that tick; both are overwritten by the next update.
+    """
+    def __init__(self):
+        self.observer = ObserverContract(eta=None, sensors_available=True, tau_est=None, eta_hat=None,
+                                         nu_hat=None, filter_quality=None, wma_position_valid=None)
+        self.reference = ReferenceModelContract(eta_sp=None, nu_sp=None, smoothed_sp=None,
+                                                setpoints_valid=True)  # Depends on if human provides setpoint
+        self.dp = DPControllerContract(eta_sp=None, nu_sp=None, eta_hat=None, nu_hat=None, tau=None,
+                                       setpoints_smoothed=None, error_reduction_valid=None)
+        self.thrust = ThrustModelContract(tau_d=None, thruster_working=None, thruster_force_valid=None,
+                                          thrust_output_valid=None)
+        self.disturbance = DisturbanceContract(eta=None, disturbance_sensor_available=True, spectra_valid=None)
+        self.ship = ShipContract(disturbance_data={'wind': None, 'wave': None, 'current': None},
+                                 disturbance_limit_data={'wind': None, 'wave': None, 'current': None},
+                                 subsystem_outputs_valid=None, estimation_accuracy=None, system_health_ok=True,
+                                 position_error_valid=None, velocity_error_valid=None)
+        # Same order as SUBSYSTEMS
+        self.contracts = {
+            'OBSERVER': self.observer,
+            'REFERENCE': self.reference,
+            'DP': self.dp,
+            'THRUST': self.thrust,
+            'DISTURBANCE': self.disturbance,
+            'SHIP': self.ship,
+        }
+
+    def update(self, sample, thresholds):
+        """
+        Evaluate every contract for one tick.
+
+        Parameters:
+        - sample: Per-tick inputs as returned by sample_at
+        - thresholds: Dict with 'position', 'velocity', 'wind_speed', 'current_speed',
+          'wave_height' and 'reference_spike' limits
+        """
+        eta_t = sample['eta']
+        eta_sp_t = sample['eta_sp']
+        eta_obs_t = sample['eta_obs']
+        nu_t = sample['nu']
+        nu_sp_t = sample['nu_sp']
+        nu_obs_t = sample['nu_obs']
+        tau_est = sample['tau']
+
+        # Observer
+        wma_position_valid = np.all(np.abs(eta_obs_t - eta_t) < thresholds['position'])
+        filter_quality = np.all(np.abs(nu_obs_t - nu_t) < thresholds['velocity'])
+        self.observer.update(eta=eta_t, tau_est=tau_est, eta_hat=eta_obs_t, nu_hat=nu_obs_t,
+                             filter_quality=filter_quality, wma_position_valid=wma_position_valid).run()
+
+        # Reference Model
+        is_smoothed = np.all(np.abs(np.gradient(eta_sp_t)) < thresholds['reference_spike'])
+        self.reference.update(eta_sp=eta_sp_t, nu_sp=nu_sp_t, smoothed_sp=is_smoothed).run()
+
+        # DP Controller
+        self.dp.update(eta_sp=eta_sp_t, nu_sp=nu_sp_t, eta_hat=eta_obs_t, nu_hat=nu_obs_t, tau=tau_est,
+                       setpoints_smoothed=is_smoothed).run()
+
+        # Thrust Model
+        self.thrust.update(tau_d=tau_est, thruster_working=sample['thruster_working'],
+                           thruster_force_valid=sample['thruster_force_valid'],
+                           thrust_output_valid=sample['thrust_output_valid']).run()
+
+        # Disturbance Model
+        self.disturbance.update(
+            eta=eta_t,
+            spectra_valid=sample['wind_available'] and sample['wave_available'] and sample['current_available']
+        ).run()
+
+        # Ship Contract
+        disturbance_data = self.ship.disturbance_data
+        disturbance_data['wind'] = sample['wind_speed']
+        disturbance_data['wave'] = sample['wave_height']
+        disturbance_data['current'] = np.linalg.norm(sample['current'])
+        limits = self.ship.disturbance_limit_data
+        limits['wind'] = thresholds['wind_speed']
+        limits['wave'] = thresholds['wave_height']
+        limits['current'] = thresholds['current_speed']
+        self.ship.update(
+            subsystem_outputs_valid=(self.observer.holds('G1', 'G2') and self.reference.holds('G1', 'G2')
+                                     and self.dp.holds('G1') and self.thrust.holds('G1')
+                                     and self.disturbance.holds('G1')),
+            estimation_accuracy=self.observer.holds('G1'),
+            position_error_valid=np.linalg.norm(eta_t - eta_sp_t) < thresholds['position'],
+            velocity_error_valid=np.linalg.norm(nu_t - nu_sp_t) < thresholds['velocity']
+        ).run()
+        return self.contracts
+
+    def statuses(self):
+        return {system: contract.contract_status for system, contract in self.contracts.items()}
+
+    def logs(self):
+        return {system: list(contract.violation_log) for system, contract in self.contracts.items()}
+
+
+def evaluate_subsystem_contracts(sample, thresholds):
+    """
+    Evaluate the v8 subsystem contracts for one tick with fresh contract objects.
+    Returns (statuses, logs), both keyed by subsystem name; see SubsystemContracts for
+    the allocation-free variant used by the per-tick loops.
+    """
+    contracts = SubsystemContracts()
+    contracts.update(sample, thresholds)
+    return contracts.statuses(), contracts.logs()
+
+
+def evaluate_windows(windows, thresholds, violation_logger):
+    """
+    Run the subsystem contracts over a stream of TraceWindows (see traces/trace_stream.py).
+
+    Violations are collected per window and flushed to the logger's file before the next
+    window is read, so neither the trace nor the violation rows are held for the whole run.
+    Returns a summary {'samples': n, 'violations': {subsystem: {contract_id: count}}}.
+    """
+    summary = {'samples': 0, 'violations': {system: {} for system in SUBSYSTEMS}}
+    contracts = SubsystemContracts()
+    for window in windows:
+        bundle = SignalBundle(window.time, {name: window.signals[name] for name in INPUT_SIGNALS})
+        inputs = contract_input_masks(bundle, validate_signals(bundle, PHYSICAL_RANGES))
+        for i in range(len(bundle)):
+            contracts.update(sample_at(bundle, i, inputs), thresholds)
+            time = bundle.time[i]
+            for system, contract in contracts.contracts.items():
+                violation_logger.collect(system, time, contract.violation_log)
+                counts = summary['violations'][system]
+                for entry in contract.violation_log:
+                    counts[entry['contract_id']] = counts.get(entry['contract_id'], 0) + 1
+        summary['samples'] += len(bundle)
+        violation_logger.flush()
+    return summary
@@ -1,4 +1,16 @@
-class ThrustAllocationContract:
+import numpy as np
+
+from contracts.base_contract import BaseContract
+
+
+class ThrustAllocationContract(BaseContract):
+    __slots__ = (
+        'requested_force_vector', 'thruster_config', 'allocation_success', 'allocation_error',
+        'allocation_threshold'
+    )
+
+    CONTRACT_IDS = ('A1', 'A2', 'G1')
+
     def __init__(self, requested_force_vector, thruster_config, allocation_success,
                  allocation_error, allocation_threshold):
         """
@@ -15,37 +27,32 @@ class ThrustAllocationContract:
         self.allocation_error = allocation_error
         self.allocation_threshold = allocation_threshold
 
-        self.contract_status = {
-            'A1': None,
-            'A2': None,
-            'G1': None
-        }
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_thruster_model_available(self):
-        self.contract_status['A1'] = self.thruster_config is not None and len(self.thruster_config) > 0
-        return self.contract_status['A1']
+        return self.set_status('A1', self.thruster_config is not None and len(self.thruster_config) > 0)
 
     def check_A2_stable_allocation_method(self):
-        self.contract_status['A2'] = self.allocation_success
-        return self.contract_status['A2']
+        return self.set_status('A2', self.allocation_success)
 
     # --- Guarantee ---
     def check_G1_force_allocation_accuracy(self):
-        import numpy as np
-
-        if not all([self.contract_status['A1'], self.contract_status['A2']]):
-            self.contract_status['G1'] = None
-            return None
+        if not all([self.value('A1'), self.value('A2')]):
+            return self.set_status('G1', None)
 
         error_magnitude = np.linalg.norm(self.allocation_error)
         # print(error_magnitude)
-        self.contract_status['G1'] = error_magnitude <= self.allocation_threshold
-        return self.contract_status['G1']
+        return self.set_status('G1', error_magnitude <= self.allocation_threshold)
 
     # --- Evaluate ---
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_thruster_model_available()
         self.check_A2_stable_allocation_method()
         self.check_G1_force_allocation_accuracy()
+        return self.status
+
+    def evaluate(self):
+        self.run()
         return self.contract_status
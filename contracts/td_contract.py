@@ -1,4 +1,13 @@
-class ThrusterDynamicsContract:
+import numpy as np
+
+from contracts.base_contract import BaseContract
+
+
+class ThrusterDynamicsContract(BaseContract):
+    __slots__ = ('commanded_thrust', 'actual_thrust', 'actuator_health_status', 'response_tolerance')
+
+    CONTRACT_IDS = ('A1', 'A2', 'G1')
+
     def __init__(self, commanded_thrust, actual_thrust, actuator_health_status,
                  response_tolerance):
         """
@@ -13,36 +22,32 @@ class ThrusterDynamicsContract:
         self.actuator_health_status = actuator_health_status
         self.response_tolerance = response_tolerance
 
-        self.contract_status = {
-            'A1': None,
-            'A2': None,
-            'G1': None
-        }
+        BaseContract.__init__(self)
 
     # --- Assumptions ---
     def check_A1_actuators_healthy(self):
-        self.contract_status['A1'] = self.actuator_health_status
-        return self.contract_status['A1']
+        return self.set_status('A1', self.actuator_health_status)
 
     def check_A2_response_model_known(self):
         # In most simulations, actuator models are predefined, so we assume true
-        self.contract_status['A2'] = True
-        return self.contract_status['A2']
+        return self.set_status('A2', True)
 
     # --- Guarantee ---
     def check_G1_thrust_realization_accuracy(self):
-        import numpy as np
-        if not all([self.contract_status['A1'], self.contract_status['A2']]):
-            self.contract_status['G1'] = None
-            return None
+        if not all([self.value('A1'), self.value('A2')]):
+            return self.set_status('G1', None)
 
         deviation = np.linalg.norm(self.actual_thrust - self.commanded_thrust)
-        self.contract_status['G1'] = deviation <= self.response_tolerance
-        return self.contract_status['G1']
+        return self.set_status('G1', deviation <= self.response_tolerance)
 
     # --- Evaluate ---
-    def evaluate(self):
+    def run(self):
+        self.reset()
         self.check_A1_actuators_healthy()
         self.check_A2_response_model_known()
         self.check_G1_thrust_realization_accuracy()
+        return self.status
+
+    def evaluate(self):
+        self.run()
         return self.contract_status
\ No newline at end of file
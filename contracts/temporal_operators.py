@@ -0,0 +1,168 @@
+from collections import deque
+
+import numpy as np
+
+# STL-style operators over whole traces. A check is a per-tick (N,) array, either bool
+# (holds / violated) or float (robustness margin, > 0 where it holds; see
+# contracts/spec_compiler.py); time is the (N,) increasing clock of the ticks. Windows
+# [t + a, t + b] look ahead of each tick (0 <= a <= b, seconds) and are cut off at the
+# end of the trace, so "always" holds and "eventually" fails on an empty window.
+
+
+def window_bounds(time, a, b):
+    """Index ranges [lo, hi) of the samples with t + a <= time <= t + b, for every tick t."""
+    if not 0 <= a <= b:
+        raise ValueError(f"Window [{a}, {b}] must satisfy 0 <= a <= b.")
+    return np.searchsorted(time, time + a, side='left'), np.searchsorted(time, time + b, side='right')
+
+
+def _count_in(values, lo, hi):
+    counts = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values, out=counts[1:])
+    return counts[hi] - counts[np.minimum(lo, hi)]
+
+
+def _deque_min(values, lo, hi):
+    # Monotonic deque: each index is pushed and popped at most once, since lo and hi never decrease
+    result = np.full(len(lo), np.inf)
+    window = deque()
+    end = 0
+    for i, (start, stop) in enumerate(zip(lo.tolist(), hi.tolist())):
+        while end < stop:
+            while window and values[window[-1]] >= values[end]:
+                window.pop()
+            window.append(end)
+            end += 1
+        while window and window[0] < start:
+            window.popleft()
+        if window and start < stop:
+            result[i] = values[window[0]]
+    return result
+
+
+def sliding_min(values, lo, hi):
+    """
+    min(values[lo[i]:hi[i]]) for every i (+inf for an empty range) in O(N), for lo and hi
+    that never decrease, as produced by window_bounds. NaN is treated as -inf.
+
+    Windows of about the same width (any fixed-step log) are answered with array
+    operations: the trace is cut into blocks as wide as the narrowest window, so a window
+    is the suffix of one block, the prefix of another and the minimum of the whole blocks
+    in between, which is again a sliding minimum over the much shorter array of block
+    minima. Windows of very different widths use a monotonic deque instead.
+    """
+    values = np.where(np.isnan(values), -np.inf, np.asarray(values, dtype=np.float64))
+    lo, hi = np.asarray(lo), np.asarray(hi)
+    result = np.full(len(lo), np.inf)
+    nonempty = hi > lo
+    if not np.any(nonempty):
+        return result
+    start, stop = lo[nonempty], hi[nonempty]
+    widths = stop - start
+    # Windows cut off by the end of the trace count as full width over +inf padding
+    interior = stop < len(values)
+    narrowest = int(widths[interior].min()) if np.any(interior) else int(widths.min())
+    stop = np.where(interior, stop, np.maximum(stop, start + narrowest))
+    widest = int((stop - start).max())
+
+    if widest <= 2:
+        padded = np.append(values, np.inf)
+        result[nonempty] = np.minimum(padded[start], padded[stop - 1])
+        return result
+    if narrowest * 4 < widest:
+        return _deque_min(values, lo, hi)
+
+    block = narrowest
+    count = -(-max(len(values), int(stop.max())) // block)
+    padded = np.full(count * block, np.inf)
+    padded[:len(values)] = values
+    blocks = padded.reshape(count, block)
+    prefix = np.minimum.accumulate(blocks, axis=1)
+    suffix = np.minimum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+
+    last = stop - 1
+    first_block, last_block = start // block, last // block
+    # Windows are at least one block wide, so a window inside one block starts at its beginning
+    window_min = np.where(first_block == last_block, prefix.ravel()[last],
+                          np.minimum(suffix.ravel()[start], prefix.ravel()[last]))
+    window_min = np.minimum(window_min, sliding_min(prefix[:, -1], first_block + 1, last_block))
+    result[nonempty] = window_min
+    return result
+
+
+def sliding_max(values, lo, hi):
+    """max(values[lo[i]:hi[i]]) for every i (-inf for an empty range); see sliding_min."""
+    values = np.asarray(values, dtype=np.float64)
+    # NaN margins are -inf for max as well
+    return -sliding_min(np.where(np.isnan(values), np.inf, -values), lo, hi)
+
+
+def always(values, time, a, b):
+    """G[a,b]: the check holds at every tick in [t + a, t + b]."""
+    values = np.broadcast_to(values, time.shape)
+    lo, hi = window_bounds(time, a, b)
+    if values.dtype == bool:
+        return _count_in(~values, lo, hi) == 0
+    return sliding_min(values, lo, hi)
+
+
+def eventually(values, time, a, b):
+    """F[a,b]: the check holds at some tick in [t + a, t + b]."""
+    values = np.broadcast_to(values, time.shape)
+    lo, hi = window_bounds(time, a, b)
+    if values.dtype == bool:
+        return _count_in(values, lo, hi) > 0
+    return sliding_max(values, lo, hi)
+
+
+def _as_margin(values):
+    if values.dtype == bool:
+        return np.where(values, np.inf, -np.inf)
+    return np.where(np.isnan(values), -np.inf, values.astype(np.float64))
+
+
+def _until_margin(holding, reached, lo, hi):
+    # max over t' in [lo, hi) of min(reached[t'], min(holding[t:t'])), one pass per offset t' - t
+    holding, reached = _as_margin(holding), _as_margin(reached)
+    ticks = np.arange(len(holding))
+    result = np.full(len(holding), -np.inf)
+    running = np.full(len(holding), np.inf)
+    for offset in range(int((hi - ticks).max(initial=0))):
+        at = np.minimum(ticks + offset, len(holding) - 1)
+        inside = (ticks + offset >= lo) & (ticks + offset < hi)
+        result = np.where(inside, np.maximum(result, np.minimum(reached[at], running)), result)
+        running = np.minimum(running, holding[at])
+    return result
+
+
+def until(holding, reached, time, a, b):
+    """
+    holding U[a,b] reached: reached holds at some tick t' in [t + a, t + b] and holding
+    holds at every tick from t up to (not including) t'. For margins, the max over t' of
+    the min of reached at t' and holding over [t, t'); this takes one array pass per tick
+    in the widest window.
+    """
+    holding, reached = np.broadcast_to(holding, time.shape), np.broadcast_to(reached, time.shape)
+    lo, hi = window_bounds(time, a, b)
+    if holding.dtype != bool or reached.dtype != bool:
+        return _until_margin(holding, reached, lo, hi)
+    # First tick at or after each tick where holding fails (len if it never does)
+    ticks = np.arange(len(holding))
+    first_failure = np.minimum.accumulate(np.where(holding, len(holding), ticks)[::-1])[::-1]
+    return _count_in(reached, lo, np.maximum(lo, np.minimum(hi, first_failure + 1))) > 0
+
+
+def recovers(values, time, duration):
+    """
+    Violations last at most duration: wherever the check fails it holds again within
+    duration seconds, i.e. G(not check -> F[0,duration] check) evaluated per tick.
+    """
+    return eventually(values, time, 0, duration)
+
+
+TEMPORAL_OPERATORS = {
+    'always': always,
+    'eventually': eventually,
+    'until': until,
+    'recovers': recovers,
+}
@@ -0,0 +1,118 @@
+import ast
+
+import numpy as np
+
+from contracts.spec_compiler import compile_expressions
+
+# Thresholds that can be swept, with the default range of candidates. The values they are
+# compared against, and whether equality passes, come from the comparisons of the spec
+# (CompiledSpec.upper_bounds): position is swept for every check comparing a position
+# error with it (OBSERVER.G1, SHIP.G1, DP_SYSTEM.G1, SHIP_SYSTEM.A4, SHIP_SYSTEM.G1), and
+# likewise for the others.
+SWEEPS = {
+    'position': {'range': (0.5, 3.0)},
+    'velocity': {'range': (0.1, 1.0)},
+    'wind_speed': {'range': (5.0, 30.0)},
+    'current_speed': {'range': (0.2, 1.5)},
+}
+
+
+def sweep_comparisons(spec, sweeps=SWEEPS):
+    """
+    {(name, checks): {'value': ..., 'inclusive': ...}} for every comparison of a CompiledSpec
+    against a swept threshold: checks names the checks making it (e.g. "SHIP.G1"), value
+    the compiled expression compared against the threshold, inclusive whether the check
+    allows equality (value <= threshold) or not (value < threshold).
+    """
+    comparisons = {}
+    for name in sweeps:
+        for (value, inclusive), checks in spec.upper_bounds(name).items():
+            label = ', '.join(f"{subsystem}.{contract_id}" for subsystem, contract_id in checks)
+            comparisons[(name, label)] = {'value': value, 'inclusive': inclusive}
+    return comparisons
+
+
+def sweep_values(values, comparisons, length):
+    """
+    {key: (length,) float} of the quantity every comparison is made on.
+
+    Parameters:
+    - values: {name: per-tick array} of the signals and masks, e.g. batch_evaluation.spec_inputs
+    - comparisons: From sweep_comparisons
+    - length: Number of ticks
+    """
+    kernel, _ = compile_expressions({key: ast.parse(comparison['value'], mode='eval').body
+                                     for key, comparison in comparisons.items()}, 'sweep_kernel')
+    return {key: np.broadcast_to(np.asarray(value, dtype=np.float64), (length,))
+            for key, value in kernel(values, {}, {}).items()}
+
+
+def _longest_runs(levels, time, count):
+    # longest[k]: duration of the longest run of ticks with level > k. Every maximal run
+    # is the extent around its lowest tick, so one monotonic-stack pass over the runs of
+    # equal level finds, for each, how far its level (or higher) extends on both sides.
+    longest = np.zeros(count)
+    if not len(levels):
+        return longest
+    starts = np.flatnonzero(np.diff(levels, prepend=-1))
+    run_levels = levels[starts].tolist()
+    left = [0] * len(run_levels)
+    right = [len(run_levels)] * len(run_levels)
+    stack = []
+    for i, level in enumerate(run_levels):
+        while stack and run_levels[stack[-1]] > level:
+            right[stack.pop()] = i
+        if stack:
+            left[i] = left[stack[-1]] if run_levels[stack[-1]] == level else stack[-1] + 1
+        stack.append(i)
+    # A run lasts until the tick where it stops (the last tick if it reaches the end)
+    edges = np.append(starts, len(levels) - 1)
+    durations = time[edges[right]] - time[edges[left]]
+    best = np.zeros(count + 1)
+    np.maximum.at(best, run_levels, durations)
+    return np.maximum.accumulate(best[::-1])[::-1][1:]
+
+
+def threshold_sweep(values, time, thresholds, inclusive=False):
+    """
+    Violation statistics of the check "value < threshold" ("value <= threshold" if
+    inclusive) for many candidate thresholds at once, from one sort of the candidates
+    and a cumulative histogram of the ticks instead of one evaluation per threshold.
+
+    Parameters:
+    - values: (N,) quantity compared against the threshold (NaN violates every threshold)
+    - time: (N,) clock of the ticks
+    - thresholds: (K,) candidate thresholds, in any order
+
+    Returns {'threshold', 'count', 'fraction', 'longest'}, each (K,) in the order of
+    thresholds: violated ticks, their fraction of N and the longest violation in seconds
+    (from its first tick until the check holds again, or the last tick).
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    order = np.argsort(thresholds)
+    # Number of (sorted) candidates each tick violates: tick i violates candidate k < levels[i]
+    levels = np.searchsorted(thresholds[order], values, side='left' if inclusive else 'right')
+    violated = np.cumsum(np.bincount(levels, minlength=len(thresholds) + 1)[::-1])[::-1][1:]
+    longest = _longest_runs(levels, np.asarray(time, dtype=np.float64), len(thresholds))
+    result = {'threshold': thresholds, 'count': np.empty(len(thresholds), dtype=np.int64),
+              'longest': np.empty(len(thresholds))}
+    result['count'][order] = violated
+    result['longest'][order] = longest
+    result['fraction'] = result['count'] / max(len(values), 1)
+    return result
+
+
+def sweep_thresholds(values, time, candidates, comparisons):
+    """
+    threshold_sweep for several comparisons at once.
+
+    Parameters:
+    - values: {key: (N,) float} from sweep_values
+    - time: (N,) clock of the ticks
+    - candidates: {name: (K,) thresholds}, names from SWEEPS
+    - comparisons: From sweep_comparisons
+
+    Returns {key: threshold_sweep result}.
+    """
+    return {key: threshold_sweep(values[key], time, candidates[key[0]], comparison['inclusive'])
+            for key, comparison in comparisons.items()}
@@ -0,0 +1,152 @@
+import numpy as np
+
+from contracts.batch_evaluation import SPEC
+
+# Checks such as SHIP.G1 (position / velocity error) and OBSERVER.G2 (filter_quality)
+# chatter around their thresholds, and every violated tick becomes a log row. The filters
+# here work on status matrices (one column per check, see contracts/batch_evaluation.py):
+# - hysteresis: enter violation only once the margin drops to -enter, and leave it only
+#   once the margin is back above +exit (bands in the units of the margin, see
+#   evaluate_margins); in between the check keeps its previous state
+# - min_duration: violations shorter than this many seconds are dropped
+# What remains is logged as one episode (start, end) per violation instead of one row per tick.
+
+# {(subsystem, contract_id): {'min_duration': seconds, 'band': (enter, exit)}}
+VIOLATION_FILTERS = {
+    ('OBSERVER', 'G1'): {'min_duration': 1.0, 'band': (0.1, 0.1)},  # m
+    ('OBSERVER', 'G2'): {'min_duration': 1.0, 'band': (0.05, 0.05)},  # m/s
+    ('SHIP', 'G1'): {'min_duration': 2.0, 'band': (0.05, 0.05)},  # m and m/s
+}
+
+
+def violation_runs(status):
+    """
+    Runs of consecutive violated ticks in a status matrix, as arrays (start, stop, column)
+    with status[start:stop, column] all False, ordered by start tick, then column.
+    """
+    violated = np.pad(~np.asarray(status, dtype=bool), ((1, 1), (0, 0))).astype(np.int8)
+    edges = np.diff(violated, axis=0).T
+    # Transposed, both come out ordered by column and then tick, so they pair up
+    column, start = np.nonzero(edges == 1)
+    _, stop = np.nonzero(edges == -1)
+    order = np.lexsort((column, start))
+    return start[order], stop[order], column[order]
+
+
+def hysteresis(margins, enter, exit, initial=None):
+    """
+    Status matrix of margins with enter/exit bands: a check becomes violated where its
+    margin is <= -enter, holds again where it is > exit, and otherwise keeps its state
+    (initial, else margins[0] > 0, before the first row). Bands of 0 give margins > 0.
+
+    Parameters:
+    - margins: (N, C) float matrix from evaluate_margins
+    - enter, exit: Band widths >= 0, one value or one per column
+    - initial: (C,) bool state before the first row, e.g. the last row of the previous window
+    """
+    margins = np.asarray(margins, dtype=np.float64)
+    decided = np.where(margins <= -np.asarray(enter), 0, np.where(margins > np.asarray(exit), 1, -1))
+    if initial is None:
+        initial = margins[:1] > 0
+    # Forward-fill the last row where the margin left the band
+    rows = np.where(decided >= 0, np.arange(len(margins))[:, None], -1)
+    last = np.maximum.accumulate(rows, axis=0)
+    state = np.take_along_axis(decided, np.maximum(last, 0), axis=0) == 1
+    return np.where(last >= 0, state, np.broadcast_to(initial, margins.shape))
+
+
+class ViolationFilter:
+    def __init__(self, filters=VIOLATION_FILTERS, spec=SPEC):
+        """
+        Hysteresis and minimum-duration filtering of a status matrix fed window by window,
+        turning the violations that pass into episode log rows.
+
+        Parameters:
+        - filters: {(subsystem, contract_id): {'min_duration': ..., 'band': (enter, exit)}},
+          both keys optional; checks not listed log every violation
+        - spec: CompiledSpec whose status columns are fed
+
+        Typical use:
+            episodes = ViolationFilter()
+            for status, time, margins in windows:
+                logger.entries.extend(episodes.update(status, time, margins))
+            logger.entries.extend(episodes.finish())
+        """
+        self.spec = spec
+        index = {column: position for position, column in enumerate(spec.columns)}
+        self.min_duration = np.zeros(len(spec.columns))
+        self.enter = np.zeros(len(spec.columns))
+        self.exit = np.zeros(len(spec.columns))
+        self.banded = np.zeros(len(spec.columns), dtype=bool)
+        for (subsystem, contract_id), settings in filters.items():
+            if (subsystem, contract_id) not in index:
+                raise KeyError(f"Unknown contract {subsystem}.{contract_id} in violation filters")
+            column = index[subsystem, contract_id]
+            self.min_duration[column] = settings.get('min_duration', 0)
+            if 'band' in settings:
+                self.enter[column], self.exit[column] = settings['band']
+                self.banded[column] = True
+        self.state = None  # hysteresis state after the last row fed
+        self.open = np.full(len(spec.columns), np.nan)  # start time of violations still running
+        self.last_time = None
+
+    def filter(self, status, margins=None):
+        """Apply the hysteresis bands (margins are needed if any are configured), continuing from the last call."""
+        if not self.banded.any() or not len(status):
+            return status
+        if margins is None:
+            raise ValueError("Hysteresis bands need the margins of the checks (evaluate_margins).")
+        status = np.array(status, dtype=bool)
+        initial = None if self.state is None else self.state[self.banded]
+        status[:, self.banded] = hysteresis(margins[:, self.banded], self.enter[self.banded],
+                                            self.exit[self.banded], initial)
+        self.state = status[-1]
+        return status
+
+    def update(self, status, time, margins=None):
+        """
+        Feed the next rows of the status matrix (and their margins); returns the episodes
+        that ended within them and lasted at least their check's min_duration, as log rows
+        {start, end, subsystem, contract_id, message} ordered by end time.
+        """
+        if not len(status):
+            return []
+        status = self.filter(status, margins)
+        start, stop, column = violation_runs(status)
+        starts, ends = time[start], time[np.minimum(stop, len(time) - 1)]
+        previous = self.open
+        # Violations running on from the previous rows keep their start time...
+        starts = np.where((start == 0) & ~np.isnan(previous[column]), previous[column], starts)
+        # ... and those that stopped right at the first row end there
+        stopped = np.flatnonzero(~np.isnan(previous) & status[0])
+        ended = stop < len(time)
+        self.open = np.full(len(self.spec.columns), np.nan)
+        self.open[column[~ended]] = starts[~ended]
+        self.last_time = float(time[-1])
+
+        columns = np.concatenate([stopped, column[ended]])
+        starts = np.concatenate([previous[stopped], starts[ended]])
+        ends = np.concatenate([np.full(len(stopped), float(time[0])), ends[ended]])
+        keep = ends - starts >= self.min_duration[columns]
+        return self._episodes(starts[keep], ends[keep], columns[keep])
+
+    def finish(self):
+        """Episodes of the violations still running after the last row, whatever their duration."""
+        columns = np.flatnonzero(~np.isnan(self.open))
+        episodes = self._episodes(self.open[columns], np.full(len(columns), self.last_time), columns)
+        self.open = np.full(len(self.spec.columns), np.nan)
+        return episodes
+
+    def _episodes(self, starts, ends, columns):
+        # In the order they end, which holds across calls too
+        order = np.lexsort((columns, starts, ends))
+        return [
+            {
+                "start": round(float(starts[i]), 2),
+                "end": round(float(ends[i]), 2),
+                "subsystem": self.spec.columns[columns[i]][0],
+                "contract_id": self.spec.columns[columns[i]][1],
+                "message": self.spec.messages[self.spec.columns[columns[i]]],
+            }
+            for i in order.tolist()
+        ]
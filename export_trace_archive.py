@@ -0,0 +1,31 @@
+import sys
+import matlab.engine
+
+from contracts.subsystem_contracts import DEFAULT_THRESHOLDS
+from traces.compact_storage import compact_trace
+from traces.matlab_workspace import extract_workspace_bulk
+from traces.trace_archive import save_archive
+from traces.trace_store import write_trace_store
+
+# Usage: python export_trace_archive.py [output.npz | output_directory] [--compact]
+# Connects to the shared MATLAB session holding a finished Simulink run and writes every
+# signal used by pygame_simulation_v8.py to disk so it can be replayed without MATLAB.
+# A path ending in .npz gives a single archive; anything else gives a memory-mapped trace store.
+# --compact stores signals as float32 or scaled int16 where the quantization error stays
+# within 1% of the contract threshold the signal is checked against.
+
+arguments = [argument for argument in sys.argv[1:] if argument != "--compact"]
+output_path = arguments[0] if arguments else "simulation_trace.npz"
+
+eng = matlab.engine.connect_matlab()
+trace = extract_workspace_bulk(eng)
+encodings = None
+if "--compact" in sys.argv:
+    trace, encodings = compact_trace(trace, DEFAULT_THRESHOLDS)
+    for name, encoding in encodings.items():
+        print(f"{name}: {encoding['dtype']} (max error {encoding['max_error']:.3g})")
+
+if output_path.endswith(".npz"):
+    print("Trace archive saved to:", save_archive(output_path, trace, encodings))
+else:
+    print("Trace store saved to:", write_trace_store(output_path, trace, encodings))
@@ -0,0 +1,48 @@
+import sys
+
+from contracts.subsystem_contracts import DEFAULT_THRESHOLDS, INPUT_SIGNALS, evaluate_windows
+from logs.violation_logger import ViolationLogger
+from traces.incremental_poller import IncrementalPoller
+
+# Usage: python live_contract_check.py [poll_interval_seconds] [--store directory] [--fake]
+# Checks the v8 subsystem contracts while the Simulink model in the shared MATLAB session is
+# still running. Every poll only transfers the samples logged since the previous one; the
+# contracts are evaluated on each batch of Eta ticks as soon as every input has reached them.
+# --store also appends the incoming rows to a trace store, so the run can be replayed with
+# pygame_simulation_v8.py (TRACE_STORE) or offline_contract_check.py afterwards.
+# --fake follows a synthetic run from traces/fake_matlab_engine.py logged at 50x real time.
+
+arguments = sys.argv[1:]
+store = None
+if "--store" in arguments:
+    store = arguments[arguments.index("--store") + 1]
+    del arguments[arguments.index("--store"):arguments.index("--store") + 2]
+fake = "--fake" in arguments
+arguments = [argument for argument in arguments if argument != "--fake"]
+interval = float(arguments[0]) if arguments else 1.0
+
+if fake:
+    from traces import fake_matlab_engine as matlab_engine
+    matlab_engine.configure(sim_rate=50.0)
+else:
+    import matlab.engine as matlab_engine
+eng = matlab_engine.connect_matlab()
+
+
+def print_report(report):
+    if report['lag'] is not None:
+        print(f"t = {report['latest_time']:.1f}s, checked up to {report['evaluated_until'] or 0.0:.1f}s "
+              f"(lag {report['lag']:.2f}s, fetch {report['fetch_seconds'] * 1000:.0f}ms)")
+
+
+poller = IncrementalPoller(eng, names=INPUT_SIGNALS, interval=interval, store=store, keep_trace=False)
+violation_logger = ViolationLogger()
+summary = evaluate_windows(poller.iter_windows(on_report=print_report), DEFAULT_THRESHOLDS, violation_logger)
+
+print(f"Checked {summary['samples']} samples")
+for system, counts in summary['violations'].items():
+    for contract_id, count in sorted(counts.items()):
+        print(f"  [{system}] {contract_id}: {count} violations")
+print("Violations saved to:", violation_logger.save())
+if store:
+    print("Trace store saved to:", store)
@@ -3,9 +3,17 @@ import csv
 import os
 from datetime import datetime
 
+FIELDNAMES = ["time", "subsystem", "contract_id", "message"]
+
+# One row per violation episode (contracts/violation_filters.py) instead of per violated tick
+EPISODE_FIELDNAMES = ["start", "end", "subsystem", "contract_id", "message"]
+
 class ViolationLogger:
-    def __init__(self):
+    def __init__(self, fieldnames=FIELDNAMES, name="violations_log"):
         self.entries = []
+        self.filepath = None
+        self.fieldnames = fieldnames
+        self.name = name
 
     def collect(self, subsystem_name, time, violations):
         for entry in violations:
@@ -16,13 +24,43 @@ class ViolationLogger:
                 "message": entry.get("message")
             })
 
-    def save(self, directory="logs"):
+    def _new_file(self, directory):
         if not os.path.exists(directory):
             os.makedirs(directory)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join(directory, f"violations_log_{timestamp}.csv")
+        filepath = os.path.join(directory, f"{self.name}_{timestamp}.csv")
         with open(filepath, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["time", "subsystem", "contract_id", "message"])
-            writer.writeheader()
-            writer.writerows(self.entries)
+            csv.DictWriter(f, fieldnames=self.fieldnames).writeheader()
+        return filepath
+
+    def _append(self, filepath):
+        with open(filepath, "a", newline="") as f:
+            csv.DictWriter(f, fieldnames=self.fieldnames).writerows(self.entries)
+
+    def flush(self, directory="logs"):
+        # Append what has been collected so far to this run's file and drop it from memory,
+        # so long runs evaluated window by window keep a bounded number of entries.
+        if self.filepath is None:
+            self.filepath = self._new_file(directory)
+        self._append(self.filepath)
+        self.entries = []
+        return self.filepath
+
+    def save(self, directory="logs"):
+        # Once entries have been flushed, the rest goes to the same file so the run stays in
+        # one log; otherwise every call writes a new file with all entries and keeps them.
+        if self.filepath is not None:
+            return self.flush(directory)
+        filepath = self._new_file(directory)
+        self._append(filepath)
         return filepath
+
+
+class NullLogger:
+    # Takes the place of a ViolationLogger when only the summary or the status matrix is
+    # wanted (sharded workers, tests): entries are dropped on flush and nothing is written
+    def __init__(self):
+        self.entries = []
+
+    def flush(self):
+        self.entries = []
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import numpy as np
+
+from contracts.batch_evaluation import HIERARCHY, evaluate_windows_batch
+from contracts.sharded_evaluation import evaluate_sharded
+from contracts.subsystem_contracts import DEFAULT_THRESHOLDS, INPUT_SIGNALS, evaluate_windows
+from contracts.violation_filters import ViolationFilter
+from logs.violation_logger import EPISODE_FIELDNAMES, ViolationLogger
+from traces.signal_registry import archive_registry, store_registry
+from traces.trace_stream import iter_trace_windows
+
+# Usage: python offline_contract_check.py <trace.npz | trace_store_dir> [window_samples] [--per-tick] [--margins]
+#        [--episodes] [--sharded]
+# Checks the v8 subsystem contracts and the system-level contracts above them (MPCS, SITAW,
+# DP_SYSTEM, TA, TD, SHIP_SYSTEM; SYSTEM_SPEC in contracts/contract_spec.py) over a recorded
+# run without pygame or MATLAB, for the same log as pygame_simulation_v8.py.
+# The trace is memory-mapped and evaluated window by window, so run length is not limited by RAM.
+# Each window is evaluated with array operations (contracts/batch_evaluation.py); --per-tick
+# uses the v8 subsystem contract classes tick by tick instead, which gives their part of the
+# log much more slowly.
+# --margins also reports, per check, the smallest robustness margin over the run (how close
+# it came to being violated; negative means how far it was violated) and when it occurred.
+# --episodes filters chattering checks with the hysteresis bands and minimum durations of
+# contracts/violation_filters.py and logs one row per violation episode instead of per tick.
+# --sharded splits the run into one time shard per core, evaluated in worker processes
+# (contracts/sharded_evaluation.py), for the same log as the default sequential mode.
+
+# Worker processes of --sharded may re-import this script (spawn start method), so the run is guarded
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:]
+                 if argument not in ("--per-tick", "--margins", "--episodes", "--sharded")]
+    source = arguments[0]
+    window_samples = int(arguments[1]) if len(arguments) > 1 else 100000
+    margins = "--margins" in sys.argv
+    episodes = "--episodes" in sys.argv
+    sharded = "--sharded" in sys.argv
+    per_tick = "--per-tick" in sys.argv
+    if sharded and (margins or episodes or per_tick):
+        sys.exit("--sharded cannot be combined with --per-tick, --margins or --episodes")
+    if per_tick and margins:
+        sys.exit("--per-tick cannot be combined with --margins")
+    if per_tick and episodes:
+        sys.exit("--per-tick cannot be combined with --episodes")
+    evaluate = evaluate_windows if per_tick else evaluate_windows_batch
+
+    if os.path.isdir(source):
+        registry = store_registry(source)
+    else:
+        registry = archive_registry(source)
+
+    violation_logger = ViolationLogger(EPISODE_FIELDNAMES, "violation_episodes") if episodes else ViolationLogger()
+    windows = iter_trace_windows(registry, window_samples, names=INPUT_SIGNALS)
+    if sharded:
+        summary = evaluate_sharded(source, DEFAULT_THRESHOLDS, violation_logger, HIERARCHY,
+                                   window_samples=window_samples)
+    elif evaluate is evaluate_windows:
+        summary = evaluate(windows, DEFAULT_THRESHOLDS, violation_logger)
+    else:
+        summary = evaluate(windows, DEFAULT_THRESHOLDS, violation_logger, HIERARCHY, margins=margins,
+                           filters=ViolationFilter(spec=HIERARCHY) if episodes else None)
+
+    print(f"Checked {summary['samples']} samples")
+    for system, counts in summary['violations'].items():
+        for contract_id, count in sorted(counts.items()):
+            print(f"  [{system}] {contract_id}: {count} violations")
+    if episodes:
+        print("After filtering:")
+        for system, counts in summary['episodes'].items():
+            for contract_id, count in sorted(counts.items()):
+                print(f"  [{system}] {contract_id}: {count} episodes")
+    if margins:
+        print("Smallest margins:")
+        for (system, contract_id), (margin, time) in summary['worst_margins'].items():
+            if np.isfinite(margin):
+                print(f"  [{system}] {contract_id}: {margin:+.3f} at t = {time:.2f}s")
+    print("Violations saved to:", violation_logger.save())
+    if not sharded:
+        print(registry.report())
@@ -3,17 +3,21 @@ import pygame
 import numpy as np
 import math
 import sys
-import matlab.engine
 
 
-from contracts.observer_contract import ObserverContract
-from contracts.reference_model_contract import ReferenceModelContract
-from contracts.dp_controller_contract import DPControllerContract
-from contracts.thrust_model_contract import ThrustModelContract
-from contracts.disturbance_contract import DisturbanceContract
-from contracts.sov_contract import ShipContract
+from contracts.base_contract import StatusHistory
+from contracts.batch_evaluation import HIERARCHY, spec_inputs, violation_records
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.online_monitor import OnlineMonitor
+from contracts.subsystem_contracts import PHYSICAL_RANGES, SUBSYSTEMS, contract_input_masks, source_signals
 
 from logs.violation_logger import ViolationLogger
+from traces.minmax_pyramid import build_signal_pyramids
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+from traces.signal_registry import archive_registry, store_registry
+from traces.time_alignment import align_trace
+from traces.workspace_cache import WorkspaceCache
 
 import imageio
 import pygame.surfarray
@@ -27,69 +31,80 @@ violation_logger = ViolationLogger()
 
 
 # === MATLAB + DATA EXTRACTION ===
-eng = matlab.engine.connect_matlab()
-
-def convert_to_numpy_array(dataseries):
-    time_values = np.asarray(eng.getfield(dataseries, 'Time'))
-    data_values = np.asarray(eng.getfield(dataseries, 'Data'))
-    return time_values, data_values
-
-# Extract timeseries data from MATLAB workspace
-eta = eng.workspace['Eta']
-eta_sp = eng.workspace['Eta_sp']
-eta_obs = eng.workspace['Eta_obs']
-nu = eng.workspace['nu']
-nu_sp = eng.workspace['nu_sp']
-nu_obs = eng.workspace['nu_obs']
-wind_in_body_frame = eng.workspace['Wind_body_frame']
-wind_direction = eng.workspace['wind_direction']
-wind_velocity = eng.workspace['wind_velocity']
-current = eng.workspace['Current_in_body_frame']
-waves = eng.workspace['Waves_in_body_frame']
-
-Wave_height = eng.workspace['Hs']
-controller_force = eng.workspace['Controller_force']
-thruster_force = eng.workspace['Thruster_force']
-thrust_dynamic_force = eng.workspace['Thrust_dynamic_force']
-_, controller_force_data = convert_to_numpy_array(controller_force)
-_, thruster_force_data = convert_to_numpy_array(thruster_force)
-_, thrust_dynamic_force_data = convert_to_numpy_array(thrust_dynamic_force)
-
-
-
-eta_time, eta_data = convert_to_numpy_array(eta)
-_, eta_sp_data = convert_to_numpy_array(eta_sp)
-_, eta_obs_data = convert_to_numpy_array(eta_obs)
-_, nu_data = convert_to_numpy_array(nu)
-_, nu_sp_data = convert_to_numpy_array(nu_sp)
-_, nu_obs_data = convert_to_numpy_array(nu_obs)
-_, wind_data = convert_to_numpy_array(wind_in_body_frame)
-_, wind_speed_data = convert_to_numpy_array(wind_velocity)
-_, wind_direction_data = convert_to_numpy_array(wind_direction)
-_, current_data = convert_to_numpy_array(current)
-_, waves_data = convert_to_numpy_array(waves)
+# Set to an archive written by export_trace_archive.py to replay a run without MATLAB
+TRACE_ARCHIVE = None
+# Or a trace store directory; signals are memory-mapped instead of loaded into RAM
+TRACE_STORE = None
+# Extracted workspaces are cached here, so re-running on an unchanged Simulink result skips the transfer
+TRACE_CACHE_DIR = "trace_cache"
+# Serve a synthetic (or archived) workspace from traces/fake_matlab_engine.py instead of MATLAB
+FAKE_ENGINE = False
+
+# Trace signals the compiled hierarchy reads, plus what the renderer draws
+NEEDED_SIGNALS = source_signals(HIERARCHY.signals) + ['wind_direction']
+
+# Signals are only read once a contract or the renderer asks for them; a live workspace is
+# cached (and transferred on a miss) for the needed signals only
+if TRACE_STORE:
+    registry = store_registry(TRACE_STORE)
+elif TRACE_ARCHIVE:
+    registry = archive_registry(TRACE_ARCHIVE)
+else:
+    if FAKE_ENGINE:
+        from traces import fake_matlab_engine as matlab_engine
+    else:
+        import matlab.engine as matlab_engine
+    eng = matlab_engine.connect_matlab()
+    registry = WorkspaceCache(TRACE_CACHE_DIR).registry(eng, NEEDED_SIGNALS)
+
+registry.load(NEEDED_SIGNALS)
+
+# Put every logger on the Eta clock so all signals can be indexed with the same t
+trace, time_report = align_trace(registry, master='eta', names=NEEDED_SIGNALS)
+for name, entry in time_report.items():
+    if entry['resampled']:
+        print(f"Resampled {name} onto the Eta clock ({entry['samples']} samples, max offset {entry['max_offset']:.3f}s)")
+
+# Fix every signal's shape once (Hs broadcast to a series, singleton columns squeezed)
+signals = SignalBundle(trace['eta'][0], {name: data for name, (_, data) in trace.items()})
+
+# NaN / Inf / time order / physical range checks for the whole run in one vectorized pass
+signal_masks = validate_signals(signals, PHYSICAL_RANGES)
+for name, counts in signal_masks.invalid_counts().items():
+    print(f"Invalid {name} samples: " + ", ".join(f"{count} {kind}" for kind, count in counts.items()))
+contract_inputs = contract_input_masks(signals, signal_masks)
+
+# Min/max pyramids for range queries and the zoomed-out timeline
+pyramids = build_signal_pyramids(signals)
+
+eta_time = signals.time
+eta_data = signals['eta']
+eta_sp_data = signals['eta_sp']
+eta_obs_data = signals['eta_obs']
+wind_speed_data = signals['wind_speed']
+wind_direction_data = signals['wind_direction']
+
+####### THRESHOLDS
+# Defaults are kept with the contract definitions in contracts/contract_spec.py;
+# override entries here, e.g. THRESHOLDS['position'] = 2 for DP 3
+THRESHOLDS = dict(DEFAULT_THRESHOLDS)
+POSITION_THRESHOLD = THRESHOLDS['position']
 
 # === CONTRACT LOGGING SETUP ===
-contract_logs = {
-    'SHIP': [],
-    'OBSERVER': [],
-    'REFERENCE': [],
-    'DP': [],
-    'THRUST': [],
-    'DISTURBANCE': []
+# The contract spec is monitored online: every tick is fed once, and its statuses come
+# back (into one int8 row per tick) as soon as every check of the tick is decided, which
+# for temporal checks (always / eventually within T) can be a few ticks later. The
+# system-level contracts (MPCS, SITAW, ...) are monitored and logged with the subsystem ones
+monitor = OnlineMonitor(THRESHOLDS, HIERARCHY)
+monitor_inputs = dict(spec_inputs(signals, contract_inputs, HIERARCHY), time=eta_time)
+monitored = 0  # ticks fed to the monitor so far
+contract_history = StatusHistory({system: contract.contract_ids for system, contract in HIERARCHY.contracts.items()},
+                                 len(eta_data))
 
-}
 
-####### THRESHOLDS
-WIND_SPEED_THRESHOLD = 20 #20-25m/s
-# WIND_MAG_THRESHOLD = 500000
-# CURRENT_MAG_THRESHOLD = 300 
-CURRENT_SPEED_THRESHOLD = 0.8 #0.5-0.77m/s
-WAVE_HEIGHT_THRESHOLD = 2.5 #2.5m
-# WAVE_MAG_THRESHOLD = 5000000000
-POSITION_THRESHOLD = 1 #1-2m for DP 2/3
-VELOCITY_THRESHOLD = 0.4 #0.3-0.5m/s
-REFERENCE_SPIKE_THRESHOLD = 10.0
+def record_statuses(first, times, status):
+    violation_logger.entries.extend(violation_records(status, times, HIERARCHY))
+    contract_history.record_rows(first, status)
 
 # === PYGAME SETUP ===
 
@@ -215,7 +230,29 @@ def draw_scale():
 
 
 
-def draw_violation_logs(screen, font, contract_logs, t):
+def draw_timeline(screen, font, pyramid, t, threshold):
+    # Whole-run envelope of a signal (one min/max bar per pixel column) with the threshold and a cursor at t
+    x, y, w, h = 10, HEIGHT - 190, WIDTH - 20, 40
+    pygame.draw.rect(screen, (250, 250, 250), (x, y, w, h))
+    mins, maxs = pyramid.envelope(0, len(pyramid), w)
+    top = max(np.nanmax(maxs), threshold) * 1.1 if np.any(np.isfinite(maxs)) else threshold * 1.1
+    scale = (h - 4) / top if top > 0 else 0
+    columns = len(mins)
+    for i in range(columns):
+        if np.isnan(mins[i]):
+            continue
+        px = x + i * w // columns
+        color = RED if maxs[i] > threshold else BLUE
+        pygame.draw.line(screen, color, (px, y + h - 2 - int(mins[i] * scale)), (px, y + h - 2 - int(maxs[i] * scale)))
+    ty = y + h - 2 - int(threshold * scale)
+    pygame.draw.line(screen, ORANGE, (x, ty), (x + w, ty))
+    cx = x + int(t * w / max(len(pyramid) - 1, 1))
+    pygame.draw.line(screen, BLACK, (cx, y), (cx, y + h), 2)
+    pygame.draw.rect(screen, BLACK, (x, y, w, h), 1)
+    screen.blit(font.render("Position error [m]", True, BLACK), (x + 5, y + 3))
+
+
+def draw_violation_logs(screen, font, history, t):
     x, y = 10, HEIGHT - 140
     pygame.draw.rect(screen, (250, 250, 250), (x, y, WIDTH - 20, 130))
     pygame.draw.rect(screen, BLACK, (x, y, WIDTH - 20, 130), 2)
@@ -231,9 +268,9 @@ def draw_violation_logs(screen, font, contract_logs, t):
         "DISTURBANCE": {"G1": "Disturbance data not valid or missing"}
     }
 
-    for system, logs in contract_logs.items():
-        if t < len(logs):
-            status = logs[t]["status"]
+    for system in SUBSYSTEMS:
+        if t < len(eta_time):
+            status = history.status(system, t)
             for key, value in status.items():
                 if not value:
                     msg = contract_meanings.get(system, {}).get(key, f"{key} violated")
@@ -242,7 +279,7 @@ def draw_violation_logs(screen, font, contract_logs, t):
 
 
 # === CONTRACT DASHBOARD (Expanded A/G view) ===
-def draw_contract_dashboard(screen, font, contract_logs, t, eta_time):
+def draw_contract_dashboard(screen, font, history, t, eta_time):
     x_offset = WIDTH - 400
     y_offset = 200
     box_width = 350
@@ -259,8 +296,8 @@ def draw_contract_dashboard(screen, font, contract_logs, t, eta_time):
         screen.blit(font.render(system, True, (0, 0, 0)), (x_offset, y_cursor))
         y_cursor += line_height
 
-        if contract_logs[system]:
-            status_dict = contract_logs[system][-1]['status']
+        status_dict = history.status(system, t)
+        if status_dict:
             col_x = x_offset
             for key, value in status_dict.items():
                 color = (0, 180, 0) if value else (220, 0, 0)
@@ -270,13 +307,13 @@ def draw_contract_dashboard(screen, font, contract_logs, t, eta_time):
         y_cursor += line_height + line_spacing
 
 # === CONTRACT DASHBOARD (Linked Flow View) ===
-def draw_contract_dashboard2(screen, font, contract_logs, t, eta_time):
+def draw_contract_dashboard2(screen, font, history, t, eta_time):
     pygame.draw.rect(screen, (240, 240, 240), (WIDTH - 410, 20, 390, 560), border_radius=10)
     pygame.draw.rect(screen, (0, 0, 0), (WIDTH - 410, 20, 390, 560), 2, border_radius=10)
 
     screen.blit(font.render(f"Time: {eta_time[t].item():.2f}s", True, (0, 0, 0)), (WIDTH - 400, 30))
 
-    status = {sys: contract_logs[sys][-1]['status'] if contract_logs[sys] else {} for sys in contract_logs}
+    status = {sys: history.status(sys, t) for sys in SUBSYSTEMS}
 
     def draw_node(label, status_keys, x, y, node_color=(0, 0, 0)):
         pygame.draw.rect(screen, (255, 255, 255), (x, y, 90, 20 + 20 * len(status_keys)))
@@ -311,12 +348,12 @@ def draw_contract_dashboard2(screen, font, contract_logs, t, eta_time):
     draw_arrow(base_x + 100, 310, base_x + 150, 310)  # SHIP → DP (feedback)
 
 # === CONTRACT DASHBOARD (Horizontal Linked Flow View) ===
-def draw_contract_dashboard3(screen, font, contract_logs, t, eta_time):
+def draw_contract_dashboard3(screen, font, history, t, eta_time):
     pygame.draw.rect(screen, (240, 240, 240), (WIDTH - 410, 20, 390, 480), border_radius=10)
     pygame.draw.rect(screen, (0, 0, 0), (WIDTH - 410, 20, 390, 480), 2, border_radius=10)
 
     screen.blit(font.render(f"Time: {eta_time[t].item():.2f}s", True, (0, 0, 0)), (WIDTH - 400, 30))
-    status = {sys: contract_logs[sys][-1]['status'] if contract_logs[sys] else {} for sys in contract_logs}
+    status = {sys: history.status(sys, t) for sys in SUBSYSTEMS}
 
     def draw_node(label, keys, x, y):
         height = 20 + 20 * len(keys)
@@ -361,12 +398,12 @@ def draw_contract_dashboard3(screen, font, contract_logs, t, eta_time):
 
 
 # === CONTRACT DASHBOARD (Clean Horizontal Report Layout) ===
-def draw_contract_dashboard1(screen, font, contract_logs, t, eta_time):
+def draw_contract_dashboard1(screen, font, history, t, eta_time):
     pygame.draw.rect(screen, (240, 240, 240), (WIDTH - 430, 10, 410, 480), border_radius=10)
     pygame.draw.rect(screen, (0, 0, 0), (WIDTH - 430, 10, 410, 480), 2, border_radius=10)
 
     screen.blit(font.render(f"Time: {eta_time[t].item():.2f}s", True, (0, 0, 0)), (WIDTH - 420, 20))
-    status = {sys: contract_logs[sys][-1]['status'] if contract_logs[sys] else {} for sys in contract_logs}
+    status = {sys: history.status(sys, t) for sys in SUBSYSTEMS}
 
     def draw_node(label, keys, x, y, width=95, color=(0, 0, 0)):
         height = 20 + 20 * len(keys)
@@ -437,129 +474,10 @@ while running and time_step < len(eta_data):
 
     # Example time loop structure:
     t = time_step
-    # Extract relevant time-step data
-    eta_t = eta_data[t]
-    eta_sp_t = eta_sp_data[t]
-    eta_obs_t = eta_obs_data[t]
-    nu_t = nu_data[t]
-    nu_sp_t = nu_sp_data[t]
-    nu_obs_t = nu_obs_data[t]
-    tau_est = controller_force_data[t]
-    thruster_forces = thruster_force_data[t]
-    thrust_dyn = thrust_dynamic_force_data[t]
-    wind_t = wind_speed_data[t][0]
-    current_t = current_data[t][:2]
-    waves_t = waves_data[t]
-    wave_height_t = Wave_height#Wave_height[t][0] if isinstance(Wave_height[t], (list, np.ndarray)) else Wave_height[t]
-
-    # === COMPUTATION BLOCKS ===
-    # Observer
-    wma_position_valid = np.all(np.abs(eta_obs_t - eta_t) < POSITION_THRESHOLD)
-    filter_quality = np.all(np.abs(nu_obs_t - nu_data[t]) < VELOCITY_THRESHOLD)
-
-    observer_contract = ObserverContract(
-        eta=eta_t,
-        sensors_available=True,
-        tau_est=tau_est,
-        eta_hat=eta_obs_t,
-        nu_hat=nu_obs_t,
-        filter_quality=filter_quality,
-        wma_position_valid=wma_position_valid
-    )
-    observer_status, observer_logs = observer_contract.evaluate()
-    violation_logger.collect("OBSERVER", eta_time[t], observer_logs)
-
-    # Reference Model
-    is_smoothed = np.all(np.abs(np.gradient(eta_sp_t)) < REFERENCE_SPIKE_THRESHOLD)
-    ref_model_contract = ReferenceModelContract(
-        eta_sp=eta_sp_t,
-        nu_sp=nu_sp_t,
-        smoothed_sp=is_smoothed,
-        setpoints_valid=True #Depends on if human provides setpoint
-    )
-    ref_status, ref_logs = ref_model_contract.evaluate()
-    violation_logger.collect("REFERENCE", eta_time[t], ref_logs)
-
-    # DP Controller
-    # error_reduction_valid = np.linalg.norm(eta_obs_t - eta_sp_t) < POSITION_THRESHOLD
-
-    dp_contract = DPControllerContract(
-        eta_sp=eta_sp_t,
-        nu_sp=nu_sp_t,
-        eta_hat=eta_obs_t,
-        nu_hat=nu_obs_t,
-        tau=tau_est,
-        setpoints_smoothed=is_smoothed,
-        error_reduction_valid=None
-    )
-    dp_status, dp_logs = dp_contract.evaluate()
-    violation_logger.collect("DP", eta_time[t], dp_logs)
-
-    # Thrust Model
-    # Max limits [kN] as per your image
-    max_thrusts = [125000, 150000, 125000, 300000, 300000]
-    thrust_error = tau_est - thrust_dyn
-    thrust_model_contract = ThrustModelContract(
-        tau_d=tau_est,
-        thruster_working=all(not (np.isnan(force) or np.abs(force) < 1e-3) for force in thruster_forces),
-        # thruster_force_valid=np.all(np.abs(thruster_force_data[t]) < 1e8),
-        thruster_force_valid = all(abs(thruster_forces[i]) <= max_thrusts[i] for i in range(5)),
-        thrust_output_valid=thrust_dyn is not None and not np.any(np.isnan(thrust_dyn))
-    )
-    thrust_status, thrust_logs = thrust_model_contract.evaluate()
-    violation_logger.collect("THRUST", eta_time[t], thrust_logs)
-
-    # Disturbance Model
-    wind_available = wind_speed_data[t][0] is not None and not np.isnan(wind_speed_data[t][0])
-    wave_available = Wave_height[t][0] if isinstance(Wave_height, (list, np.ndarray)) else Wave_height
-    wave_available = wave_available is not None and not np.isnan(wave_available)
-    current_available = not np.any(np.isnan(current_data[t][:2]))
-
-    spectra_valid = wind_available and wave_available and current_available
-    disturbance_model_contract = DisturbanceContract(
-        eta=eta_t,
-        disturbance_sensor_available=True,
-        spectra_valid=spectra_valid
-    )
-    disturbance_status, disturbance_logs = disturbance_model_contract.evaluate()
-    violation_logger.collect("DISTURBANCE", eta_time[t], disturbance_logs)
-
-    # Ship Contract
-    ship_pos_error_valid = np.linalg.norm(eta_t - eta_sp_t) < POSITION_THRESHOLD
-    ship_vel_error_valid = np.linalg.norm(nu_t - nu_sp_t) < VELOCITY_THRESHOLD
-    ship_contract = ShipContract(
-        disturbance_data={
-            'wind': wind_t,
-            'wave': wave_height_t,
-            'current': np.linalg.norm(current_t)
-        },
-        disturbance_limit_data={
-            'wind': WIND_SPEED_THRESHOLD,
-            'wave': WAVE_HEIGHT_THRESHOLD,
-            'current': CURRENT_SPEED_THRESHOLD
-        },
-        subsystem_outputs_valid=all([
-            observer_status['G1'], observer_status['G2'],
-            ref_status['G1'], ref_status['G2'], dp_status['G1'],
-            thrust_status['G1'], disturbance_status['G1']
-        ]),
-        estimation_accuracy=observer_status['G1'],
-        system_health_ok=True,
-        position_error_valid=ship_pos_error_valid,
-        velocity_error_valid=ship_vel_error_valid
-    )
-    ship_status, ship_logs = ship_contract.evaluate()
-    violation_logger.collect("SHIP", eta_time[t], ship_logs)
-
-    # === LOGGING ===
-    contract_logs['SHIP'].append({'time': eta_time[t], 'status': ship_status})
-    contract_logs['OBSERVER'].append({'time': eta_time[t], 'status': observer_status})
-    contract_logs['REFERENCE'].append({'time': eta_time[t], 'status': ref_status})
-    contract_logs['DP'].append({'time': eta_time[t], 'status': dp_status})
-    contract_logs['THRUST'].append({'time': eta_time[t], 'status': thrust_status})
-    contract_logs['DISTURBANCE'].append({'time': eta_time[t], 'status': disturbance_status})
-     
-    # print(contract_logs)
+    if t >= monitored:
+        # === LOGGING ===
+        record_statuses(*monitor.update({name: monitor_inputs[name][monitored:t + 1] for name in monitor.signals}))
+        monitored = t + 1
 
     x, y, yaw = eta_obs_data[time_step]
     path_history.append((x, y))
@@ -572,8 +490,8 @@ while running and time_step < len(eta_data):
         draw_scale()
 
         if time_step < len(wind_speed_data) and time_step < len(wind_direction_data):
-            wind_speed = wind_speed_data[time_step][0]
-            wind_dir = wind_direction_data[time_step][0]
+            wind_speed = wind_speed_data[time_step]
+            wind_dir = wind_direction_data[time_step]
             draw_wind_vector(x, y, wind_speed, wind_dir)
             draw_wind_indicator(wind_speed, wind_dir)
             # wind_vector = wind_data[time_step, 1:3]  # Fx, Fy
@@ -590,8 +508,9 @@ while running and time_step < len(eta_data):
         #     draw_contract_dashboard(screen, font, contract_logs, time_step, eta_time)
 
         if time_step < len(eta_data):
-            draw_contract_dashboard(screen, font, contract_logs, time_step, eta_time)
-        draw_violation_logs(screen, font, contract_logs, time_step)
+            draw_contract_dashboard(screen, font, contract_history, time_step, eta_time)
+        draw_timeline(screen, font, pyramids['position_error'], time_step, POSITION_THRESHOLD)
+        draw_violation_logs(screen, font, contract_history, time_step)
         pygame.display.flip()
 
         # In your simulation loop, after pygame.display.flip()
@@ -604,11 +523,13 @@ while running and time_step < len(eta_data):
     manual_control = False
 
 # After the simulation ends:
+record_statuses(*monitor.finish())
 imageio.mimsave("simulation_output.mp4", frames, fps=10)
 
 
 log_path = violation_logger.save()
 print("Violations saved to:", log_path)
+print(registry.report())
 
 waiting = True
 while waiting:
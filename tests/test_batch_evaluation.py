@@ -0,0 +1,37 @@
+import numpy as np
+
+from contracts.batch_evaluation import evaluate_windows_batch
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.subsystem_contracts import evaluate_windows
+from logs.violation_logger import ViolationLogger
+from traces.fake_matlab_engine import synthetic_trace
+from traces.trace_stream import iter_trace_windows
+
+
+def _trace(seed, multirate):
+    trace = synthetic_trace(3000, seed=seed)
+    # An idle thruster and one beyond its limit, so the THRUST assumptions fail too
+    thruster_force = trace['thruster_force'][1]
+    thruster_force[5] = 0.0
+    thruster_force[7, 2] = 4e5
+    if multirate:
+        time_values, data_values = trace['wind_speed']
+        trace['wind_speed'] = (time_values[::7], data_values[::7])
+    return trace
+
+
+def test_batch_and_per_tick_write_the_same_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    thresholds = dict(DEFAULT_THRESHOLDS, position=0.45, velocity=0.25, wind_speed=12)
+    for seed, multirate in [(1, False), (2, True)]:
+        per_tick = ViolationLogger(name=f"per_tick_{seed}")
+        batch = ViolationLogger(name=f"batch_{seed}")
+        expected = evaluate_windows(iter_trace_windows(_trace(seed, multirate), 700), thresholds, per_tick)
+        summary = evaluate_windows_batch(iter_trace_windows(_trace(seed, multirate), 700), thresholds, batch)
+        assert summary == expected
+        with open(per_tick.filepath) as f:
+            rows = f.read()
+        with open(batch.filepath) as f:
+            assert f.read() == rows
+        assert np.sum([sum(counts.values()) for counts in summary['violations'].values()]) == rows.count('\n') - 1
+        assert rows.count('\n') > 100
@@ -0,0 +1,47 @@
+import numpy as np
+
+from contracts.batch_evaluation import HIERARCHY, evaluate_windows_batch
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.subsystem_contracts import INPUT_SIGNALS
+from logs.violation_logger import NullLogger
+from traces.compact_storage import compact_trace, dequantize_int16, quantize_int16
+from traces.fake_matlab_engine import synthetic_trace
+from traces.signal_registry import archive_registry
+from traces.trace_archive import save_archive
+from traces.trace_stream import iter_trace_windows
+
+
+def _statuses(path):
+    registry = archive_registry(str(path))
+    status = np.zeros((len(registry['eta'].time), len(HIERARCHY.columns)), dtype=bool)
+    evaluate_windows_batch(iter_trace_windows(registry, 700, names=INPUT_SIGNALS), DEFAULT_THRESHOLDS, NullLogger(),
+                           HIERARCHY, status_out=status)
+    return status
+
+
+def test_quantize_int16_keeps_zero_exact():
+    data = np.random.default_rng(1).normal(0.0, 1e5, (500, 5))
+    data[::9, 2] = 0.0
+    codes, scale, offset = quantize_int16(data)
+    restored = dequantize_int16(codes, scale, offset)
+    assert np.all(restored[::9, 2] == 0.0)
+    assert np.all(np.abs(restored - data) <= scale / 2 * (1 + 1e-9))
+
+
+def test_compacted_trace_gives_same_statuses(tmp_path):
+    trace = synthetic_trace(2000, seed=3)
+    thruster_force = trace['thruster_force'][1]
+    thruster_force[100:150, 1] = 0.0  # dead thruster
+    thruster_force[400:410] = np.nan
+    trace['wind_speed'][1][::37] = np.nan
+    trace['current'][1][250:260, 0] = np.nan
+
+    compacted, encodings = compact_trace(trace, DEFAULT_THRESHOLDS)
+    assert encodings['thruster_force']['dtype'] == 'int16'
+    save_archive(str(tmp_path / "full.npz"), trace)
+    save_archive(str(tmp_path / "compact.npz"), compacted, encodings)
+
+    full = _statuses(tmp_path / "full.npz")
+    column = HIERARCHY.columns.index(('THRUST', 'A2'))
+    assert not full[100:150, column].any()
+    np.testing.assert_array_equal(_statuses(tmp_path / "compact.npz"), full)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from contracts.batch_evaluation import HIERARCHY, spec_inputs
+from contracts.contract_graph import ContractGraph
+from contracts.contract_spec import DEFAULT_THRESHOLDS, SYSTEM_SPEC
+from contracts.subsystem_contracts import INPUT_SIGNALS, PHYSICAL_RANGES, contract_input_masks
+from traces.fake_matlab_engine import synthetic_trace
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+from traces.trace_stream import iter_trace_windows
+
+
+def _values(seed):
+    window = next(iter_trace_windows(synthetic_trace(400, seed=seed), 400))
+    signals = SignalBundle(window.time, {name: window.signals[name] for name in INPUT_SIGNALS})
+    inputs = contract_input_masks(signals, validate_signals(signals, PHYSICAL_RANGES))
+    return spec_inputs(signals, inputs, HIERARCHY)
+
+
+def test_incremental_evaluation_matches_status_matrix():
+    values = _values(1)
+    graph = ContractGraph(HIERARCHY)
+    graph.set_signals(values, 400)
+    graph.set_thresholds(DEFAULT_THRESHOLDS)
+    np.testing.assert_array_equal(graph.status_matrix(), HIERARCHY.status_matrix(values, DEFAULT_THRESHOLDS, 400))
+
+    thresholds = dict(DEFAULT_THRESHOLDS, wind_speed=12)
+    graph.set_thresholds(thresholds)
+    np.testing.assert_array_equal(graph.status_matrix(), HIERARCHY.status_matrix(values, thresholds, 400))
+    assert graph.recomputed == ['SHIP', 'SHIP_SYSTEM']
+
+    thresholds['position'] = 0.4
+    graph.set_thresholds(thresholds)
+    np.testing.assert_array_equal(graph.status_matrix(), HIERARCHY.status_matrix(values, thresholds, 400))
+    assert set(graph.recomputed) == {'OBSERVER', 'SHIP', 'DP_SYSTEM', 'MPCS', 'SHIP_SYSTEM'}
+
+    values = dict(values, wave_height=_values(2)['wave_height'])
+    graph.set_signals({'wave_height': values['wave_height']}, 400)
+    np.testing.assert_array_equal(graph.status_matrix(), HIERARCHY.status_matrix(values, thresholds, 400))
+    assert 'OBSERVER' not in graph.recomputed
+
+    graph.status_matrix()
+    assert graph.recomputed == []
+
+
+def test_contract_change_recompiles_only_the_graph():
+    values = _values(3)
+    graph = ContractGraph(HIERARCHY)
+    graph.set_signals(values, 400)
+    graph.set_thresholds(DEFAULT_THRESHOLDS)
+    graph.status_matrix()
+
+    checks = dict(SYSTEM_SPEC['SITAW'], G2={'expr': "norm_dof(eta_obs - eta) <= 0.01", 'message': ""})
+    graph.set_contract('SITAW', checks)
+    status = graph.status_matrix()
+    assert graph.recomputed == ['SITAW', 'MPCS', 'SHIP_SYSTEM']
+    changed = graph.spec
+    np.testing.assert_array_equal(status, changed.status_matrix(values, DEFAULT_THRESHOLDS, 400))
+    # The spec the graph was built on is left as it was
+    assert HIERARCHY.contracts['SITAW'] is not changed.contracts['SITAW']
+    assert "0.01" not in HIERARCHY.contracts['SITAW'].source
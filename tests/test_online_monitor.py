@@ -0,0 +1,58 @@
+import numpy as np
+
+from contracts.batch_evaluation import HIERARCHY, evaluate_batch, spec_inputs
+from contracts.contract_spec import CONTRACT_SPEC, DEFAULT_THRESHOLDS
+from contracts.online_monitor import OnlineMonitor
+from contracts.spec_compiler import CompiledSpec
+from contracts.subsystem_contracts import INPUT_SIGNALS, PHYSICAL_RANGES, contract_input_masks
+from traces.fake_matlab_engine import synthetic_trace
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+from traces.trace_stream import iter_trace_windows
+
+# The v8 contracts plus temporal checks nested in each other and referred to across subsystems
+TEMPORAL_SPEC = dict(CONTRACT_SPEC, SHIP=dict(
+    CONTRACT_SPEC['SHIP'],
+    G3={'expr': "recovers(SHIP.G1, 5)", 'message': ""},
+    G4={'expr': "always(SHIP.A2 or eventually(wind_speed < 11, 0, 2.5), 1, 3)", 'message': ""},
+    G5={'expr': "until(present(eta), norm_dof(eta - eta_sp) < threshold.position, 0, 4)", 'message': ""},
+), LATE={'G1': {'expr': "SHIP.G3 and not eventually(SHIP.G4, 0, 1)", 'message': ""}})
+
+# Tight enough for the synthetic trace to leave and re-enter the trajectory
+THRESHOLDS = dict(DEFAULT_THRESHOLDS, position=0.45, velocity=0.25, wind_speed=12)
+
+
+def _stream(spec, seed):
+    rng = np.random.default_rng(seed)
+    window = next(iter_trace_windows(synthetic_trace(600, seed=seed), 600))
+    signals = SignalBundle(window.time, {name: window.signals[name] for name in INPUT_SIGNALS})
+    inputs = contract_input_masks(signals, validate_signals(signals, PHYSICAL_RANGES))
+    expected = evaluate_batch(signals, inputs, THRESHOLDS, spec)
+    values = dict(spec_inputs(signals, inputs, spec), time=signals.time)
+
+    monitor = OnlineMonitor(THRESHOLDS, spec)
+    rows = []
+    start = 0
+    while start < len(signals):
+        stop = start + int(rng.integers(1, 7))
+        first, time, status = monitor.update({name: values[name][start:stop] for name in monitor.signals})
+        assert first == sum(len(row) for row in rows) and len(time) == len(status)
+        rows.append(status)
+        start = stop
+    first, time, status = monitor.finish()
+    assert first == sum(len(row) for row in rows)
+    rows.append(status)
+    return np.concatenate(rows), expected
+
+
+def test_online_monitor_matches_batch_on_temporal_checks():
+    spec = CompiledSpec(TEMPORAL_SPEC)
+    assert spec.horizon > 0
+    for seed in (1, 2):
+        status, expected = _stream(spec, seed)
+        np.testing.assert_array_equal(status, expected)
+
+
+def test_online_monitor_matches_batch_on_the_hierarchy():
+    status, expected = _stream(HIERARCHY, 3)
+    np.testing.assert_array_equal(status, expected)
@@ -0,0 +1,28 @@
+from contracts.batch_evaluation import HIERARCHY, evaluate_windows_batch
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.sharded_evaluation import evaluate_sharded
+from contracts.subsystem_contracts import INPUT_SIGNALS
+from logs.violation_logger import ViolationLogger
+from traces.fake_matlab_engine import synthetic_trace
+from traces.signal_registry import archive_registry
+from traces.trace_archive import save_archive
+from traces.trace_stream import iter_trace_windows
+
+
+def test_sharded_log_equals_sequential(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_archive("trace.npz", synthetic_trace(3000, seed=8))
+    # Tight enough for SHIP_SYSTEM.G1 to stay violated past the 30s of SHIP_SYSTEM.G3
+    thresholds = dict(DEFAULT_THRESHOLDS, position=0.25, velocity=0.25, wind_speed=12)
+    sequential = ViolationLogger(name="sequential")
+    expected = evaluate_windows_batch(iter_trace_windows(archive_registry("trace.npz"), 700, names=INPUT_SIGNALS),
+                                      thresholds, sequential, HIERARCHY)
+    # Windows much shorter than the 30s halo of SHIP_SYSTEM.G3, and shards ending mid-window
+    sharded = ViolationLogger(name="sharded")
+    summary = evaluate_sharded("trace.npz", thresholds, sharded, HIERARCHY, workers=2, shards=7, window_samples=130)
+    assert summary == expected
+    assert expected['violations']['SHIP_SYSTEM'].get('G3')
+    with open(sequential.filepath) as f:
+        rows = f.read()
+    with open(sharded.filepath) as f:
+        assert f.read() == rows
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from contracts.batch_evaluation import HIERARCHY, spec_inputs
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.spec_compiler import CompiledSpec
+from contracts.subsystem_contracts import INPUT_SIGNALS, PHYSICAL_RANGES, contract_input_masks, source_signals
+from traces.fake_matlab_engine import synthetic_trace
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+from traces.trace_stream import iter_trace_windows
+
+
+def _spec(checks):
+    return CompiledSpec({'TEST': {contract_id: {'expr': expr, 'message': ''} for contract_id, expr in checks.items()}},
+                        {})
+
+
+def test_negated_comparison_margin_agrees_at_equality():
+    spec = _spec({'G1': "not (x < threshold.position)", 'G2': "not (x <= threshold.position)",
+                  'G3': "not (not (x < threshold.position))"})
+    signals = {'x': np.array([0.5, 1.0, 1.5, np.nan])}
+    thresholds = {'position': 1.0}
+    status = spec.status_matrix(signals, thresholds, 4)
+    np.testing.assert_array_equal(status[:, 0], [False, True, True, True])
+    np.testing.assert_array_equal(status[:, 1], [False, False, True, True])
+    np.testing.assert_array_equal(spec.margin_matrix(signals, thresholds, 4) > 0, status)
+
+
+def test_shift_margins_rebuilds_min_of_comparisons():
+    spec = _spec({'G1': "x < threshold.position and y < 5", 'G2': "x < threshold.position and present(y)",
+                  'G3': "x < threshold.position or not (y >= 5)", 'G4': "y <= threshold.position * 2"})
+    signals = {'x': np.array([0.0, 0.5, 2.0, 0.2]), 'y': np.array([4.5, 1.0, 0.0, 7.0])}
+    thresholds = dict(DEFAULT_THRESHOLDS, position=1.0)
+    comparisons = spec.comparison_margins(signals, thresholds)
+    np.testing.assert_array_equal(spec.combine_margins(comparisons, 4), spec.margin_matrix(signals, thresholds, 4))
+    with pytest.raises(ValueError, match="TEST: difference"):
+        spec.shift_margins(comparisons, thresholds, {'position': 3.0}, 4)
+
+    single = _spec({'G1': "x < threshold.position and y < 5", 'G3': "x < threshold.position or not (y >= 5)"})
+    comparisons = single.comparison_margins(signals, thresholds)
+    shifted = single.shift_margins(comparisons, thresholds, {'position': 3.0}, 4)
+    np.testing.assert_allclose(shifted, single.margin_matrix(signals, dict(thresholds, position=3.0), 4))
+
+
+def test_shift_margins_of_the_hierarchy():
+    window = next(iter_trace_windows(synthetic_trace(500, seed=4), 500))
+    signals = SignalBundle(window.time, {name: window.signals[name] for name in INPUT_SIGNALS})
+    inputs = contract_input_masks(signals, validate_signals(signals, PHYSICAL_RANGES))
+    values = spec_inputs(signals, inputs, HIERARCHY)
+    changes = {'position': 0.4, 'velocity': 0.7, 'wind_speed': 12.0, 'reference_spike': 3.0}
+    comparisons = HIERARCHY.comparison_margins(values, DEFAULT_THRESHOLDS)
+    shifted = HIERARCHY.shift_margins(comparisons, DEFAULT_THRESHOLDS, changes, len(signals))
+    expected = HIERARCHY.margin_matrix(values, dict(DEFAULT_THRESHOLDS, **changes), len(signals))
+    np.testing.assert_allclose(shifted, expected)
+    np.testing.assert_array_equal(shifted > 0, expected > 0)
+    assert np.all(np.isfinite(expected[:, HIERARCHY.columns.index(('THRUST', 'A3'))]))
+
+
+def test_until_margin_matches_status_and_brute_force():
+    spec = CompiledSpec({'A': {'G1': {'expr': "x < threshold.position", 'message': ''}},
+                         'B': {'G1': {'expr': "y > 0", 'message': ''},
+                               'G2': {'expr': "until(A.G1, B.G1, 0.2, 0.5)", 'message': ''}}}, {})
+    rng = np.random.default_rng(3)
+    time = np.cumsum(rng.uniform(0.05, 0.15, 200))
+    signals = {'time': time, 'x': rng.normal(0, 1, 200), 'y': rng.normal(-0.5, 1, 200)}
+    signals['x'][17] = np.nan
+    thresholds = {'position': 1.0}
+    margins = spec.margin_matrix(signals, thresholds, 200)
+    np.testing.assert_array_equal(margins > 0, spec.status_matrix(signals, thresholds, 200))
+
+    holding = np.where(np.isnan(signals['x']), -np.inf, 1.0 - signals['x'])
+    reached = signals['y']
+    expected = np.full(200, -np.inf)
+    for t in range(200):
+        for reach in range(t, 200):
+            if time[t] + 0.2 <= time[reach] <= time[t] + 0.5:
+                expected[t] = max(expected[t], min([reached[reach]] + list(holding[t:reach])))
+    np.testing.assert_allclose(margins[:, 2], expected)
+
+
+def test_source_signals_follow_the_spec():
+    assert source_signals(HIERARCHY.signals) == INPUT_SIGNALS
+    spec = _spec({'G1': "current_available and present(current_xy)",
+                  'G2': "thruster_working and all_dof(abs(thruster_force) <= thrust_limits)"})
+    assert source_signals(spec.signals) == ['thruster_force', 'current']
@@ -0,0 +1,80 @@
+import numpy as np
+
+from contracts.batch_evaluation import HIERARCHY, evaluate_batch
+from contracts.contract_spec import DEFAULT_THRESHOLDS, SYSTEM_SPEC
+from contracts.dp_contract import DPContract
+from contracts.mpcs_contract import MPCSContract
+from contracts.ship_contract import ShipContract
+from contracts.sitaw_contract import SITAWContract
+from contracts.subsystem_contracts import INPUT_SIGNALS, PHYSICAL_RANGES, contract_input_masks
+from contracts.ta_contract import ThrustAllocationContract
+from contracts.td_contract import ThrusterDynamicsContract
+from traces.fake_matlab_engine import synthetic_trace
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+from traces.trace_stream import iter_trace_windows
+
+# Tight enough for every system-level guarantee to fail somewhere on the synthetic trace;
+# wind_speed stays at the limit ShipContract has built in
+THRESHOLDS = dict(DEFAULT_THRESHOLDS, position=0.45, velocity=0.25, state_estimate=0.09, allocation_error=700,
+                  thrust_response=800)
+
+
+def _legacy_statuses(signals, inputs, t, thresholds):
+    # The earlier simulations' wiring of the system-level contract classes for one tick,
+    # with their status flags taken from the guarantees they stand for
+    force, realized = signals['controller_force'][t], signals['thrust_dynamic_force'][t]
+    current = np.linalg.norm(signals['current_xy'][t])
+    environment = {'wind': signals['wind_speed'][t], 'wave': signals['wave_height'][t], 'current': current}
+    ta = ThrustAllocationContract(requested_force_vector=force, thruster_config=[{'id': i} for i in range(5)],
+                                  allocation_success=True, allocation_error=force - realized,
+                                  allocation_threshold=thresholds['allocation_error'])
+    td = ThrusterDynamicsContract(commanded_thrust=force, actual_thrust=realized,
+                                  actuator_health_status=bool(inputs['thruster_working'][t]),
+                                  response_tolerance=thresholds['thrust_response'])
+    ta.run()
+    td.run()
+    dp = DPContract(received_setpoint=signals['eta_sp'][t], actual_vessel_state=signals['eta_obs'][t],
+                    setpoint_valid=True, thruster_feedback_status=bool(ta.value('G1') and td.value('G1')),
+                    position_threshold=thresholds['position'])
+    dp.run()
+    disturbances = np.array([signals['wind_speed'][t], signals['wave_height'][t], current])
+    sitaw = SITAWContract(vessel_state_estimate=signals['eta_obs'][t], disturbance_estimate=disturbances,
+                          true_vessel_state=signals['eta'][t], true_disturbances=disturbances,
+                          accuracy_thresholds={'state': thresholds['state_estimate'], 'disturbance': 0})
+    sitaw.run()
+    mpcs = MPCSContract(reference_path=signals['eta_sp'][t], vessel_state=signals['eta'][t],
+                        disturbance_data=environment, setpoints=signals['eta_sp'][t],
+                        dp_feedback_status=bool(dp.value('G1')),
+                        sitaw_data_accuracy=bool(sitaw.value('G1') and sitaw.value('G2')),
+                        position_threshold=thresholds['position'])
+    mpcs.run()
+    ship = ShipContract(reference_trajectory=signals['eta_sp'][t], vessel_trajectory=signals['eta'][t],
+                        observer_trajectory=signals['eta_obs'][t], reference_velocity=signals['nu_sp'][t],
+                        observer_velocity=signals['nu_obs'][t], environment_conditions=environment,
+                        mpcs_status=bool(mpcs.value('G1') and mpcs.value('G2')), dp_status=bool(dp.value('G1')),
+                        sitaw_status=True, position_threshold=thresholds['position'],
+                        velocity_threshold=thresholds['velocity'])
+    ship.run()
+    return {'TA': ta, 'TD': td, 'DP_SYSTEM': dp, 'SITAW': sitaw, 'MPCS': mpcs, 'SHIP_SYSTEM': ship}
+
+
+def test_system_spec_matches_the_contract_classes():
+    trace = synthetic_trace(600, seed=9)
+    # A wind sensor dropout, for the disturbance checks
+    trace['wind_speed'][1][200:230] = np.nan
+    window = next(iter_trace_windows(trace, 600))
+    signals = SignalBundle(window.time, {name: window.signals[name] for name in INPUT_SIGNALS})
+    inputs = contract_input_masks(signals, validate_signals(signals, PHYSICAL_RANGES))
+    status = evaluate_batch(signals, inputs, THRESHOLDS, HIERARCHY)
+    # Only the checks the classes have (SHIP_SYSTEM.G3 is new in the spec)
+    columns = {check: HIERARCHY.columns.index(check) for check in HIERARCHY.columns if check[0] in SYSTEM_SPEC}
+    compared = set()
+    for t in range(len(signals)):
+        for subsystem, contract in _legacy_statuses(signals, inputs, t, THRESHOLDS).items():
+            for contract_id, value in contract.contract_status.items():
+                assert bool(value) == status[t, columns[subsystem, contract_id]], (t, subsystem, contract_id)
+                compared.add((subsystem, contract_id))
+    assert compared == set(columns) - {('SHIP_SYSTEM', 'G3')}
+    for subsystem in ('TA', 'TD', 'DP_SYSTEM', 'SITAW', 'MPCS', 'SHIP_SYSTEM'):
+        assert not status[:, columns[subsystem, 'G1']].all()
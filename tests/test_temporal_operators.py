@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from contracts import temporal_operators
+from contracts.temporal_operators import always, eventually, recovers, sliding_min, until, window_bounds
+
+
+def _windows(time, a, b):
+    # Brute-force window of every tick: the indices with t + a <= time <= t + b
+    return [np.flatnonzero((time >= t + a) & (time <= t + b)) for t in time]
+
+
+def _brute_min(values, lo, hi):
+    values = np.where(np.isnan(values), -np.inf, values)
+    return np.array([values[start:stop].min() if stop > start else np.inf for start, stop in zip(lo, hi)])
+
+
+@pytest.mark.parametrize('a, b', [(0, 0.1), (0, 2.5), (0.7, 4.0), (3.0, 3.0)])
+def test_sliding_min_blocks(a, b, monkeypatch):
+    rng = np.random.default_rng(1)
+    time = np.arange(400) * 0.1
+    values = rng.normal(size=400)
+    values[rng.integers(0, 400, 20)] = np.nan
+    lo, hi = window_bounds(time, a, b)
+    # Fixed-step windows never need the deque
+    monkeypatch.setattr(temporal_operators, '_deque_min', None)
+    np.testing.assert_array_equal(sliding_min(values, lo, hi), _brute_min(values, lo, hi))
+
+
+def test_sliding_min_deque():
+    rng = np.random.default_rng(2)
+    # Bursts of fast samples between slow ones give windows of very different widths
+    time = np.cumsum(np.where(rng.random(600) < 0.2, 1.0, 0.01))
+    values = rng.normal(size=600)
+    lo, hi = window_bounds(time, 0.5, 2.0)
+    widths = (hi - lo)[hi < len(time)]
+    assert widths.min() * 4 < widths.max()
+    np.testing.assert_array_equal(sliding_min(values, lo, hi), _brute_min(values, lo, hi))
+
+
+def _trace(seed, length=300):
+    rng = np.random.default_rng(seed)
+    time = np.cumsum(rng.uniform(0.05, 0.2, length))
+    return time, rng.normal(0.8, 1, length), rng.normal(-0.5, 1, length)
+
+
+@pytest.mark.parametrize('a, b', [(0, 1.0), (0.5, 2.0), (0, 0)])
+def test_until_matches_brute_force(a, b):
+    time, holding, reached = _trace(3)
+    windows = _windows(time, a, b)
+    expected_status = [any(reached[reach] > 0 and np.all(holding[t:reach] > 0) for reach in window)
+                       for t, window in enumerate(windows)]
+    expected_margin = [max([min([reached[reach]] + list(holding[t:reach])) for reach in window], default=-np.inf)
+                       for t, window in enumerate(windows)]
+    np.testing.assert_array_equal(until(holding > 0, reached > 0, time, a, b), expected_status)
+    np.testing.assert_allclose(until(holding, reached, time, a, b), expected_margin)
+
+
+def test_recovers_matches_brute_force():
+    time, values, _ = _trace(4)
+    windows = _windows(time, 0, 1.5)
+    np.testing.assert_array_equal(recovers(values > 0, time, 1.5), [np.any(values[w] > 0) for w in windows])
+    np.testing.assert_array_equal(recovers(values, time, 1.5), [values[w].max() for w in windows])
+    # Margins and statuses agree for the other operators too
+    np.testing.assert_array_equal(always(values, time, 0.2, 1.0) > 0, always(values > 0, time, 0.2, 1.0))
+    np.testing.assert_array_equal(eventually(values, time, 0.2, 1.0) > 0, eventually(values > 0, time, 0.2, 1.0))
@@ -0,0 +1,74 @@
+import numpy as np
+
+from contracts.batch_evaluation import HIERARCHY, spec_inputs
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.subsystem_contracts import INPUT_SIGNALS, PHYSICAL_RANGES, contract_input_masks
+from contracts.threshold_sweep import _longest_runs, sweep_comparisons, sweep_values, threshold_sweep
+from traces.fake_matlab_engine import synthetic_trace
+from traces.signal_bundle import SignalBundle
+from traces.signal_validation import validate_signals
+from traces.trace_stream import iter_trace_windows
+
+
+def _brute_force(values, time, threshold, inclusive):
+    violated = ~(values <= threshold if inclusive else values < threshold)
+    longest = 0.0
+    start = None
+    for tick, bad in enumerate(violated.tolist() + [False]):
+        if bad and start is None:
+            start = tick
+        elif not bad and start is not None:
+            # A violation lasts until the tick where the check holds again, or the last tick
+            longest = max(longest, time[min(tick, len(time) - 1)] - time[start])
+            start = None
+    return np.count_nonzero(violated), longest
+
+
+def test_threshold_sweep_matches_brute_force():
+    rng = np.random.default_rng(5)
+    time = np.cumsum(rng.uniform(0.05, 0.3, 500))
+    values = np.round(rng.normal(1.0, 0.5, 500), 1)
+    values[rng.integers(0, 500, 10)] = np.nan
+    # Candidates equal to measured values check which side equality falls on
+    thresholds = np.concatenate([rng.uniform(0, 2, 40), [0.5, 1.0, 1.5, -1.0, 5.0]])
+    for inclusive in (False, True):
+        result = threshold_sweep(values, time, thresholds, inclusive)
+        for index, threshold in enumerate(thresholds):
+            count, longest = _brute_force(values, time, threshold, inclusive)
+            assert result['count'][index] == count
+            assert result['fraction'][index] == count / len(values)
+            assert np.isclose(result['longest'][index], longest)
+
+
+def test_longest_runs_matches_brute_force():
+    rng = np.random.default_rng(6)
+    for _ in range(20):
+        levels = rng.integers(0, 5, int(rng.integers(1, 40)))
+        time = np.cumsum(rng.uniform(0.1, 1, len(levels)))
+        longest = _longest_runs(levels, time, 5)
+        for k in range(5):
+            _, expected = _brute_force(levels.astype(float), time, k + 0.5, False)
+            assert np.isclose(longest[k], expected)
+
+
+def test_sweeps_follow_the_spec_comparisons():
+    window = next(iter_trace_windows(synthetic_trace(400, seed=7), 400))
+    signals = SignalBundle(window.time, {name: window.signals[name] for name in INPUT_SIGNALS})
+    inputs = contract_input_masks(signals, validate_signals(signals, PHYSICAL_RANGES))
+    values = spec_inputs(signals, inputs, HIERARCHY)
+    comparisons = sweep_comparisons(HIERARCHY)
+    assert comparisons[('position', 'SHIP.G1')]['inclusive'] is False
+    assert comparisons[('position', 'SHIP_SYSTEM.G1')]['inclusive'] is True
+    assert ('position', 'OBSERVER.G1') in comparisons
+
+    # Each comparison fails exactly where its check does once the other comparisons of the
+    # check always hold
+    swept = sweep_values(values, comparisons, len(signals))
+    thresholds = dict(DEFAULT_THRESHOLDS, position=0.45, velocity=np.inf)
+    status = HIERARCHY.status_matrix(values, thresholds, len(signals))
+    for checks, check in [('OBSERVER.G1', ('OBSERVER', 'G1')), ('SHIP.G1', ('SHIP', 'G1')),
+                          ('SHIP_SYSTEM.G1', ('SHIP_SYSTEM', 'G1'))]:
+        result = threshold_sweep(swept[('position', checks)], signals.time, [0.45],
+                                 comparisons[('position', checks)]['inclusive'])
+        assert result['count'][0] == np.count_nonzero(~status[:, HIERARCHY.columns.index(check)])
+    assert np.count_nonzero(~status[:, HIERARCHY.columns.index(('SHIP', 'G1'))]) > 0
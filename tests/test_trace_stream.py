@@ -0,0 +1,37 @@
+import numpy as np
+
+from traces.fake_matlab_engine import FakeMatlabEngine, synthetic_trace
+from traces.incremental_poller import IncrementalPoller
+from traces.trace_stream import iter_engine_windows, iter_trace_windows
+
+
+def _multirate_trace():
+    trace = synthetic_trace(1200, seed=4)
+    time_values, data_values = trace['wind_speed']
+    trace['wind_speed'] = (time_values[::7], data_values[::7])
+    return trace
+
+
+def test_engine_windows_match_trace_windows():
+    trace = _multirate_trace()
+    for window_length in (4, 13, 500, 5000):
+        expected = list(iter_trace_windows(trace, window_length))
+        windows = list(iter_engine_windows(FakeMatlabEngine(trace), window_length))
+        assert [window.start for window in windows] == [window.start for window in expected]
+        for window, reference in zip(windows, expected):
+            np.testing.assert_array_equal(window.time, reference.time)
+            for name in reference.signals:
+                np.testing.assert_array_equal(np.asarray(window.signals[name]).reshape(-1),
+                                              np.asarray(reference.signals[name]).reshape(-1))
+
+
+def test_poller_fetches_every_row_once():
+    trace = _multirate_trace()
+    poller = IncrementalPoller(FakeMatlabEngine(trace), names=list(trace))
+    for _ in range(3):
+        poller.fetch()
+    received = poller.trace()
+    for name, (time_values, data_values) in received.items():
+        if time_values is not None:
+            np.testing.assert_array_equal(time_values, trace[name][0])
+            np.testing.assert_array_equal(data_values, trace[name][1])
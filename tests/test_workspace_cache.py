@@ -0,0 +1,43 @@
+import numpy as np
+
+from traces.fake_matlab_engine import FakeMatlabEngine, synthetic_trace
+from traces.matlab_workspace import SIGNALS
+from traces.workspace_cache import WorkspaceCache, workspace_fingerprint
+
+
+def _engine():
+    trace = synthetic_trace(400, seed=2)
+    trace['wind_speed'][1][10] = np.nan
+    return FakeMatlabEngine(trace)
+
+
+def test_edit_next_to_nan_changes_fingerprint(tmp_path):
+    eng = _engine()
+    cache = WorkspaceCache(str(tmp_path))
+    first = cache.load(eng)
+    assert np.isnan(first['wind_speed'][1][10, 0])
+
+    eng.variables[SIGNALS['wind_speed']].Data[200] = 99.0
+    second = cache.load(eng)
+    assert second['wind_speed'][1][200, 0] == 99.0
+    assert len(cache.entries()) == 2
+
+
+def test_reordered_and_offsetting_edits_change_fingerprint():
+    eng = _engine()
+    key = workspace_fingerprint(eng)
+    data = eng.variables[SIGNALS['eta']].Data
+    data[[3, 4]] = data[[4, 3]]
+    swapped = workspace_fingerprint(eng)
+    assert swapped != key
+    data[5, 0] += 1.0
+    data[6, 0] -= 1.0
+    assert workspace_fingerprint(eng) not in (key, swapped)
+
+
+def test_moved_nan_changes_fingerprint():
+    eng = _engine()
+    key = workspace_fingerprint(eng)
+    data = eng.variables[SIGNALS['wind_speed']].Data
+    data[10], data[11] = data[11], np.nan
+    assert workspace_fingerprint(eng) != key
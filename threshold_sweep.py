@@ -0,0 +1,94 @@
+import csv
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from contracts.batch_evaluation import HIERARCHY, iter_ready_windows, spec_inputs
+from contracts.contract_graph import ContractGraph
+from contracts.contract_spec import DEFAULT_THRESHOLDS
+from contracts.subsystem_contracts import INPUT_SIGNALS, PHYSICAL_RANGES, contract_input_masks
+from contracts.threshold_sweep import SWEEPS, sweep_comparisons, sweep_thresholds, sweep_values
+from traces.signal_registry import archive_registry, store_registry
+from traces.signal_validation import validate_signals
+from traces.trace_stream import iter_trace_windows
+
+# Usage: python threshold_sweep.py <trace.npz | trace_store_dir> [candidates] [window_samples]
+# Violation rate curves of the swept thresholds in contracts/threshold_sweep.py (position,
+# velocity, wind_speed, current_speed) over a recorded run, instead of editing the
+# thresholds and replaying the run once per value. Every comparison of the contracts
+# (contracts/contract_spec.py, the system-level ones included) against a swept threshold
+# gets its own curve: the quantity it compares is computed once, window by window; then,
+# for each of [candidates] (default 251) thresholds evenly spaced over the range in SWEEPS,
+# the violated ticks, their fraction and the longest violation are written to
+# logs/threshold_sweep_<time>.csv.
+# For six of the candidates, the violations of every check that reads the threshold (directly
+# or through the checks it refers to, e.g. SHIP_SYSTEM.G2) are printed as well; these come from
+# re-evaluating the hierarchy incrementally (contracts/contract_graph.py) per candidate.
+
+source = sys.argv[1]
+candidate_count = int(sys.argv[2]) if len(sys.argv) > 2 else 251
+window_samples = int(sys.argv[3]) if len(sys.argv) > 3 else 100000
+
+if os.path.isdir(source):
+    registry = store_registry(source)
+else:
+    registry = archive_registry(source)
+
+candidates = {name: np.linspace(*sweep['range'], candidate_count) for name, sweep in SWEEPS.items()}
+# Candidates whose effect on every check of the hierarchy is evaluated as well
+checkpoints = {name: np.linspace(0, candidate_count - 1, min(candidate_count, 6)).astype(int) for name in SWEEPS}
+check_violations = {name: np.zeros((len(rows), len(HIERARCHY.columns)), dtype=np.int64)
+                    for name, rows in checkpoints.items()}
+
+graph = ContractGraph(HIERARCHY)
+graph.set_thresholds(DEFAULT_THRESHOLDS)
+comparisons = sweep_comparisons(HIERARCHY)
+times = []
+values = {key: [] for key in comparisons}
+for bundle, ready in iter_ready_windows(iter_trace_windows(registry, window_samples, names=INPUT_SIGNALS),
+                                        HIERARCHY.horizon):
+    inputs = contract_input_masks(bundle, validate_signals(bundle, PHYSICAL_RANGES))
+    window_values = spec_inputs(bundle, inputs, HIERARCHY)
+    times.append(bundle.time[:ready])
+    for key, value in sweep_values(window_values, comparisons, len(bundle)).items():
+        values[key].append(value[:ready])
+    graph.set_signals(window_values, len(bundle))
+    # Only the subsystems reading the changed threshold (and those above them) are recomputed
+    for name, rows in checkpoints.items():
+        for row, index in enumerate(rows):
+            graph.set_thresholds({name: candidates[name][index]})
+            check_violations[name][row] += np.count_nonzero(~graph.status_matrix()[:ready], axis=0)
+        graph.set_thresholds({name: DEFAULT_THRESHOLDS[name]})
+time = np.concatenate(times)
+values = {key: np.concatenate(parts) for key, parts in values.items()}
+
+results = sweep_thresholds(values, time, candidates, comparisons)
+
+print(f"Swept {candidate_count} thresholds over {len(time)} samples")
+if not os.path.exists("logs"):
+    os.makedirs("logs")
+path = os.path.join("logs", f"threshold_sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+with open(path, "w", newline="") as f:
+    writer = csv.writer(f)
+    writer.writerow(["threshold_name", "checks", "threshold", "violations", "fraction", "longest_s"])
+    for (name, checks), result in results.items():
+        for row in zip(result['threshold'], result['count'], result['fraction'], result['longest']):
+            writer.writerow([name, checks] + [f"{value:.6g}" for value in row])
+for name in SWEEPS:
+    print(f"  {name}:")
+    for (swept, checks), result in results.items():
+        if swept == name:
+            print(f"    value {'<=' if comparisons[(swept, checks)]['inclusive'] else '<'} {name} in {checks}:")
+            for index in checkpoints[name]:
+                print(f"      {result['threshold'][index]:8.3f}: {result['fraction'][index]:7.2%} violated, "
+                      f"longest {result['longest'][index]:.1f}s")
+    print("    Checks reading it:")
+    affected = [column for column, check in enumerate(HIERARCHY.columns) if name in HIERARCHY.reads_thresholds(*check)]
+    for row, index in enumerate(checkpoints[name]):
+        print(f"      {candidates[name][index]:8.3f}: "
+              + ", ".join(f"{'.'.join(HIERARCHY.columns[column])} {check_violations[name][row, column]}"
+                          for column in affected))
+print("Sweep saved to:", path)
+print(registry.report())
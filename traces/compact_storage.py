@@ -0,0 +1,191 @@
+import numpy as np
+
+from contracts.subsystem_contracts import MAX_THRUSTS, THRUSTER_IDLE_FORCE
+
+# Signal -> contract threshold its quantization error is checked against
+QUANTIZATION_THRESHOLDS = {
+    'eta': 'position',
+    'eta_sp': 'position',
+    'eta_obs': 'position',
+    'nu': 'velocity',
+    'nu_sp': 'velocity',
+    'nu_obs': 'velocity',
+    'wind_speed': 'wind_speed',
+    'current': 'current_speed',
+    'wave_height': 'wave_height',
+}
+
+# Signal -> magnitude a contract compares it against exactly (the thruster health test);
+# an encoding must keep every sample on the same side of it
+QUANTIZATION_CUTOFFS = {
+    'thruster_force': THRUSTER_IDLE_FORCE,
+}
+
+# Largest quantization error allowed, as a fraction of the threshold the signal is checked against
+DEFAULT_ERROR_FRACTION = 0.01
+
+INT16_NAN = -32768  # int16 has no NaN, so the lowest code is reserved for it
+INT16_LIMIT = 32767
+
+
+def signal_tolerances(thresholds, fraction=DEFAULT_ERROR_FRACTION):
+    """Absolute quantization error allowed per signal, derived from the contract thresholds."""
+    tolerances = {name: fraction * thresholds[key] for name, key in QUANTIZATION_THRESHOLDS.items()}
+    tolerances['thruster_force'] = fraction * min(MAX_THRUSTS)
+    return tolerances
+
+
+def quantize_int16(data):
+    """
+    Scale every column of data into int16 codes. Returns (codes, scale, offset) with
+    data ~= codes * scale + offset; NaN is stored as INT16_NAN. The offset is a whole
+    number of steps, so 0.0 (e.g. a dead thruster) has a code of its own and decodes exactly.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    columns = data.reshape(data.shape[0], -1) if data.ndim > 1 else data.reshape(-1, 1)
+    low = np.nanmin(columns, axis=0) if columns.size else np.zeros(columns.shape[1])
+    high = np.nanmax(columns, axis=0) if columns.size else np.zeros(columns.shape[1])
+    low = np.where(np.isnan(low), 0.0, low)
+    high = np.where(np.isnan(high), 0.0, high)
+    # One code is kept spare for rounding the offset onto the grid; a constant column is
+    # its own step, so it stays exact
+    middle = (high + low) / 2
+    scale = np.where(high > low, (high - low) / (2 * INT16_LIMIT - 1), np.where(middle != 0, np.abs(middle), 1.0))
+    offset = np.round(middle / scale) * scale
+
+    codes = np.round((columns - offset) / scale)
+    codes = np.where(np.isnan(codes), INT16_NAN, np.clip(codes, -INT16_LIMIT, INT16_LIMIT)).astype(np.int16)
+    return codes.reshape(data.shape), scale, offset
+
+
+def dequantize_int16(codes, scale, offset):
+    codes = np.asarray(codes)
+    columns = codes.reshape(codes.shape[0], -1) if codes.ndim > 1 else codes.reshape(-1, 1)
+    values = columns * np.asarray(scale) + np.asarray(offset)
+    values[columns == INT16_NAN] = np.nan
+    return values.reshape(codes.shape)
+
+
+class ScaledArray:
+    """
+    Read-only int16 column (usually a np.memmap) that indexes like the float64 array it encodes.
+    Only the rows that are indexed get dequantized.
+    """
+    def __init__(self, codes, scale, offset):
+        self.codes = codes
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def ndim(self):
+        return self.codes.ndim
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float64)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        row_index, rest = (index[0], index[1:]) if isinstance(index, tuple) else (index, ())
+        rows = np.asarray(self.codes[row_index])
+        if rows.ndim < self.codes.ndim:
+            values = dequantize_int16(rows.reshape((1,) + rows.shape), self.scale, self.offset)[0]
+        else:
+            values = dequantize_int16(rows, self.scale, self.offset)
+        return values[rest] if rest else values
+
+    def __array__(self, dtype=None, copy=None):
+        values = dequantize_int16(np.asarray(self.codes), self.scale, self.offset)
+        return values if dtype is None else values.astype(dtype)
+
+
+def max_error(original, restored):
+    original = np.asarray(original, dtype=np.float64)
+    restored = np.asarray(restored, dtype=np.float64)
+    finite = np.isfinite(original)
+    if not np.array_equal(np.isnan(original), np.isnan(restored)):
+        return np.inf
+    if not finite.any():
+        return 0.0
+    return float(np.max(np.abs(original[finite] - restored[finite])))
+
+
+def crosses_cutoff(original, restored, cutoff):
+    """Whether any finite sample lies on the other side of |x| >= cutoff after encoding."""
+    original = np.abs(np.asarray(original, dtype=np.float64))
+    restored = np.abs(np.asarray(restored, dtype=np.float64))
+    finite = np.isfinite(original)
+    return bool(np.any((original[finite] >= cutoff) != (restored[finite] >= cutoff)))
+
+
+def compact_signal(data, tolerance=None, mode="auto", cutoff=None):
+    """
+    Encode one Data array in a smaller dtype.
+
+    Parameters:
+    - tolerance: Largest absolute error allowed; None means the signal is not checked by a
+      contract threshold and is only narrowed to float32
+    - cutoff: Magnitude a contract compares the signal against exactly (QUANTIZATION_CUTOFFS);
+      an encoding that moves any sample across it is rejected like one exceeding tolerance
+    - mode: 'float32', 'int16', or 'auto' for the most compact one within tolerance
+
+    Returns (stored, encoding). encoding holds the dtype, int16 scale/offset and the measured
+    max_error; it falls back to float64 if the requested mode exceeds the tolerance.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    candidates = ["int16", "float32"] if mode == "auto" else [mode]
+    if mode == "auto" and tolerance is None:
+        candidates = ["float32"]
+
+    for candidate in candidates:
+        if candidate == "int16":
+            if np.any(np.isinf(data)):
+                continue
+            codes, scale, offset = quantize_int16(data)
+            restored = dequantize_int16(codes, scale, offset)
+            error = max_error(data, restored)
+            encoding = {'dtype': 'int16', 'scale': scale.tolist(), 'offset': offset.tolist(), 'max_error': error}
+            stored = codes
+        elif candidate == "float32":
+            stored = restored = data.astype(np.float32)
+            error = max_error(data, stored)
+            encoding = {'dtype': 'float32', 'max_error': error}
+        else:
+            raise ValueError(f"Unknown compact storage mode '{candidate}'.")
+        if cutoff is not None and crosses_cutoff(data, restored, cutoff):
+            continue
+        if tolerance is None or error <= tolerance:
+            return stored, encoding
+    return data, {'dtype': 'float64', 'max_error': 0.0}
+
+
+def decode_signal(stored, encoding):
+    """Wrap a stored array so it indexes as float64 again (int16 is dequantized lazily)."""
+    if encoding is None or encoding['dtype'] != 'int16':
+        return stored
+    return ScaledArray(stored, encoding['scale'], encoding['offset'])
+
+
+def compact_trace(trace, thresholds, mode="auto", fraction=DEFAULT_ERROR_FRACTION):
+    """
+    Encode every Data array of a trace {name: (time, data)}. Time vectors stay float64 so the
+    alignment stage sees the exact clock. Returns (trace, encodings) where encodings is
+    {name: encoding} for save_archive / write_trace_store.
+    """
+    tolerances = signal_tolerances(thresholds, fraction)
+    compacted = {}
+    encodings = {}
+    for name, (time_values, data_values) in trace.items():
+        if time_values is None or np.ndim(data_values) == 0:
+            compacted[name] = (time_values, data_values)
+            continue
+        stored, encoding = compact_signal(data_values, tolerances.get(name), mode, QUANTIZATION_CUTOFFS.get(name))
+        compacted[name] = (time_values, stored)
+        encodings[name] = encoding
+    return compacted, encodings
@@ -0,0 +1,476 @@
+import array
+import re
+import time
+
+import numpy as np
+
+from traces.matlab_workspace import SIGNALS
+from traces.trace_archive import load_archive
+
+# Drop-in stand-in for matlab.engine, serving a synthetic or archived workspace so the
+# ingestion, contract and rendering code can run (and be timed) on machines without MATLAB:
+#
+#   from traces import fake_matlab_engine as matlab_engine
+#   eng = matlab_engine.connect_matlab()
+#
+# Only the subset of MATLAB used by traces/*.py is understood by FakeMatlabEngine.eval.
+
+_defaults = {'trace': None, 'archive': None, 'latency': 0.0, 'bandwidth': None, 'double_api': 'legacy',
+             'sim_rate': None}
+
+
+def configure(trace=None, archive=None, latency=0.0, bandwidth=None, double_api='legacy', sim_rate=None):
+    """
+    Set what connect_matlab() serves when called without arguments.
+
+    Parameters:
+    - trace: {name: (time, data)} dict, e.g. from synthetic_trace()
+    - archive: Path of an archive written by export_trace_archive.py (used if trace is None)
+    - latency: Seconds added to every engine call
+    - bandwidth: Optional bytes per second used to add a transfer cost to every call
+    - double_api: How returned arrays behave, see FakeDouble
+    - sim_rate: Simulated seconds per wall-clock second to mimic a Simulink run that is still
+      going; only samples logged so far are visible. None serves the finished run
+    """
+    _defaults.update(trace=trace, archive=archive, latency=latency, bandwidth=bandwidth, double_api=double_api,
+                     sim_rate=sim_rate)
+
+
+def connect_matlab(name=None, **overrides):
+    settings = dict(_defaults, **overrides)
+    trace = settings['trace']
+    if trace is None:
+        trace = load_archive(settings['archive']) if settings['archive'] else synthetic_trace()
+    return FakeMatlabEngine(trace, latency=settings['latency'], bandwidth=settings['bandwidth'],
+                            double_api=settings['double_api'], sim_rate=settings['sim_rate'])
+
+
+def synthetic_trace(samples=6000, step=0.1, seed=0):
+    """
+    Generate a station-keeping run with the same signals and shapes the Simulink model logs:
+    column time vectors and one row per sample, with Hs as a constant.
+    """
+    rng = np.random.default_rng(seed)
+    time_values = (np.arange(samples) * step).reshape(-1, 1)
+    t = time_values[:, 0]
+
+    def noise(columns, scale):
+        return rng.normal(0.0, scale, (samples, columns))
+
+    eta_sp = np.column_stack([25 + 0.002 * t, -25 - 0.001 * t, 0.1 * np.sin(t / 60)])
+    eta = eta_sp + np.cumsum(noise(3, 0.01), axis=0) * 0.2 + 0.3 * np.sin(t / 8)[:, None]
+    eta_obs = eta + noise(3, 0.05)
+    nu_sp = np.gradient(eta_sp, step, axis=0)
+    nu = np.gradient(eta, step, axis=0)
+    nu_obs = nu + noise(3, 0.05)
+
+    wind_speed = (12 + 4 * np.sin(t / 120) + noise(1, 0.5)[:, 0]).reshape(-1, 1)
+    wind_direction = (0.8 + 0.2 * np.sin(t / 300)).reshape(-1, 1)
+    wind = np.column_stack([5e4 * wind_speed[:, 0] * np.cos(wind_direction[:, 0]),
+                            5e4 * wind_speed[:, 0] * np.sin(wind_direction[:, 0]),
+                            noise(1, 1e3)[:, 0]])
+    current = np.column_stack([0.3 + noise(1, 0.02)[:, 0], 0.2 + noise(1, 0.02)[:, 0], np.zeros(samples)])
+    waves = noise(3, 2e4)
+
+    controller_force = np.column_stack([-4e4 * (eta - eta_sp)[:, :2], -1e5 * (eta - eta_sp)[:, 2]])
+    thruster_force = np.column_stack([controller_force[:, 0] / 2, controller_force[:, 0] / 2,
+                                      controller_force[:, 1] / 3, controller_force[:, 1] / 3,
+                                      controller_force[:, 1] / 3]) + 100.0
+    thrust_dynamic_force = controller_force + noise(3, 500.0)
+
+    data = {
+        'eta': eta, 'eta_sp': eta_sp, 'eta_obs': eta_obs,
+        'nu': nu, 'nu_sp': nu_sp, 'nu_obs': nu_obs,
+        'wind': wind, 'wind_direction': wind_direction, 'wind_speed': wind_speed,
+        'current': current, 'waves': waves,
+        'controller_force': controller_force, 'thruster_force': thruster_force,
+        'thrust_dynamic_force': thrust_dynamic_force,
+    }
+    trace = {name: (time_values, values) for name, values in data.items()}
+    trace['wave_height'] = (None, 2.0)
+    return trace
+
+
+class FakeTimeseries:
+    def __init__(self, time_values, data_values):
+        self.Time = _as_matrix(time_values)
+        self.Data = _as_matrix(data_values)
+
+
+class FakeDouble:
+    """
+    Stand-in for matlab.double. Like the real class it is a column-major 2-D array that
+    converts element by element when handed to np.asarray as a sequence.
+
+    api selects which fast paths are exposed:
+    - 'memoryview': tomemoryview(), as in MATLAB R2022a and later
+    - 'legacy': the flat _data buffer and size tuple of older releases
+    - 'sequence': neither, only row indexing
+    """
+    def __init__(self, values, api='legacy'):
+        values = _as_matrix(np.asarray(values, dtype=np.float64))
+        self._values = values
+        self._api = api
+        if api != 'sequence':
+            self.size = values.shape
+            self._data = array.array('d', values.reshape(-1, order='F'))
+
+    def __new__(cls, values, api='legacy'):
+        if cls is FakeDouble and api == 'memoryview':
+            cls = _MemoryviewDouble
+        return super().__new__(cls)
+
+    def __len__(self):
+        return self._values.shape[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FakeDouble(self._values[index], self._api)
+        return [float(value) for value in self._values[index]]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class _MemoryviewDouble(FakeDouble):
+    def tomemoryview(self):
+        return memoryview(np.asfortranarray(self._values))
+
+
+class _Cell:
+    def __init__(self, value):
+        self.value = value
+
+
+class _Colon:
+    pass
+
+
+def _as_matrix(value):
+    # MATLAB values are at least 2-D; vectors from NumPy become columns
+    value = np.asarray(value)
+    if value.ndim == 0:
+        return value.reshape(1, 1)
+    if value.ndim == 1:
+        return value.reshape(-1, 1)
+    return value
+
+
+def _to_engine(value, double_api):
+    # What the real engine hands back: 1x1 doubles become Python floats, structs become
+    # dicts and everything else a matlab.double
+    if isinstance(value, _Cell):
+        return _to_engine(value.value, double_api)
+    if isinstance(value, dict):
+        return {key: _to_engine(item, double_api) for key, item in value.items()}
+    if isinstance(value, FakeTimeseries) or isinstance(value, str):
+        return value
+    value = np.asarray(value)
+    if value.size == 1:
+        return float(value.reshape(-1)[0]) if value.dtype != bool else bool(value.reshape(-1)[0])
+    return FakeDouble(value, double_api)
+
+
+def _payload_bytes(value):
+    if isinstance(value, dict):
+        return sum(_payload_bytes(item) for item in value.values())
+    if isinstance(value, FakeTimeseries):
+        return value.Time.nbytes + value.Data.nbytes
+    if isinstance(value, FakeDouble):
+        return value._values.nbytes
+    return np.asarray(value).nbytes if not isinstance(value, str) else len(value)
+
+
+class FakeMatlabEngine:
+    def __init__(self, trace, latency=0.0, bandwidth=None, double_api='legacy', sim_rate=None):
+        """
+        Parameters:
+        - trace: {name: (time, data)} served under the MATLAB names in traces.matlab_workspace.SIGNALS
+        - latency: Seconds added to every engine call
+        - bandwidth: Optional bytes per second used to add a transfer cost to every call
+        - double_api: 'memoryview', 'legacy' or 'sequence', see FakeDouble
+        - sim_rate: Optional simulated seconds per wall-clock second, see configure
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.double_api = double_api
+        self.sim_rate = sim_rate
+        self.started = time.monotonic()
+        self.calls = 0
+        self.variables = {}
+        for name, (time_values, data_values) in trace.items():
+            variable = SIGNALS.get(name, name)
+            if time_values is None:
+                self.variables[variable] = data_values
+            else:
+                self.variables[variable] = FakeTimeseries(time_values, data_values)
+        self.workspace = _Workspace(self)
+
+    def _call(self, value):
+        self.calls += 1
+        delay = self.latency
+        if self.bandwidth:
+            delay += _payload_bytes(value) / self.bandwidth
+        if delay:
+            time.sleep(delay)
+        return value
+
+    def visible_variables(self):
+        """The workspace as logged so far; everything when no sim_rate is set."""
+        if self.sim_rate is None:
+            return self.variables
+        sim_time = (time.monotonic() - self.started) * self.sim_rate
+        visible = {}
+        for variable, value in self.variables.items():
+            if isinstance(value, FakeTimeseries):
+                rows = int(np.searchsorted(value.Time[:, 0], sim_time, side='right'))
+                value = FakeTimeseries(value.Time[:rows], value.Data[:rows])
+            visible[variable] = value
+        return visible
+
+    def getfield(self, value, field):
+        return self._call(_to_engine(getattr(value, field), self.double_api))
+
+    def eval(self, expression, nargout=1):
+        result = _Parser(expression, self.visible_variables()).parse()
+        return self._call(_to_engine(result, self.double_api)) if nargout else None
+
+    def quit(self):
+        pass
+
+
+class _Workspace:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __getitem__(self, variable):
+        value = self.engine.visible_variables()[variable]
+        if isinstance(value, FakeTimeseries):
+            return self.engine._call(value)
+        return self.engine._call(_to_engine(value, self.engine.double_api))
+
+    def __setitem__(self, variable, value):
+        self.engine.variables[variable] = value
+
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)|('[^']*')|([A-Za-z_]\w*)"
+                    r"|(<=|>=|==|~=|[-+*/<>&|~:(),.{}\[\]]))")
+
+
+class _Parser:
+    """Recursive-descent evaluator for the MATLAB expressions built in traces/*.py."""
+
+    def __init__(self, expression, variables):
+        self.variables = variables
+        self.tokens = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = _TOKEN.match(expression, position)
+            if match is None or match.end() == position:
+                raise SyntaxError(f"Fake engine cannot parse: {expression[position:]!r}")
+            number, string, name, symbol = match.groups()
+            if number is not None:
+                self.tokens.append(('number', float(number)))
+            elif string is not None:
+                self.tokens.append(('string', string[1:-1]))
+            elif name is not None:
+                self.tokens.append(('name', name))
+            else:
+                self.tokens.append(('op', symbol))
+            position = match.end()
+        self.index = 0
+
+    def peek(self, value=None):
+        if self.index >= len(self.tokens):
+            return None
+        token = self.tokens[self.index]
+        if value is not None and token != ('op', value):
+            return None
+        return token
+
+    def take(self, value=None):
+        token = self.peek(value)
+        if token is None:
+            raise SyntaxError(f"Expected {value!r} in fake engine expression")
+        self.index += 1
+        return token
+
+    def parse(self):
+        value = self.expression()
+        if self.index != len(self.tokens):
+            raise SyntaxError("Trailing tokens in fake engine expression")
+        return value
+
+    def expression(self):
+        value = self.conjunction()
+        while self.peek('|'):
+            self.take()
+            value = np.logical_or(value, self.conjunction())
+        return value
+
+    def conjunction(self):
+        value = self.comparison()
+        while self.peek('&'):
+            self.take()
+            value = np.logical_and(value, self.comparison())
+        return value
+
+    def comparison(self):
+        value = self.range()
+        operators = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+                     '==': np.equal, '~=': np.not_equal}
+        while self.peek() is not None and self.peek()[0] == 'op' and self.peek()[1] in operators:
+            operator = operators[self.take()[1]]
+            value = operator(value, self.range())
+        return value
+
+    def range(self):
+        value = self.additive()
+        if self.peek(':'):
+            self.take()
+            stop = self.additive()
+            start = float(np.asarray(value).reshape(-1)[0])
+            stop = float(np.asarray(stop).reshape(-1)[0])
+            return np.arange(start, stop + 1).reshape(1, -1)
+        return value
+
+    def additive(self):
+        value = self.multiplicative()
+        while self.peek('+') or self.peek('-'):
+            operator = self.take()[1]
+            other = self.multiplicative()
+            value = value + other if operator == '+' else value - other
+        return value
+
+    def multiplicative(self):
+        value = self.unary()
+        while self.peek('*') or self.peek('/'):
+            operator = self.take()[1]
+            other = self.unary()
+            if operator == '*' and np.size(value) != 1 and np.size(other) != 1:
+                value = np.asarray(value) @ np.asarray(other)  # matrix product, as in MATLAB
+            else:
+                value = value * other if operator == '*' else value / other
+        return value
+
+    def unary(self):
+        if self.peek('-'):
+            self.take()
+            return -self.unary()
+        if self.peek('~'):
+            self.take()
+            return np.logical_not(self.unary())
+        return self.postfix()
+
+    def postfix(self):
+        kind, value = self.take()
+        if kind == 'number':
+            value = np.array([[value]])
+        elif kind == 'string':
+            pass
+        elif kind == 'name':
+            if self.peek('(') and value not in self.variables:
+                return self.call(value)
+            if value == 'Inf' and value not in self.variables:
+                return np.array([[np.inf]])
+            if value not in self.variables:
+                raise NameError(f"Undefined variable '{value}' in fake workspace")
+            value = self.variables[value]
+            if not isinstance(value, FakeTimeseries):
+                value = _as_matrix(value)
+        elif value == '(':
+            value = self.expression()
+            self.take(')')
+        elif value == '{':
+            value = _Cell(self.expression())
+            self.take('}')
+        elif value == '[':
+            parts = [] if self.peek(']') else self.arguments(']')
+            self.take(']')
+            value = np.hstack([np.asarray(part, dtype=np.float64).reshape(1, -1) for part in parts])
+        else:
+            raise SyntaxError(f"Unexpected {value!r} in fake engine expression")
+
+        while self.peek('.') or self.peek('('):
+            if self.take()[1] == '.':
+                value = getattr(value, self.take()[1])
+            else:
+                value = self.index_into(value, self.arguments(')'))
+                self.take(')')
+        return value
+
+    def arguments(self, closing):
+        arguments = []
+        while True:
+            if self.peek(':') and self.tokens[self.index + 1] in (('op', ','), ('op', closing)):
+                self.take()
+                arguments.append(_Colon())
+            else:
+                arguments.append(self.expression())
+            if not self.peek(','):
+                return arguments
+            self.take()
+
+    def index_into(self, value, arguments):
+        value = np.asarray(value)
+        if len(arguments) == 1:
+            flat = value.reshape(-1, 1, order="F")
+            if isinstance(arguments[0], _Colon):
+                return flat
+            selected = flat[self.rows(arguments[0], flat.shape[0])]
+            return selected.reshape(1, -1) if value.shape[0] == 1 else selected.reshape(-1, 1)
+        rows, columns = arguments
+        selected = value if isinstance(rows, _Colon) else value[self.rows(rows, value.shape[0])]
+        if not isinstance(columns, _Colon):
+            selected = selected[:, self.rows(columns, value.shape[1])]
+        return selected
+
+    @staticmethod
+    def rows(selector, length):
+        selector = np.asarray(selector).reshape(-1)
+        if selector.dtype == bool:
+            return selector
+        indices = selector.astype(np.int64) - 1
+        if np.any(indices < 0) or np.any(indices >= length):
+            raise IndexError("Index exceeds the number of array elements.")
+        return indices
+
+    def call(self, function):
+        self.take('(')
+        arguments = self.arguments(')')
+        self.take(')')
+        if function == 'struct':
+            return {arguments[i]: arguments[i + 1] for i in range(0, len(arguments), 2)}
+        values = [np.asarray(argument) for argument in arguments]
+        if function == 'numel':
+            return np.array([[values[0].size]], dtype=np.float64)
+        if function == 'size':
+            shape = np.array(values[0].shape, dtype=np.float64).reshape(1, -1)
+            if len(values) > 1:
+                return shape[:, [int(values[1].reshape(-1)[0]) - 1]]
+            return shape
+        if function == 'sum':
+            if values[0].shape[0] == 1:
+                return values[0].sum(axis=1, keepdims=True, dtype=np.float64)
+            return values[0].sum(axis=0, keepdims=True, dtype=np.float64)
+        if function == 'isnan':
+            return np.isnan(values[0])
+        if function == 'nnz':
+            return np.array([[np.count_nonzero(values[0])]], dtype=np.float64)
+        if function == 'find':
+            indices = np.flatnonzero(values[0].reshape(-1, order="F")) + 1.0
+            return indices.reshape(1, -1) if values[0].shape[0] == 1 else indices.reshape(-1, 1)
+        if function == 'cumsum':
+            return np.cumsum(values[0], axis=1 if values[0].shape[0] == 1 else 0, dtype=np.float64)
+        if function == 'histcounts':
+            # Bins [e_k, e_k+1), the last one closed; a row of counts
+            data, edges = values[0].reshape(-1), values[1].reshape(-1)
+            bins = np.searchsorted(edges, data, side='right') - 1
+            bins[data == edges[-1]] = len(edges) - 2
+            inside = (bins >= 0) & (bins < len(edges) - 1)
+            return np.bincount(bins[inside], minlength=len(edges) - 1).astype(np.float64).reshape(1, -1)
+        if function in ('max', 'min') and len(values) == 2:
+            return np.maximum(values[0], values[1]) if function == 'max' else np.minimum(values[0], values[1])
+        raise NameError(f"Function '{function}' is not supported by the fake engine")
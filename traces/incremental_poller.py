@@ -0,0 +1,188 @@
+import time
+
+import numpy as np
+
+from traces.matlab_workspace import SCALAR_SIGNALS, SIGNALS, extract_workspace_bulk
+from traces.time_alignment import build_index_map
+from traces.trace_store import append_trace_store
+from traces.trace_stream import TraceWindow
+
+
+def _newer_rows(received):
+    """MATLAB row selector for the samples logged after the first received rows."""
+    return f"{received + 1}:numel({{var}}.Time)"
+
+
+def _chunk_arrays(time_values, data_values):
+    time_values = np.asarray(time_values, dtype=np.float64).reshape(-1)
+    data_values = np.asarray(data_values, dtype=np.float64)
+    if not len(time_values):
+        return time_values, None
+    return time_values, data_values.reshape(len(time_values), -1)
+
+
+class IncrementalPoller:
+    def __init__(self, eng, names=None, master="eta", methods=None, tolerance=1e-9, interval=1.0,
+                 store=None, keep_trace=True):
+        """
+        Follow a Simulink run that is still logging to the MATLAB workspace.
+
+        Parameters:
+        - eng: MATLAB engine (or traces.fake_matlab_engine) session holding the run
+        - names: Signals to follow; defaults to every signal in traces.matlab_workspace.SIGNALS
+        - master: Signal whose ticks the contracts are evaluated on
+        - methods: Optional {name: 'zoh' | 'linear'} alignment per signal, as in align_trace
+        - interval: Seconds between polls in iter_windows
+        - store: Optional trace store directory the new rows are appended to
+        - keep_trace: Also accumulate the run in memory, see trace()
+        """
+        self.eng = eng
+        self.names = list(names) if names is not None else list(SIGNALS)
+        self.master = master
+        self.methods = methods or {}
+        self.tolerance = tolerance
+        self.interval = interval
+        self.store = store
+        self.keep_trace = keep_trace
+
+        self.timed = [name for name in self.names if name not in SCALAR_SIGNALS]
+        self.last_time = {name: None for name in self.timed}
+        self.received = {name: 0 for name in self.timed}  # rows fetched so far; the log only grows
+        self.scalars = {}
+        # Rows not yet covered by an emitted window, plus the sample held at its last tick
+        self.pending = {name: (np.empty(0), None) for name in self.timed}
+        self.chunks = {name: [] for name in self.timed}
+        self.evaluated_until = None
+        self.evaluated_samples = 0
+
+    def fetch(self):
+        """Pull only the rows logged since the previous poll, in one engine call."""
+        rows = {name: _newer_rows(self.received[name]) for name in self.timed}
+        chunk = extract_workspace_bulk(self.eng, self.names, rows=rows)
+        new_rows = {}
+        for name in self.names:
+            time_values, data_values = chunk[name]
+            if time_values is None:
+                self.scalars[name] = data_values
+                continue
+            time_values, data_values = _chunk_arrays(time_values, data_values)
+            if data_values is None:
+                continue
+            new_rows[name] = (time_values, data_values)
+            self.received[name] += len(time_values)
+            self.last_time[name] = float(time_values[-1])
+            pending_time, pending_data = self.pending[name]
+            if pending_data is not None:
+                time_values = np.concatenate([pending_time, time_values])
+                data_values = np.concatenate([pending_data, data_values])
+            self.pending[name] = (time_values, data_values)
+        if self.keep_trace:
+            for name, rows in new_rows.items():
+                self.chunks[name].append(rows)
+        if self.store:
+            stored = {name: (None, value) for name, value in self.scalars.items()}
+            stored.update(new_rows)
+            append_trace_store(self.store, stored)
+        return new_rows
+
+    def ready_until(self):
+        """Latest time every followed signal has reached, so ticks up to it are final."""
+        if any(last is None for last in self.last_time.values()):
+            return None
+        return min(self.last_time.values())
+
+    def next_window(self, final=False):
+        """
+        Align the master ticks that became final since the last window; None if there are none.
+        With final=True the run is over, so every remaining tick is emitted and slower signals
+        hold their last sample, as align_trace does for a finished run.
+        """
+        ready = self.last_time[self.master] if final else self.ready_until()
+        master_time, _ = self.pending[self.master]
+        if ready is None or not len(master_time):
+            return None
+        count = int(np.searchsorted(master_time, ready + self.tolerance, side='right'))
+        if self.evaluated_until is not None:
+            first = int(np.searchsorted(master_time, self.evaluated_until + self.tolerance, side='right'))
+        else:
+            first = 0
+        if count <= first:
+            return None
+
+        window_time = master_time[first:count]
+        signals = dict(self.scalars)
+        for name in self.timed:
+            time_values, data_values = self.pending[name]
+            index_map = build_index_map(window_time, time_values, self.methods.get(name, "zoh"), self.tolerance)
+            signals[name] = index_map.apply(data_values)
+        window = TraceWindow(self.evaluated_samples, window_time, signals)
+
+        self.evaluated_until = float(window_time[-1])
+        self.evaluated_samples += len(window_time)
+        for name in self.timed:
+            # Keep the sample held at the last evaluated tick for the next window's alignment
+            time_values, data_values = self.pending[name]
+            held = max(int(np.searchsorted(time_values, self.evaluated_until + self.tolerance, side='right')) - 1, 0)
+            self.pending[name] = (time_values[held:], data_values[held:])
+        return window
+
+    def poll(self):
+        """
+        Fetch new rows and return (window, report). window is a TraceWindow of the newly final
+        master ticks or None; report is {'new_samples', 'latest_time', 'evaluated_until',
+        'lag', 'fetch_seconds'} where lag is how many simulated seconds the newest logged
+        sample is ahead of the last evaluated tick.
+        """
+        started = time.monotonic()
+        new_rows = self.fetch()
+        fetch_seconds = time.monotonic() - started
+        window = self.next_window()
+
+        known = [last for last in self.last_time.values() if last is not None]
+        latest = max(known) if known else None
+        lag = None
+        if latest is not None:
+            lag = latest - self.evaluated_until if self.evaluated_until is not None else latest
+        report = {
+            'new_samples': {name: len(new_rows[name][0]) if name in new_rows else 0 for name in self.timed},
+            'latest_time': latest,
+            'evaluated_until': self.evaluated_until,
+            'lag': lag,
+            'fetch_seconds': fetch_seconds,
+        }
+        return window, report
+
+    def iter_windows(self, idle_polls=3, on_report=None):
+        """
+        Poll every interval seconds and yield each new TraceWindow, e.g. into
+        contracts.subsystem_contracts.evaluate_windows. Stops after idle_polls consecutive
+        polls without new samples (the simulation has finished or stalled), after yielding
+        the ticks that were still waiting on slower signals.
+
+        - on_report: Optional callable receiving every poll's report
+        """
+        idle = 0
+        while idle < idle_polls:
+            started = time.monotonic()
+            window, report = self.poll()
+            if on_report is not None:
+                on_report(report)
+            idle = 0 if any(report['new_samples'].values()) else idle + 1
+            if window is not None:
+                yield window
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        window = self.next_window(final=True)
+        if window is not None:
+            yield window
+
+    def trace(self):
+        """Everything received so far as {name: (time, data)} (requires keep_trace)."""
+        trace = {}
+        for name in self.timed:
+            chunks = self.chunks[name]
+            if chunks:
+                trace[name] = (np.concatenate([rows[0] for rows in chunks]).reshape(-1, 1),
+                               np.concatenate([rows[1] for rows in chunks]))
+        for name, value in self.scalars.items():
+            trace[name] = (None, value)
+        return trace
@@ -0,0 +1,144 @@
+import numpy as np
+
+# Short signal name -> MATLAB workspace variable read by pygame_simulation_v8.py
+SIGNALS = {
+    'eta': 'Eta',
+    'eta_sp': 'Eta_sp',
+    'eta_obs': 'Eta_obs',
+    'nu': 'nu',
+    'nu_sp': 'nu_sp',
+    'nu_obs': 'nu_obs',
+    'wind': 'Wind_body_frame',
+    'wind_direction': 'wind_direction',
+    'wind_speed': 'wind_velocity',
+    'current': 'Current_in_body_frame',
+    'waves': 'Waves_in_body_frame',
+    'controller_force': 'Controller_force',
+    'thruster_force': 'Thruster_force',
+    'thrust_dynamic_force': 'Thrust_dynamic_force',
+    'wave_height': 'Hs',
+}
+
+# Signals stored as a plain value in the workspace instead of a timeseries
+SCALAR_SIGNALS = ['wave_height']
+
+
+def matlab_to_numpy(value, chunk_rows=65536):
+    """
+    Convert a matlab.double (or any array the engine returns) into a C-contiguous float64
+    array without walking it element by element in Python.
+
+    Tried in order:
+    - The buffer protocol / tomemoryview() of newer MATLAB releases (no copy unless the
+      column-major layout has to be made C-contiguous)
+    - The flat column-major _data buffer and size of older releases
+    - A row-chunked copy into a preallocated array for anything else
+    """
+    if isinstance(value, np.ndarray):
+        return np.ascontiguousarray(value, dtype=np.float64)
+    if isinstance(value, (bool, int, float)):
+        return np.asarray(value, dtype=np.float64)
+
+    view = None
+    try:
+        view = memoryview(value)
+    except TypeError:
+        if hasattr(value, 'tomemoryview'):
+            view = value.tomemoryview()
+    if view is not None:
+        return np.ascontiguousarray(np.asarray(view), dtype=np.float64)
+
+    if hasattr(value, '_data') and hasattr(value, 'size'):
+        flat = np.frombuffer(value._data, dtype=np.float64 if value._data.itemsize == 8 else np.float32)
+        return np.ascontiguousarray(flat.reshape(tuple(value.size), order='F'), dtype=np.float64)
+
+    rows = len(value)
+    if rows == 0:
+        return np.empty((0, 0))
+    first = np.asarray(value[0], dtype=np.float64)
+    result = np.empty((rows,) + first.shape)
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        result[start:stop] = np.asarray(value[start:stop], dtype=np.float64).reshape((stop - start,) + first.shape)
+    return result
+
+
+def convert_to_numpy_array(eng, dataseries):
+    time_values = matlab_to_numpy(eng.getfield(dataseries, 'Time'))
+    data_values = matlab_to_numpy(eng.getfield(dataseries, 'Data'))
+    return time_values, data_values
+
+
+def convert_scalar(value):
+    # Hs comes back as a Python float when constant, as a matlab.double otherwise
+    if isinstance(value, (int, float)):
+        return value
+    return matlab_to_numpy(value)
+
+
+def extract_workspace(eng, names=None):
+    """
+    Pull signals out of the MATLAB workspace.
+
+    Parameters:
+    - eng: Connected MATLAB engine
+    - names: Short signal names to extract (defaults to every entry in SIGNALS)
+
+    Returns a dict {name: (time, data)}; scalar signals have time None.
+    """
+    if names is None:
+        names = list(SIGNALS)
+
+    trace = {}
+    for name in names:
+        value = eng.workspace[SIGNALS[name]]
+        if name in SCALAR_SIGNALS:
+            trace[name] = (None, convert_scalar(value))
+        else:
+            trace[name] = convert_to_numpy_array(eng, value)
+    return trace
+
+
+def bulk_struct_expression(names, rows=None):
+    """
+    Build one MATLAB expression that packs every requested Time/Data into a single struct.
+    Values are wrapped in cells so struct() never expands them into a struct array.
+
+    - rows: Optional MATLAB row selector with a '{var}' placeholder for the workspace
+      variable, e.g. '{var}.Time > 12.5', to transfer only part of every series; or a
+      {name: selector} dict to select different rows per signal (missing names get all rows)
+    """
+    fields = []
+    for name in names:
+        variable = SIGNALS[name]
+        selector = rows.get(name) if isinstance(rows, dict) else rows
+        if name in SCALAR_SIGNALS:
+            fields.append(f"'{name}_Data', {{{variable}}}")
+        elif selector is None:
+            fields.append(f"'{name}_Time', {{{variable}.Time}}")
+            fields.append(f"'{name}_Data', {{{variable}.Data}}")
+        else:
+            selector = selector.format(var=variable)
+            fields.append(f"'{name}_Time', {{{variable}.Time({selector})}}")
+            fields.append(f"'{name}_Data', {{{variable}.Data({selector}, :)}}")
+    return "struct(" + ", ".join(fields) + ")"
+
+
+def extract_workspace_bulk(eng, names=None, rows=None):
+    """
+    Same result as extract_workspace, but the engine builds one struct holding every
+    requested series and returns it in a single eval call instead of two getfield
+    round trips per signal. See bulk_struct_expression for the optional rows selector.
+    """
+    if names is None:
+        names = list(SIGNALS)
+
+    packed = eng.eval(bulk_struct_expression(names, rows), nargout=1)
+
+    trace = {}
+    for name in names:
+        if name in SCALAR_SIGNALS:
+            trace[name] = (None, convert_scalar(packed[f"{name}_Data"]))
+        else:
+            trace[name] = (matlab_to_numpy(packed[f"{name}_Time"]), matlab_to_numpy(packed[f"{name}_Data"]))
+    return trace
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+def _pairwise(level, reduce):
+    if len(level) % 2:
+        level = np.concatenate([level, np.full((1,) + level.shape[1:], np.nan)])
+    return reduce(level[0::2], level[1::2])
+
+
+class MinMaxPyramid:
+    def __init__(self, values, time=None, leaf=32):
+        """
+        Multi-level min/max summary of one signal for range queries and envelopes.
+
+        Parameters:
+        - values: (N,) or (N, k) samples; a 2-D signal keeps one pyramid per column
+        - time: Optional (N,) clock so ranges can be given in seconds (see index_range)
+        - leaf: Samples per block of the first level; ranges are answered from the levels
+          plus at most 2 * leaf raw samples, so memory overhead is about 4N / leaf values
+
+        NaN samples are ignored by every query (a block that is all NaN reports NaN).
+        """
+        self.values = np.asarray(values, dtype=np.float64)
+        self.time = None if time is None else np.asarray(time, dtype=np.float64).reshape(-1)
+        self.leaf = leaf
+
+        count = -(-len(self.values) // leaf)
+        padded = np.full((count * leaf,) + self.values.shape[1:], np.nan)
+        padded[:len(self.values)] = self.values
+        blocks = padded.reshape((count, leaf) + self.values.shape[1:])
+        self.mins = [np.fmin.reduce(blocks, axis=1)]
+        self.maxs = [np.fmax.reduce(blocks, axis=1)]
+        while len(self.mins[-1]) > 1:
+            self.mins.append(_pairwise(self.mins[-1], np.fmin))
+            self.maxs.append(_pairwise(self.maxs[-1], np.fmax))
+
+    def __len__(self):
+        return len(self.values)
+
+    def index_range(self, t0, t1):
+        """Sample indices [i0, i1) covering the times t0 <= t <= t1."""
+        return int(np.searchsorted(self.time, t0, side='left')), int(np.searchsorted(self.time, t1, side='right'))
+
+    def range(self, i0, i1):
+        """(min, max) over samples [i0, i1) in O(log N + leaf); per column for 2-D signals."""
+        i0, i1 = max(int(i0), 0), min(int(i1), len(self.values))
+        nan = np.full(self.values.shape[1:], np.nan)
+        if i0 >= i1:
+            return nan, nan.copy()
+
+        low, high = nan, nan.copy()
+        b0, b1 = -(-i0 // self.leaf), i1 // self.leaf
+        if b0 >= b1:
+            raw = [self.values[i0:i1]]
+        else:
+            raw = [self.values[i0:b0 * self.leaf], self.values[b1 * self.leaf:i1]]
+            for mins, maxs in zip(self.mins, self.maxs):
+                if b0 >= b1:
+                    break
+                if b0 % 2:
+                    low, high = np.fmin(low, mins[b0]), np.fmax(high, maxs[b0])
+                    b0 += 1
+                if b1 % 2:
+                    b1 -= 1
+                    low, high = np.fmin(low, mins[b1]), np.fmax(high, maxs[b1])
+                b0, b1 = b0 // 2, b1 // 2
+        for samples in raw:
+            if len(samples):
+                low = np.fmin(low, np.fmin.reduce(samples, axis=0))
+                high = np.fmax(high, np.fmax.reduce(samples, axis=0))
+        return low, high
+
+    def exceeds(self, i0, i1, threshold):
+        """True if any sample in [i0, i1) is above threshold (per column for 2-D signals)."""
+        return self.range(i0, i1)[1] > threshold
+
+    def envelope(self, i0, i1, buckets):
+        """
+        (mins, maxs) of [i0, i1) split into the given number of equal buckets, e.g. one per
+        pixel column of a zoomed-out plot. Read from the coarsest level whose blocks are
+        not wider than a bucket, so bucket edges are exact to within one block.
+        """
+        i0, i1 = max(int(i0), 0), min(int(i1), len(self.values))
+        buckets = max(1, min(buckets, i1 - i0))
+        edges = np.linspace(i0, i1, buckets + 1).astype(int)
+        width = (i1 - i0) / buckets
+        if width < self.leaf:
+            starts = edges[:-1]
+            return (np.fmin.reduceat(self.values[:i1], starts, axis=0),
+                    np.fmax.reduceat(self.values[:i1], starts, axis=0))
+
+        level = min(int(np.log2(width / self.leaf)), len(self.mins) - 1)
+        block = self.leaf * 2 ** level
+        starts = edges[:-1] // block
+        stop = -(-i1 // block)
+        return (np.fmin.reduceat(self.mins[level][:stop], starts, axis=0),
+                np.fmax.reduceat(self.maxs[level][:stop], starts, axis=0))
+
+
+def build_signal_pyramids(signals, leaf=32):
+    """
+    Pyramids for the quantities the contracts compare against thresholds, from a SignalBundle:
+    position and velocity error norms, wind speed and per-thruster force.
+    """
+    time = signals.time
+    return {
+        'position_error': MinMaxPyramid(np.linalg.norm(signals['eta'] - signals['eta_sp'], axis=1), time, leaf),
+        'velocity_error': MinMaxPyramid(np.linalg.norm(signals['nu'] - signals['nu_sp'], axis=1), time, leaf),
+        'wind_speed': MinMaxPyramid(signals['wind_speed'], time, leaf),
+        'thruster_force': MinMaxPyramid(signals['thruster_force'], time, leaf),
+    }
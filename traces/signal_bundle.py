@@ -0,0 +1,66 @@
+import numpy as np
+
+# Columns per tick of every signal the contracts and renderer read; None means one value per tick
+SIGNAL_COLUMNS = {
+    'eta': 3,
+    'eta_sp': 3,
+    'eta_obs': 3,
+    'nu': 3,
+    'nu_sp': 3,
+    'nu_obs': 3,
+    'controller_force': 3,
+    'thruster_force': 5,
+    'thrust_dynamic_force': 3,
+    'wind_speed': None,
+    'wind_direction': None,
+    'current': 3,
+    'wave_height': None,
+}
+
+
+def _canonical(name, data, length):
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim == 0:
+        # Scalar signals (a constant Hs) become a full series so they index like the rest
+        data = np.full(length, float(data))
+    elif data.ndim == 2 and data.shape[1] == 1:
+        data = data[:, 0]
+
+    if data.shape[0] != length:
+        raise ValueError(f"Signal '{name}' has {data.shape[0]} samples, expected {length}.")
+    columns = SIGNAL_COLUMNS.get(name, data.shape[1] if data.ndim > 1 else None)
+    expected = (length,) if columns is None else (length, columns)
+    if data.shape != expected:
+        raise ValueError(f"Signal '{name}' has shape {data.shape}, expected {expected}.")
+    return data
+
+
+class SignalBundle:
+    def __init__(self, time, signals):
+        """
+        Aligned signals normalized once at load time, so per-tick code can index them directly.
+
+        Parameters:
+        - time: Master clock, any shape with one value per tick (e.g. MATLAB's (N, 1) column)
+        - signals: {name: data} already on that clock; constants such as Hs may be scalars
+
+        Every signal becomes a float64 array of SIGNAL_COLUMNS shape: (N,) for single-value
+        signals (wind_speed, wind_direction, wave_height) and (N, k) otherwise. 'current_xy' is
+        added as the horizontal (N, 2) view of 'current'. Raises ValueError on any other shape.
+        """
+        self.time = np.asarray(time, dtype=np.float64).reshape(-1)
+        self.signals = {name: _canonical(name, data, len(self.time)) for name, data in signals.items()}
+        if 'current' in self.signals:
+            self.signals['current_xy'] = self.signals['current'][:, :2]
+
+    def __getitem__(self, name):
+        return self.signals[name]
+
+    def __contains__(self, name):
+        return name in self.signals
+
+    def __len__(self):
+        return len(self.time)
+
+    def keys(self):
+        return self.signals.keys()
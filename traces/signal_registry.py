@@ -0,0 +1,99 @@
+from traces.matlab_workspace import SIGNALS, extract_workspace_bulk
+from traces.trace_archive import archive_signals, load_archive
+from traces.trace_store import open_trace_store, read_manifest
+
+
+class LazySignal:
+    """
+    Proxy for one signal that is only extracted or read from disk when first used.
+    Unpacks and indexes as (time, data), like the entries of a plain trace dict.
+    """
+    def __init__(self, name, registry):
+        self.name = name
+        self.registry = registry
+        self.value = None
+
+    @property
+    def loaded(self):
+        return self.value is not None
+
+    def load(self):
+        if self.value is None:
+            self.registry.load([self.name])
+        return self.value
+
+    @property
+    def time(self):
+        return self.load()[0]
+
+    @property
+    def data(self):
+        return self.load()[1]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __getitem__(self, index):
+        return self.load()[index]
+
+    def __len__(self):
+        return 2
+
+
+class SignalRegistry:
+    def __init__(self, loader, names):
+        """
+        Parameters:
+        - loader: Callable taking a list of signal names and returning {name: (time, data)}
+        - names: Signals the source can provide
+        """
+        self.loader = loader
+        self.signals = {name: LazySignal(name, self) for name in names}
+
+    def __getitem__(self, name):
+        return self.signals[name]
+
+    def __contains__(self, name):
+        return name in self.signals
+
+    def __iter__(self):
+        return iter(self.signals)
+
+    def keys(self):
+        return self.signals.keys()
+
+    def items(self):
+        return self.signals.items()
+
+    def load(self, names):
+        """Load several signals at once (one engine round trip for a MATLAB source)."""
+        pending = [name for name in names if not self.signals[name].loaded]
+        if pending:
+            for name, value in self.loader(pending).items():
+                self.signals[name].value = value
+        return {name: self.signals[name].value for name in names}
+
+    def touched(self):
+        return [name for name, signal in self.signals.items() if signal.loaded]
+
+    def untouched(self):
+        return [name for name, signal in self.signals.items() if not signal.loaded]
+
+    def report(self):
+        untouched = self.untouched()
+        if not untouched:
+            return "All signals were used."
+        return "Signals never used: " + ", ".join(untouched)
+
+
+def engine_registry(eng, names=None):
+    return SignalRegistry(lambda pending: extract_workspace_bulk(eng, pending), names or list(SIGNALS))
+
+
+def archive_registry(path, mmap_mode="r"):
+    return SignalRegistry(lambda pending: load_archive(path, pending, mmap_mode), archive_signals(path))
+
+
+def store_registry(directory):
+    names = list(read_manifest(directory)['signals'])
+    return SignalRegistry(lambda pending: open_trace_store(directory, pending), names)
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def _any_column(mask):
+    return mask if mask.ndim == 1 else np.any(mask, axis=1)
+
+
+def _all_columns(mask):
+    return mask if mask.ndim == 1 else np.all(mask, axis=1)
+
+
+class SignalMasks:
+    def __init__(self, time_ordered, nan, inf, in_range):
+        """
+        Per-tick validity of a SignalBundle, computed once for the whole trace.
+
+        Parameters:
+        - time_ordered: (N,) bool, False where a tick does not come after the previous one
+        - nan: {name: (N,) bool} True where any column of the signal is NaN
+        - inf: {name: (N,) bool} True where any column of the signal is +-Inf
+        - in_range: {name: (N,) bool} True where every column is inside its physical range
+          (NaN counts as out of range); only for signals that have a range
+        """
+        self.time_ordered = time_ordered
+        self.nan = nan
+        self.inf = inf
+        self.in_range = in_range
+
+    def invalid_counts(self):
+        """{name: {'nan': n, 'inf': n, 'out_of_range': n}} for every signal with invalid ticks."""
+        counts = {}
+        disordered = int(np.count_nonzero(~self.time_ordered))
+        if disordered:
+            counts['time'] = {'out_of_order': disordered}
+        for name in self.nan:
+            entry = {
+                'nan': int(np.count_nonzero(self.nan[name])),
+                'inf': int(np.count_nonzero(self.inf[name])),
+            }
+            if name in self.in_range:
+                entry['out_of_range'] = int(np.count_nonzero(~self.in_range[name]))
+            entry = {kind: count for kind, count in entry.items() if count}
+            if entry:
+                counts[name] = entry
+        return counts
+
+
+def validate_signals(signals, ranges=None):
+    """
+    One vectorized pass over a SignalBundle (see traces/signal_bundle.py) producing SignalMasks.
+
+    - ranges: Optional {name: (low, high)} physical limits; low/high may be per-column sequences
+    """
+    ranges = ranges or {}
+    time_ordered = np.ones(len(signals.time), dtype=bool)
+    time_ordered[1:] = np.diff(signals.time) > 0
+
+    nan = {}
+    inf = {}
+    in_range = {}
+    for name in signals.keys():
+        data = signals[name]
+        nan[name] = _any_column(np.isnan(data))
+        inf[name] = _any_column(np.isinf(data))
+        if name in ranges:
+            low, high = (np.asarray(limit, dtype=np.float64) for limit in ranges[name])
+            in_range[name] = _all_columns((data >= low) & (data <= high))
+    return SignalMasks(time_ordered, nan, inf, in_range)
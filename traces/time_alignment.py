@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class IndexMap:
+    """
+    Precomputed mapping from master clock ticks to rows of one signal.
+
+    - indices: Row of the signal to use at every master tick (lower neighbour for 'linear')
+    - upper: Upper neighbour row for 'linear', None otherwise
+    - weights: Interpolation weight of the upper neighbour for 'linear', None otherwise
+    An identity map (same time base as the master) has indices None and returns data untouched.
+    """
+    def __init__(self, indices=None, upper=None, weights=None):
+        self.indices = indices
+        self.upper = upper
+        self.weights = weights
+
+    @property
+    def identity(self):
+        return self.indices is None
+
+    def apply(self, data):
+        if self.identity:
+            return data
+        data = np.asarray(data)
+        if self.weights is None:
+            return data[self.indices]
+        weights = self.weights.reshape((-1,) + (1,) * (data.ndim - 1))
+        return data[self.indices] * (1.0 - weights) + data[self.upper] * weights
+
+
+def _flat_time(time_values):
+    return np.asarray(time_values, dtype=np.float64).reshape(-1)
+
+
+def build_index_map(master_time, signal_time, method="zoh", tolerance=1e-9):
+    """
+    Map every master tick onto the signal's own time vector with searchsorted.
+
+    - method: 'zoh' holds the last sample at or before the tick, 'linear' interpolates
+      between the neighbouring samples. Ticks outside the signal's span hold its end values.
+    """
+    master = _flat_time(master_time)
+    signal = _flat_time(signal_time)
+    if signal.size == 0:
+        raise ValueError("Cannot align a signal without samples.")
+    if signal.size > 1 and np.any(np.diff(signal) < 0):
+        raise ValueError("Signal time vector is not monotonic.")
+    if signal.size == master.size and np.allclose(signal, master, rtol=0.0, atol=tolerance):
+        return IndexMap()
+
+    # The tolerance keeps ticks that land a rounding error before a sample on that sample
+    right = np.searchsorted(signal, master + tolerance, side="right")
+    lower = np.clip(right - 1, 0, signal.size - 1)
+    if method == "zoh":
+        return IndexMap(lower)
+    if method != "linear":
+        raise ValueError(f"Unknown alignment method '{method}'.")
+
+    upper = np.clip(right, 0, signal.size - 1)
+    span = signal[upper] - signal[lower]
+    offset = master - signal[lower]
+    weights = np.divide(offset, span, out=np.zeros_like(offset), where=span > 0)
+    return IndexMap(lower, upper, np.clip(weights, 0.0, 1.0))
+
+
+def align_trace(trace, master="eta", methods=None, tolerance=1e-9, names=None):
+    """
+    Resample every signal of a trace {name: (time, data)} onto the master signal's clock.
+
+    - methods: Optional {name: 'zoh' | 'linear'}; signals not listed use zero-order hold
+    - names: Only align (and so only load, for a lazy SignalRegistry) these signals
+    Returns (aligned, report). aligned is {name: (master_time, data)} so the per-tick loop can
+    index every signal with the same integer; signals already on the master clock are passed
+    through without a copy. report is {name: {'samples', 'resampled', 'max_offset'}} where
+    max_offset is the largest distance in seconds between a tick and the sample held for it.
+    """
+    methods = methods or {}
+    master_time = trace[master][0]
+    master_flat = _flat_time(master_time)
+
+    aligned = {}
+    report = {}
+    for name in (names if names is not None else list(trace.keys())):
+        time_values, data_values = trace[name]
+        if time_values is None:
+            aligned[name] = (None, data_values)
+            continue
+        index_map = build_index_map(master_time, time_values, methods.get(name, "zoh"), tolerance)
+        aligned[name] = (master_time, index_map.apply(data_values))
+
+        max_offset = 0.0
+        if not index_map.identity and master_flat.size:
+            held = _flat_time(time_values)[index_map.indices]
+            max_offset = float(np.max(np.abs(master_flat - held)))
+        report[name] = {
+            'samples': int(np.size(time_values)),
+            'resampled': not index_map.identity,
+            'max_offset': max_offset,
+        }
+    return aligned, report
@@ -0,0 +1,104 @@
+import json
+import struct
+import zipfile
+
+import numpy as np
+
+from traces.compact_storage import decode_signal
+from traces.matlab_workspace import extract_workspace_bulk
+
+ENCODINGS_KEY = "__encodings__"
+
+
+def save_archive(path, trace, encodings=None):
+    """
+    Write a trace {name: (time, data)} to a single uncompressed .npz archive.
+    Each signal is stored as '<name>.Time' and '<name>.Data'; scalar signals only have Data.
+
+    - encodings: Optional {name: encoding} from traces.compact_storage.compact_trace for
+      signals whose Data is stored as float32 or scaled int16
+    """
+    arrays = {}
+    if encodings:
+        arrays[ENCODINGS_KEY] = np.array(json.dumps(encodings))
+    for name, (time_values, data_values) in trace.items():
+        if time_values is not None:
+            arrays[f"{name}.Time"] = np.asarray(time_values)
+        arrays[f"{name}.Data"] = np.asarray(data_values)
+    np.savez(path, **arrays)
+    return path
+
+
+def _map_member(path, info, mmap_mode):
+    # save_archive writes uncompressed members, so every .npy sits contiguously in the zip
+    # and can be memory-mapped in place once its local header and npy header are skipped.
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"Member {info.filename} of {path} is compressed and cannot be memory-mapped.")
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mmap_mode, offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def _read_member(path, members, npz, key, mmap_mode):
+    if key not in members:
+        return None
+    if npz is None:
+        return _map_member(path, members[key], mmap_mode)
+    return npz[key]
+
+
+def archive_signals(path):
+    """Names of the signals stored in an archive, without reading any of them."""
+    with zipfile.ZipFile(path) as archive:
+        keys = [info.filename[:-len(".npy")] for info in archive.infolist()]
+    return sorted({key.rsplit('.', 1)[0] for key in keys if key != ENCODINGS_KEY})
+
+
+def load_archive(path, names=None, mmap_mode=None):
+    """
+    Read an archive written by save_archive back into {name: (time, data)}.
+    Zero-dimensional Data (e.g. a constant Hs) is returned as a Python float like the engine does.
+
+    - mmap_mode: e.g. 'r' to memory-map every series inside the archive instead of reading
+      it into RAM, for streaming long runs window by window
+    """
+    trace = {}
+    with zipfile.ZipFile(path) as archive:
+        members = {info.filename[:-len(".npy")]: info for info in archive.infolist()}
+    encodings = {}
+    if ENCODINGS_KEY in members:
+        with np.load(path) as npz:
+            encodings = json.loads(npz[ENCODINGS_KEY].item())
+    stored = {key.rsplit('.', 1)[0] for key in members if key != ENCODINGS_KEY}
+
+    npz = np.load(path) if mmap_mode is None else None
+    try:
+        for name in (names if names is not None else sorted(stored)):
+            if name not in stored:
+                raise KeyError(f"Signal '{name}' not found in archive {path}")
+            time_values = _read_member(path, members, npz, f"{name}.Time", mmap_mode)
+            data_values = _read_member(path, members, npz, f"{name}.Data", mmap_mode)
+            if data_values.ndim == 0:
+                data_values = data_values.item()
+            trace[name] = (time_values, decode_signal(data_values, encodings.get(name)))
+    finally:
+        if npz is not None:
+            npz.close()
+    return trace
+
+
+def export_workspace(eng, path, names=None):
+    """Dump the signals of a finished Simulink run from the MATLAB workspace into an archive."""
+    return save_archive(path, extract_workspace_bulk(eng, names))
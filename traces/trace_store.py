@@ -0,0 +1,159 @@
+import json
+import os
+
+import numpy as np
+
+from traces.compact_storage import decode_signal
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _time_base(time_values):
+    flat = np.asarray(time_values, dtype=np.float64).reshape(-1)
+    if flat.size == 0:
+        return {'start': None, 'end': None, 'samples': 0, 'step': None}
+    steps = np.diff(flat)
+    uniform = steps.size > 0 and np.allclose(steps, steps[0])
+    return {
+        'start': float(flat[0]),
+        'end': float(flat[-1]),
+        'samples': int(flat.size),
+        'step': float(steps[0]) if uniform else None,
+    }
+
+
+def _write_column(directory, filename, values):
+    values = np.ascontiguousarray(values)
+    path = os.path.join(directory, filename)
+    if values.size == 0:
+        open(path, "wb").close()
+    else:
+        column = np.memmap(path, dtype=values.dtype, mode="w+", shape=values.shape)
+        column[...] = values
+        column.flush()
+        del column
+    return {'file': filename, 'shape': list(values.shape), 'dtype': values.dtype.str}
+
+
+def _open_column(directory, entry, mode):
+    shape = tuple(entry['shape'])
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=entry['dtype'])
+    return np.memmap(os.path.join(directory, entry['file']), dtype=entry['dtype'], mode=mode, shape=shape)
+
+
+def write_trace_store(directory, trace, encodings=None):
+    """
+    Write a trace {name: (time, data)} as a directory of raw column files plus a manifest.
+
+    Every signal gets '<name>.time.bin' and '<name>.data.bin'; the manifest records their
+    shape, dtype and time base so open_trace_store can map them back without reading them.
+    Scalar signals (time None) are small and stored inline in the manifest.
+
+    - encodings: Optional {name: encoding} from traces.compact_storage.compact_trace,
+      recorded next to the columns it applies to
+    """
+    encodings = encodings or {}
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'signals': {}}
+    for name, (time_values, data_values) in trace.items():
+        if time_values is None:
+            manifest['signals'][name] = {'value': np.asarray(data_values).tolist()}
+            continue
+        manifest['signals'][name] = {
+            'time': _write_column(directory, f"{name}.time.bin", time_values),
+            'data': _write_column(directory, f"{name}.data.bin", data_values),
+            'time_base': _time_base(time_values),
+        }
+        if name in encodings:
+            manifest['signals'][name]['encoding'] = encodings[name]
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+
+def _append_column(directory, entry, values):
+    values = np.ascontiguousarray(values, dtype=entry['dtype'])
+    with open(os.path.join(directory, entry['file']), "ab") as f:
+        f.write(values.tobytes())
+    entry['shape'][0] += values.shape[0]
+
+
+def append_trace_store(directory, chunk):
+    """
+    Append new rows {name: (time, data)} to the end of every column of a trace store,
+    creating the store (or a signal's columns) on first use. Used to persist a run while it
+    is still being ingested; the manifest is rewritten last so a reader never sees rows it
+    does not list.
+    """
+    if os.path.exists(os.path.join(directory, MANIFEST_NAME)):
+        manifest = read_manifest(directory)
+    else:
+        os.makedirs(directory, exist_ok=True)
+        manifest = {'signals': {}}
+
+    for name, (time_values, data_values) in chunk.items():
+        entry = manifest['signals'].get(name)
+        if entry is None:
+            if time_values is None:
+                manifest['signals'][name] = {'value': np.asarray(data_values).tolist()}
+            else:
+                manifest['signals'][name] = {
+                    'time': _write_column(directory, f"{name}.time.bin", time_values),
+                    'data': _write_column(directory, f"{name}.data.bin", data_values),
+                    'time_base': _time_base(time_values),
+                }
+            continue
+        if time_values is None or 'value' in entry:
+            continue
+        if 'encoding' in entry:
+            raise ValueError(f"Signal '{name}' is stored compacted and cannot be appended to.")
+        time_values = np.asarray(time_values, dtype=np.float64).reshape(-1, *entry['time']['shape'][1:])
+        if time_values.shape[0] == 0:
+            continue
+        previous = entry['time_base']
+        _append_column(directory, entry['time'], time_values)
+        _append_column(directory, entry['data'], data_values)
+
+        added = _time_base(time_values)
+        steps = np.diff(np.concatenate([[previous['end']], time_values.reshape(-1)]))
+        step = previous['step']
+        if step is None and previous['samples'] == 1:
+            step = float(steps[0])
+        if step is not None and not np.allclose(steps, step):
+            step = None
+        entry['time_base'] = {
+            'start': previous['start'],
+            'end': added['end'],
+            'samples': previous['samples'] + added['samples'],
+            'step': step,
+        }
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def open_trace_store(directory, names=None, mode="r"):
+    """
+    Map a trace store back into {name: (time, data)}.
+    Time and Data are np.memmap views, so they index like the in-memory arrays while
+    only the pages actually touched are read from disk.
+    """
+    signals = read_manifest(directory)['signals']
+    trace = {}
+    for name in (names if names is not None else signals):
+        if name not in signals:
+            raise KeyError(f"Signal '{name}' not found in trace store {directory}")
+        entry = signals[name]
+        if 'value' in entry:
+            value = np.asarray(entry['value'])
+            trace[name] = (None, value.item() if value.ndim == 0 else value)
+        else:
+            data_values = decode_signal(_open_column(directory, entry['data'], mode), entry.get('encoding'))
+            trace[name] = (_open_column(directory, entry['time'], mode), data_values)
+    return trace
@@ -0,0 +1,128 @@
+import numpy as np
+
+from traces.matlab_workspace import SCALAR_SIGNALS, SIGNALS, extract_workspace_bulk, matlab_to_numpy
+from traces.time_alignment import build_index_map
+
+
+class TraceWindow:
+    def __init__(self, start, time, signals):
+        """
+        Parameters:
+        - start: Index of the first master tick in the window
+        - time: Master clock ticks covered by the window
+        - signals: {name: data} aligned onto those ticks (scalar signals passed through)
+        """
+        self.start = start
+        self.time = time
+        self.signals = signals
+
+
+def _flat(values):
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+def _align_rows(window_time, time_values, data_values, method, tolerance):
+    data_values = np.asarray(data_values)
+    if data_values.ndim < 2:
+        data_values = data_values.reshape(len(_flat(time_values)), -1)
+    return build_index_map(window_time, time_values, method, tolerance).apply(data_values)
+
+
+def iter_trace_windows(trace, window_length, master="eta", methods=None, tolerance=1e-9, names=None,
+                       start=0, stop=None):
+    """
+    Yield fixed-length TraceWindows over a trace {name: (time, data)}, or over the given
+    names only, covering master ticks start to stop (the whole trace by default).
+
+    Only the rows that cover each window (plus the held sample before it) are read from
+    every signal, so a memory-mapped archive or trace store is streamed with bounded memory.
+    Signals are aligned onto the master clock the same way align_trace does.
+    """
+    methods = methods or {}
+    if names is None:
+        names = list(trace.keys())
+    trace = {name: tuple(trace[name]) for name in set(names) | {master}}
+    master_time = _flat(trace[master][0])
+    flat_times = {name: _flat(time_values) for name, (time_values, _) in trace.items() if time_values is not None}
+
+    stop = master_time.size if stop is None else min(stop, master_time.size)
+    for first in range(start, stop, window_length):
+        last = min(first + window_length, stop)
+        window_time = np.array(master_time[first:last])
+        signals = {}
+        for name, (time_values, data_values) in trace.items():
+            if time_values is None:
+                if np.ndim(data_values) > 0 and len(data_values) == master_time.size:
+                    data_values = np.asarray(data_values[first:last])
+                signals[name] = data_values
+                continue
+            signal_time = flat_times[name]
+            lower = max(np.searchsorted(signal_time, window_time[0] + tolerance, side="right") - 1, 0)
+            upper = np.searchsorted(signal_time, window_time[-1] + tolerance, side="right") + 1
+            signals[name] = _align_rows(window_time, signal_time[lower:upper],
+                                        data_values[lower:upper], methods.get(name, "zoh"), tolerance)
+        yield TraceWindow(first, window_time, signals)
+
+
+def _row_counts(eng, names, edges):
+    """
+    {name: (counts, total)} with counts[k] the number of rows of the signal with
+    Time <= edges[k] and total its number of rows, for every timed signal in one engine
+    call. The workspace bins each series once against all the edges (O(N log K)) instead
+    of scanning its whole Time vector per window.
+    """
+    unique, positions = np.unique(edges, return_inverse=True)
+    # Time < nextafter(e) is Time <= e; histcounts bins are [e_k, e_k+1)
+    bins = ", ".join(f"{edge:.17g}" for edge in np.nextafter(unique, np.inf))
+    fields = [f"'{name}', {{cumsum(histcounts({SIGNALS[name]}.Time, [-Inf, {bins}, Inf]))}}"
+              for name in names if name not in SCALAR_SIGNALS]
+    if not fields:
+        return {}
+    counts = eng.eval("struct(" + ", ".join(fields) + ")", nargout=1)
+    result = {}
+    for name in names:
+        if name not in SCALAR_SIGNALS:
+            cumulative = matlab_to_numpy(counts[name]).reshape(-1).astype(np.int64)
+            result[name] = (cumulative[positions], int(cumulative[-1]))
+    return result
+
+
+def iter_engine_windows(eng, window_length, names=None, master="eta", methods=None, tolerance=1e-9):
+    """
+    Yield TraceWindows straight from the MATLAB workspace.
+    The row range of every signal in every window is computed up front in one engine call;
+    then each window costs two calls, one for the master ticks and one bulk eval for the
+    matching rows of every signal, so the full series never leaves the engine at once.
+    """
+    methods = methods or {}
+    if names is None:
+        names = list(SIGNALS)
+    master_variable = SIGNALS[master]
+    samples = int(eng.eval(f"numel({master_variable}.Time)", nargout=1))
+    starts = list(range(0, samples, window_length))
+    if not starts:
+        return
+    stops = [min(start + window_length, samples) for start in starts]
+
+    # First and last tick of every window, widened by the tolerance; the rows of each signal
+    # run from the sample at or before the first tick through the first sample after the last
+    ticks = ", ".join(str(row + 1) for row in starts + [stop - 1 for stop in stops])
+    edges = matlab_to_numpy(eng.eval(f"{master_variable}.Time([{ticks}])", nargout=1)).reshape(-1)
+    edges = np.concatenate([edges[:len(starts)] - tolerance, edges[len(starts):] + tolerance])
+    counts = _row_counts(eng, names, edges)
+
+    for window, (start, stop) in enumerate(zip(starts, stops)):
+        window_time = matlab_to_numpy(eng.eval(f"{master_variable}.Time({start + 1}:{stop})", nargout=1)).reshape(-1)
+        rows = {}
+        for name, (count, total) in counts.items():
+            rows[name] = f"{max(1, count[window])}:{min(total, count[len(starts) + window] + 1)}"
+        chunk = extract_workspace_bulk(eng, names, rows=rows)
+        signals = {}
+        for name in names:
+            time_values, data_values = chunk[name]
+            if name in SCALAR_SIGNALS:
+                signals[name] = data_values
+            else:
+                signals[name] = _align_rows(window_time, time_values, data_values,
+                                            methods.get(name, "zoh"), tolerance)
+        yield TraceWindow(start, window_time, signals)
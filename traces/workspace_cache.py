@@ -0,0 +1,119 @@
+import hashlib
+import os
+
+import numpy as np
+
+from traces.matlab_workspace import SCALAR_SIGNALS, SIGNALS, extract_workspace_bulk, matlab_to_numpy
+from traces.trace_archive import load_archive, save_archive
+from traces.signal_registry import archive_registry
+
+
+def _summary(values):
+    # NaN-safe and order-sensitive: count and positions of the NaNs, then the plain and
+    # index-weighted sums of the other elements (a plain sum is NaN as soon as one NaN is
+    # logged, and misses reordered or offsetting edits)
+    valid = f"{values}(~isnan({values}))"
+    return (f"nnz(isnan({values})), sum(find(isnan({values}))), sum({valid}), "
+            f"(1:nnz(~isnan({values}))) * {valid}")
+
+
+def fingerprint_expression(names):
+    """
+    One MATLAB expression returning, per signal, its sizes and a few sums of Time and Data.
+    It is computed inside the engine, so only a few numbers per signal cross the bridge.
+    """
+    fields = []
+    for name in names:
+        variable = SIGNALS[name]
+        if name in SCALAR_SIGNALS:
+            fields.append(f"'{name}', {{[size({variable}), {_summary(f'{variable}(:)')}]}}")
+        else:
+            fields.append(f"'{name}', {{[numel({variable}.Time), size({variable}.Data), "
+                          f"{_summary(f'{variable}.Time(:)')}, {_summary(f'{variable}.Data(:)')}]}}")
+    return "struct(" + ", ".join(fields) + ")"
+
+
+def workspace_fingerprint(eng, names=None):
+    """Hex key identifying the current contents of the requested workspace signals."""
+    if names is None:
+        names = list(SIGNALS)
+    summary = eng.eval(fingerprint_expression(names), nargout=1)
+    digest = hashlib.sha1()
+    for name in names:
+        digest.update(f"{name}={SIGNALS[name]};".encode())
+        digest.update(matlab_to_numpy(summary[name]).tobytes())
+    return digest.hexdigest()
+
+
+class WorkspaceCache:
+    def __init__(self, directory="trace_cache", max_bytes=4 * 1024 ** 3):
+        """
+        Parameters:
+        - directory: Where cached traces are kept, one archive per workspace fingerprint
+        - max_bytes: Size cap of the directory; least recently used entries are evicted first
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)  # mark as recently used
+        return load_archive(path, mmap_mode="r")
+
+    def put(self, key, trace):
+        os.makedirs(self.directory, exist_ok=True)
+        partial_path = os.path.join(self.directory, f"{key}.partial.npz")
+        save_archive(partial_path, trace)
+        os.replace(partial_path, self.path_for(key))
+        self.evict(keep=key)
+
+    def entries(self):
+        """Cached (path, size, last_used) tuples, least recently used first."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".npz") or filename.endswith(".partial.npz"):
+                continue
+            stat = os.stat(os.path.join(self.directory, filename))
+            entries.append((os.path.join(self.directory, filename), stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def evict(self, keep=None):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == self.path_for(keep):
+                continue
+            os.remove(path)
+            total -= size
+
+    def ensure(self, eng, names=None):
+        """Cache the current workspace if needed and return its cache key."""
+        key = workspace_fingerprint(eng, names)
+        if os.path.exists(self.path_for(key)):
+            os.utime(self.path_for(key))  # mark as recently used
+        else:
+            self.put(key, extract_workspace_bulk(eng, names))
+        return key
+
+    def load(self, eng, names=None):
+        """
+        Return the workspace signals as {name: (time, data)}, pulling them from MATLAB only
+        when this exact workspace content has not been cached yet.
+        """
+        return load_archive(self.path_for(self.ensure(eng, names)), mmap_mode="r")
+
+    def registry(self, eng, names=None):
+        """
+        Like load, but returns a SignalRegistry that maps cached signals on first use. On a
+        cache miss every signal in names is transferred up front, so pass the ones needed.
+        """
+        return archive_registry(self.path_for(self.ensure(eng, names)))